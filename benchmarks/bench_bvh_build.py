@@ -0,0 +1,95 @@
+# Build time and query cost of the BVH builders on uniformly scattered random
+# 3D boxes.
+#
+# MedianBuilder below is the reference: it splits every node at the object
+# median of its centroids along the longest axis of their bounds. The query
+# cost is measured twice: as the SAH cost of the tree, and as the number of
+# node boxes tested on average by random point queries.
+#
+# Run from the repository root:
+#     python -m benchmarks.bench_bvh_build
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from src.bvh import BVHBinnedBuilder, BVHBuilderBase, BVHLinearBuilder, BVHTree
+from src.bvh._BVHBuilderBase import _ranges
+
+SIZES = (10_000, 100_000, 1_000_000)
+QUERIES = 10_000
+
+
+class MedianBuilder(BVHBuilderBase):
+    def __init__(self, leaf_node_size: int = 5, max_tree_depth: int = 32):
+        super().__init__(leaf_node_size, max_tree_depth)
+
+    def _split_nodes(self, boxes, order, begins, ends):
+        counts = ends - begins
+        starts = np.cumsum(counts) - counts
+        node = np.repeat(np.arange(begins.size), counts)
+        centroids = 0.5 * (boxes[0] + boxes[1])
+        extent = np.maximum.reduceat(centroids, starts, axis=1)
+        extent -= np.minimum.reduceat(centroids, starts, axis=1)
+        axis = np.argmax(extent, axis=0)
+        keys = centroids[axis[node], np.arange(node.size)]
+        ranked = np.lexsort((keys, node))
+        order[_ranges(begins, counts)] = order[_ranges(begins, counts)][ranked]
+        return begins + counts // 2
+
+
+def random_boxes(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    lo = rng.random((n, 3))
+    return np.stack([lo, lo + rng.random((n, 3)) * n ** (-1.0 / 3.0)], axis=1)
+
+
+def node_tests(tree: BVHTree, points: np.ndarray) -> float:
+    # Breadth-first traversal of all the queries at once, counting the node
+    # boxes tested per query.
+    info = tree.node_info
+    node_boxes = tree.node_boxes
+    query = np.arange(points.shape[0])
+    node = np.zeros(points.shape[0], dtype=np.int64)
+    tests = 0
+    while node.size > 0:
+        tests += node.size
+        inside = np.all(
+            (node_boxes[node, 0] <= points[query])
+            & (points[query] <= node_boxes[node, 1]),
+            axis=1,
+        )
+        inner = inside & (info[node, 0] == 0)
+        query = np.repeat(query[inner], 2)
+        node = info[node[inner], 1:3].ravel().astype(np.int64)
+    return tests / points.shape[0]
+
+
+def main() -> None:
+    builders = {
+        "median": MedianBuilder(),
+        "binned SAH": BVHBinnedBuilder(),
+        "LBVH 30-bit": BVHLinearBuilder(code_bits=30),
+        "LBVH 63-bit": BVHLinearBuilder(code_bits=63),
+    }
+    points = np.random.default_rng(1).random((QUERIES, 3))
+    print(
+        f"{'boxes':>10} {'builder':>12} {'build (s)':>10} {'nodes':>8} "
+        f"{'depth':>6} {'SAH cost':>9} {'tests/query':>12}"
+    )
+    for n in SIZES:
+        boxes = random_boxes(n)
+        for name, builder in builders.items():
+            start = time.perf_counter()
+            tree = builder.build(boxes)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{n:>10} {name:>12} {elapsed:>10.2f} {tree.length:>8} "
+                f"{tree.depth:>6} {tree.sah_cost():>9.1f} "
+                f"{node_tests(tree, points):>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Memory and query time of the compressed wide BVH against the binary one.
+#
+# Two workloads: a point cloud scanned from a bumpy sphere, whose primitive
+# boxes are points, queried for the nearest point; and a triangle mesh of the
+# same sphere, whose primitive boxes bound its triangles, queried by rays shot
+# from outside towards it. The memory is the one of the node arrays and of the
+# primitive order, the primitive boxes being shared by both layouts.
+#
+# Run from the repository root:
+#     python -m benchmarks.bench_bvh_wide
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from src.bvh import BVHSet, BVHWideSet
+
+POINTS = 1_000_000
+MESH_SIZE = 400
+QUERIES = 20_000
+LAYOUTS = ((4, 16), (4, 8), (8, 16), (8, 8))
+
+
+def sphere(theta: np.ndarray, phi: np.ndarray) -> np.ndarray:
+    radius = 1.0 + 0.05 * np.sin(7.0 * theta) * np.cos(5.0 * phi)
+    return radius[..., None] * np.stack(
+        [np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi), np.cos(theta)],
+        axis=-1,
+    )
+
+
+def point_cloud(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    points = sphere(
+        np.arccos(rng.uniform(-1.0, 1.0, n)), rng.uniform(0.0, 2 * np.pi, n)
+    )
+    points += rng.normal(scale=1e-3, size=points.shape)
+    return np.stack([points, points], axis=1)
+
+
+def triangle_mesh(size: int) -> np.ndarray:
+    # Boxes of the 2 * size * size triangles of a (theta, phi) grid.
+    theta, phi = np.meshgrid(
+        np.linspace(0.0, np.pi, size + 1), np.linspace(0.0, 2 * np.pi, size + 1)
+    )
+    grid = sphere(theta, phi)
+    a, b = grid[:-1, :-1].reshape(-1, 3), grid[1:, :-1].reshape(-1, 3)
+    c, d = grid[:-1, 1:].reshape(-1, 3), grid[1:, 1:].reshape(-1, 3)
+    triangles = np.concatenate([np.stack([a, b, c], 1), np.stack([b, d, c], 1)])
+    return np.stack([triangles.min(axis=1), triangles.max(axis=1)], axis=1)
+
+
+def tree_bytes(bvh_set: BVHSet) -> int:
+    tree = bvh_set.tree
+    return tree.node_info.nbytes + tree.node_boxes.nbytes + tree.indices.nbytes
+
+
+def timed(query, *args) -> float:
+    start = time.perf_counter()
+    query(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    rng = np.random.default_rng(1)
+    points = rng.uniform(-1.5, 1.5, (QUERIES, 3))
+    origins = 3.0 * sphere(
+        np.arccos(rng.uniform(-1.0, 1.0, QUERIES)), rng.uniform(0, 2 * np.pi, QUERIES)
+    )
+    directions = rng.normal(scale=0.3, size=(QUERIES, 3)) - origins
+    workloads = {
+        "point cloud": (point_cloud(POINTS), "nearest", (points,)),
+        "mesh": (triangle_mesh(MESH_SIZE), "intersect_rays", (origins, directions)),
+    }
+    print(
+        f"{'workload':>12} {'layout':>12} {'memory (MB)':>12} {'reduction':>10} "
+        f"{'query (s)':>10} {'slowdown':>9}"
+    )
+    for name, (boxes, query, args) in workloads.items():
+        binary = BVHSet(boxes)
+        memory = tree_bytes(binary)
+        elapsed = timed(getattr(binary, query), *args)
+        print(
+            f"{name:>12} {'binary':>12} {memory / 1e6:>12.1f} {1.0:>10.1f} "
+            f"{elapsed:>10.2f} {1.0:>9.2f}"
+        )
+        for width, bits in LAYOUTS:
+            wide = BVHWideSet.from_set(binary, width, bits)
+            wide_elapsed = timed(getattr(wide, query), *args)
+            print(
+                f"{name:>12} {f'{width}-ary {bits}b':>12} {wide.nbytes / 1e6:>12.1f} "
+                f"{memory / wide.nbytes:>10.1f} {wide_elapsed:>10.2f} "
+                f"{wide_elapsed / elapsed:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Time and accuracy of the Jacobi eigensolver on random symmetric matrices,
+# with np.linalg.eigh as the reference.
+#
+# The error is the largest difference between the eigenvalues of both
+# solvers, relative to the largest eigenvalue, and the residual the largest
+# |A v - w v| over the eigenpairs of Jocobi, relative to the same.
+#
+# Run from the repository root:
+#     python -m benchmarks.bench_jacobi
+from __future__ import annotations
+
+import timeit
+
+import numpy as np
+
+from src.math import Jocobi, MathMatrix
+
+SIZES = (3, 10, 50, 100, 200)
+REPEAT = 3
+
+
+def random_symmetric(n: int, seed: int = 0) -> np.ndarray:
+    matrix = np.random.default_rng(seed).normal(size=(n, n))
+    return matrix + matrix.T
+
+
+def main() -> None:
+    print(
+        f"{'size':>6} {'Jocobi (ms)':>12} {'eigh (ms)':>10} {'rotations':>10} "
+        f"{'error':>9} {'residual':>9}"
+    )
+    for n in SIZES:
+        matrix = random_symmetric(n)
+        jacobi_time = min(
+            timeit.repeat(lambda: Jocobi(MathMatrix(matrix)), number=1, repeat=REPEAT)
+        )
+        eigh_time = min(
+            timeit.repeat(lambda: np.linalg.eigh(matrix), number=1, repeat=REPEAT)
+        )
+        solver = Jocobi(MathMatrix(matrix))
+        values = solver.eigen_values[:]
+        vectors = solver.eigen_vectors[:, :]
+        reference = np.linalg.eigh(matrix)[0]
+        scale = np.abs(reference).max()
+        error = np.abs(values - reference).max() / scale
+        residual = np.abs(matrix @ vectors - vectors * values).max() / scale
+        print(
+            f"{n:>6} {1e3 * jacobi_time:>12.2f} {1e3 * eigh_time:>10.3f} "
+            f"{solver._nb_rotations:>10} {error:>9.1e} {residual:>9.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
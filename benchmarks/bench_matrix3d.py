@@ -0,0 +1,112 @@
+# Per-operation latency of Matrix3D against the ndarray-backed implementation
+# it replaced, on the single-object workloads of interactive modelling.
+# NdarrayMatrix3D below keeps the method bodies of the previous
+# implementation for the operations that are measured.
+#
+# Run from the repository root:
+#     python -m benchmarks.bench_matrix3d
+from __future__ import annotations
+
+import timeit
+
+import numpy as np
+
+from src.primitive import Matrix3D, Xyz
+
+NUMBER = 20000
+
+
+class NdarrayMatrix3D:
+    _data: np.ndarray
+
+    def __init__(self, data=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]):
+        self._data = np.array(data, dtype=float)
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+    @property
+    def determinant(self) -> float:
+        return np.linalg.det(self._data)
+
+    def copy(self) -> NdarrayMatrix3D:
+        return NdarrayMatrix3D(self._data.copy())
+
+    def __matmul__(self, other: NdarrayMatrix3D | Xyz) -> NdarrayMatrix3D | Xyz:
+        if isinstance(other, NdarrayMatrix3D):
+            return NdarrayMatrix3D(np.matmul(self._data, other._data))
+        return Xyz(*(self._data @ other.to_tuple()))
+
+    def transpose(self) -> NdarrayMatrix3D:
+        self._data = self._data.T
+        return self
+
+    def invert(self) -> NdarrayMatrix3D:
+        if abs(self.determinant) < 1e-16:
+            raise ValueError("Cannot invert a singular matrix.")
+        self._data = np.linalg.inv(self._data)
+        return self
+
+    def set_rotation(self, axis: Xyz, angle: float) -> None:
+        av = axis.copy().normalize()
+        a, b, c = av.x, av.y, av.z
+        acos = np.cos(angle)
+        asin = np.sin(angle)
+        aomcos = 1.0 - acos
+        a2, b2, c2 = a * a, b * b, c * c
+        ab, bc, ac = a * b, b * c, c * a
+        self._data = np.array(
+            [
+                [
+                    1.0 + aomcos * (-(b2 + c2)),
+                    aomcos * ab - c * asin,
+                    aomcos * ac + b * asin,
+                ],
+                [
+                    aomcos * ab + c * asin,
+                    1.0 + aomcos * (-(a2 + c2)),
+                    aomcos * bc - a * asin,
+                ],
+                [
+                    aomcos * ac - b * asin,
+                    aomcos * bc + a * asin,
+                    1.0 + aomcos * (-(a2 + b2)),
+                ],
+            ],
+            dtype=float,
+        )
+
+
+def _time(func) -> float:
+    return timeit.timeit(func, number=NUMBER) / NUMBER * 1e6
+
+
+def main() -> None:
+    axis = Xyz(1.0, 2.0, 3.0)
+    xyz = Xyz(0.5, -1.0, 2.0)
+    results = {}
+    for cls in (Matrix3D, NdarrayMatrix3D):
+        m1 = cls()
+        m1.set_rotation(axis, 0.3)
+        m2 = cls()
+        m2.set_rotation(Xyz(0.0, 1.0, 1.0), -1.1)
+        results[cls] = [
+            ("construct", _time(lambda: cls())),
+            ("set_rotation", _time(lambda: m1.set_rotation(axis, 0.3))),
+            ("matrix @ matrix", _time(lambda: m1 @ m2)),
+            ("matrix @ xyz", _time(lambda: m1 @ xyz)),
+            ("copy", _time(lambda: m1.copy())),
+            ("copy + transpose", _time(lambda: m1.copy().transpose())),
+            ("determinant", _time(lambda: m1.determinant)),
+            ("copy + invert", _time(lambda: m1.copy().invert())),
+            ("data", _time(lambda: m1.data)),
+        ]
+
+    print(f"{'operation':<18}{'Matrix3D (us)':>15}{'ndarray (us)':>15}{'speedup':>10}")
+    for (name, t_new), (_, t_old) in zip(results[Matrix3D], results[NdarrayMatrix3D]):
+        print(f"{name:<18}{t_new:>15.3f}{t_old:>15.3f}{t_old / t_new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
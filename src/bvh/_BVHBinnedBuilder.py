@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ._BVHBuilderBase import BVHBuilderBase, _ranges
+
+
+# Builds a BVH with binned surface area heuristic (SAH) splits.
+#
+# The centroids of the primitives of a node are sorted into <bins> equal bins
+# along each axis, and the node is split at the bin boundary minimizing
+# N_left * Area_left + N_right * Area_right. All the nodes of a level are
+# binned and partitioned at once, so the cost of the build is a few NumPy
+# passes over the boxes per level.
+# Nodes whose centroids all fall into one bin are split at their middle.
+class BVHBinnedBuilder(BVHBuilderBase):
+    _bins: int
+
+    def __init__(
+        self,
+        leaf_node_size: int = 5,
+        max_tree_depth: int = 32,
+        is_parallel: bool = False,
+        bins: int = 32,
+        workers: int | None = None,
+        parallel_threshold: int = 200_000,
+    ):
+        super().__init__(
+            leaf_node_size, max_tree_depth, is_parallel, workers, parallel_threshold
+        )
+        if bins < 2:
+            raise ValueError("The number of bins must be at least 2.")
+        self._bins = bins
+
+    @property
+    def bins(self) -> int:
+        """Get the number of bins used to evaluate the splits along each axis."""
+        return self._bins
+
+    def _split_nodes(
+        self,
+        boxes: np.ndarray,
+        order: np.ndarray,
+        begins: np.ndarray,
+        ends: np.ndarray,
+    ) -> np.ndarray:
+        m = begins.size
+        counts = ends - begins
+        # Bins finer than the typical node size do not give better splits, so
+        # the deep levels of small nodes are binned with fewer bins.
+        nb_bins = int(min(self._bins, max(2, np.ceil(counts.mean()))))
+        starts = np.cumsum(counts) - counts
+        pos = _ranges(begins, counts)
+        node = np.repeat(np.arange(m), counts)
+        prims = order[pos]
+        lo, hi = boxes
+        centroids = 0.5 * (lo + hi)
+        dimension = centroids.shape[0]
+
+        cmin = np.minimum.reduceat(centroids, starts, axis=1)
+        extent = np.maximum.reduceat(centroids, starts, axis=1) - cmin
+        scale = np.divide(
+            nb_bins, extent, out=np.zeros_like(extent), where=extent > 0.0
+        )
+
+        best_cost = np.full(m, np.inf)
+        best_axis = np.zeros(m, dtype=np.int64)
+        best_split = np.zeros(m, dtype=np.int64)
+        axis_bins = []
+        for axis in range(dimension):
+            bins = (centroids[axis] - cmin[axis, node]) * scale[axis, node]
+            bins = np.clip(bins.astype(np.int64), 0, nb_bins - 1)
+            axis_bins.append(bins)
+            key = node * nb_bins + bins
+            bin_counts = np.bincount(key, minlength=m * nb_bins).reshape(m, nb_bins)
+            bin_lo = np.full((dimension, m * nb_bins), np.inf)
+            bin_hi = np.full((dimension, m * nb_bins), -np.inf)
+            for d in range(dimension):
+                np.minimum.at(bin_lo[d], key, lo[d])
+                np.maximum.at(bin_hi[d], key, hi[d])
+            bin_lo = bin_lo.reshape(dimension, m, nb_bins)
+            bin_hi = bin_hi.reshape(dimension, m, nb_bins)
+
+            # Split after bin i: bins [0, i] go left, bins [i + 1, nb_bins) right.
+            left_count = np.cumsum(bin_counts, axis=1)[:, :-1]
+            right_count = counts[:, None] - left_count
+            left_area = _area(
+                np.maximum.accumulate(bin_hi, axis=2)
+                - np.minimum.accumulate(bin_lo, axis=2)
+            )[:, :-1]
+            right_area = _area(
+                np.maximum.accumulate(bin_hi[..., ::-1], axis=2)
+                - np.minimum.accumulate(bin_lo[..., ::-1], axis=2)
+            )[:, -2::-1]
+            cost = left_count * left_area + right_count * right_area
+            cost[(left_count == 0) | (right_count == 0)] = np.inf
+
+            split = np.argmin(cost, axis=1)
+            axis_cost = cost[np.arange(m), split]
+            better = axis_cost < best_cost
+            best_cost[better] = axis_cost[better]
+            best_axis[better] = axis
+            best_split[better] = split[better]
+
+        bins = np.stack(axis_bins)[best_axis[node], np.arange(pos.size)]
+        is_left = bins <= best_split[node]
+
+        # Nodes without any valid binned split: keep the current order and cut
+        # in the middle.
+        no_split = ~np.isfinite(best_cost)
+        if no_split.any():
+            rank = np.arange(pos.size) - starts[node]
+            middle = rank < (counts // 2)[node]
+            is_left = np.where(no_split[node], middle, is_left)
+
+        # Stable partition of every node: left primitives first.
+        is_left = is_left.astype(np.int64)
+        left_before = np.cumsum(is_left) - is_left
+        right_before = np.arange(pos.size) - left_before
+        left_count = np.add.reduceat(is_left, starts)
+        local = np.where(
+            is_left,
+            left_before - left_before[starts][node],
+            left_count[node] + right_before - right_before[starts][node],
+        )
+        order[begins[node] + local] = prims
+        return begins + left_count
+
+
+def _area(extent: np.ndarray) -> np.ndarray:
+    # surface_area() of coordinate-major extents, (D, ...) arrays. Empty bins
+    # have negative extents and a null area.
+    extent = np.maximum(extent, 0.0)
+    if extent.shape[0] == 1:
+        return extent[0]
+    area = np.zeros(extent.shape[1:])
+    for i in range(extent.shape[0]):
+        area += extent[i] * extent[i + 1 :].sum(axis=0)
+    return area
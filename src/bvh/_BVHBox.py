@@ -1,5 +1,149 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..config import FLOAT_PRINT_PRECISION
 from ._BVHBoxBase import BVHBoxBase
+from ._BVHTree import surface_area
+
+if TYPE_CHECKING:
+    from ..primitive import Trsf3D
+
+
+# Axis-aligned box in N dimensions, stored as a (2, N) array of its min and
+# max corners.
+# A void box, bounding nothing, has its min corner at +inf and its max corner
+# at -inf, so that adding a point or a box needs no special case.
+# Points may be given as Point2D / Point3D / Xy / Xyz objects, or as sequences
+# of N coordinates.
+class BVHBox(BVHBoxBase):
+    _data: np.ndarray
+
+    def __init__(self, N: int = 3, min_point=None, max_point=None) -> None:
+        super().__init__(N)
+        self._data = np.empty((2, N), dtype=np.float64)
+        if min_point is None:
+            self.clear()
+        else:
+            self._data[0] = _coords(min_point)
+            self._data[1] = self._data[0] if max_point is None else _coords(max_point)
+
+    @staticmethod
+    def from_array(data: np.ndarray) -> BVHBox:
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim != 2 or data.shape[0] != 2:
+            raise ValueError("BVHBox data must have shape (2, N)")
+        return BVHBox(data.shape[1], data[0], data[1])
+
+    @staticmethod
+    def _view(data: np.ndarray) -> BVHBox:
+        # A box sharing memory with a (2, N) row of a BoxArray.
+        box = BVHBox.__new__(BVHBox)
+        BVHBoxBase.__init__(box, data.shape[1])
+        box._data = data
+        return box
+
+    @staticmethod
+    def from_points(points) -> BVHBox:
+        points = np.asarray([_coords(point) for point in points], dtype=np.float64)
+        return BVHBox(points.shape[1], points.min(axis=0), points.max(axis=0))
+
+    def __str__(self) -> str:
+        p = FLOAT_PRINT_PRECISION
+        lo = ", ".join(f"{v:.{p}f}" for v in self._data[0])
+        hi = ", ".join(f"{v:.{p}f}" for v in self._data[1])
+        return f"BVHBox(min=({lo}), max=({hi}))"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BVHBox):
+            return NotImplemented
+        if self.is_void() or other.is_void():
+            return self.is_void() and other.is_void()
+        return self.N == other.N and np.array_equal(self._data, other._data)
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+    @property
+    def min_point(self) -> np.ndarray:
+        return self._data[0]
+
+    @property
+    def max_point(self) -> np.ndarray:
+        return self._data[1]
+
+    def copy(self) -> BVHBox:
+        return BVHBox.from_array(self._data)
+
+    def clear(self) -> None:
+        self._data[0] = np.inf
+        self._data[1] = -np.inf
+
+    def is_void(self) -> bool:
+        return bool(np.any(self._data[0] > self._data[1]))
+
+    def add_point(self, point) -> None:
+        xyz = _coords(point)
+        np.minimum(self._data[0], xyz, out=self._data[0])
+        np.maximum(self._data[1], xyz, out=self._data[1])
+
+    def add_box(self, other: BVHBox) -> None:
+        np.minimum(self._data[0], other._data[0], out=self._data[0])
+        np.maximum(self._data[1], other._data[1], out=self._data[1])
+
+    def is_out(self, other) -> bool:
+        """Check if a box or a point lies outside of the box, touching is in."""
+        if isinstance(other, BVHBox):
+            lo, hi = other._data
+        else:
+            lo = hi = _coords(other)
+        return bool(np.any(lo > self._data[1]) or np.any(hi < self._data[0]))
+
+    def center(self, axis: int | None = None) -> np.ndarray | float:
+        if axis is None:
+            return 0.5 * (self._data[0] + self._data[1])
+        return 0.5 * float(self._data[0, axis] + self._data[1, axis])
+
+    def size(self) -> np.ndarray:
+        return np.maximum(self._data[1] - self._data[0], 0.0)
+
+    def area(self) -> float:
+        """Get the measure used by the surface area heuristic.
+
+        The length in 1D, the area in 2D, half the surface area in 3D.
+        """
+        return float(surface_area(self._data[0], self._data[1]))
+
+    def volume(self) -> float:
+        return float(np.prod(self.size()))
+
+    def transform(self, trsf3d: Trsf3D) -> BVHBox:
+        """Get the box bounding this 3D box once transformed."""
+        if self.N != 3:
+            raise ValueError("Only 3D boxes can be transformed by a Trsf3D.")
+        if self.is_void():
+            return BVHBox(3)
+        matrix, loc = trsf3d.to_affine()
+        center = matrix @ self.center() + loc
+        half = np.abs(matrix) @ (0.5 * self.size())
+        return BVHBox(3, center - half, center + half)
+
+    def square_distance_to(self, point) -> float:
+        xyz = _coords(point)
+        gap = np.maximum(self._data[0] - xyz, xyz - self._data[1])
+        gap = np.maximum(gap, 0.0)
+        return float(gap @ gap)
+
+    def distance_to(self, point) -> float:
+        """Get the distance from a point to the box, null inside."""
+        return float(np.sqrt(self.square_distance_to(point)))
 
 
-class BVHBox:
-    pass
+def _coords(point) -> np.ndarray:
+    # Coordinates of a point object or of a sequence.
+    if hasattr(point, "to_tuple"):
+        point = point.to_tuple()
+    return np.asarray(point, dtype=np.float64)
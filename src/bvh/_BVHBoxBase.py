@@ -3,4 +3,10 @@ class BVHBoxBase:
     N: int
 
     def __init__(self, N: int):
+        if N < 1:
+            raise ValueError("Box dimension must be at least 1.")
         self.N = N
+
+    @property
+    def dimension(self) -> int:
+        return self.N
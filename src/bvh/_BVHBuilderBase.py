@@ -1,22 +1,47 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ._BoxArray import BoxArray
+from ._BVHTree import BVHTree, _stitch
+
+
 class BVHBuilderBase:
     _is_parallel: bool
+    _workers: int | None
+    _parallel_threshold: int
 
     def __init__(
-        self, leaf_node_size: int, max_tree_depth: int, is_parallel: bool = False
+        self,
+        leaf_node_size: int,
+        max_tree_depth: int,
+        is_parallel: bool = False,
+        workers: int | None = None,
+        parallel_threshold: int = 200_000,
     ):
+        if leaf_node_size < 1:
+            raise ValueError("Leaf node size must be at least 1.")
+        if max_tree_depth < 0:
+            raise ValueError("Maximum tree depth must be non-negative.")
         self._is_parallel = is_parallel
         self._leaf_node_size = leaf_node_size
         self._max_tree_depth = max_tree_depth
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
 
     @property
     def max_tree_depth(self) -> int:
         """Get the maximum depth of the BVH tree."""
-        raise NotImplementedError("Subclasses must implement this method.")
+        return self._max_tree_depth
 
     @property
     def leaf_node_size(self) -> int:
         """Get the maximum number of primitives in a leaf node."""
-        raise NotImplementedError("Subclasses must implement this method.")
+        return self._leaf_node_size
 
     @property
     def is_parallel(self) -> bool:
@@ -27,3 +52,244 @@ class BVHBuilderBase:
     def is_parallel(self, value: bool):
         """Set the parallel mode of the BVH builder."""
         self._is_parallel = value
+
+    @property
+    def workers(self) -> int:
+        """Get the number of worker processes of the parallel mode."""
+        if self._workers is None:
+            return os.cpu_count() or 1
+        return self._workers
+
+    @workers.setter
+    def workers(self, value: int | None):
+        """Set the number of worker processes, None for one per CPU."""
+        if value is not None and value < 1:
+            raise ValueError("The number of workers must be at least 1.")
+        self._workers = value
+
+    @property
+    def parallel_threshold(self) -> int:
+        """Get the number of boxes below which the build stays serial."""
+        return self._parallel_threshold
+
+    @parallel_threshold.setter
+    def parallel_threshold(self, value: int):
+        """Set the number of boxes below which the build stays serial."""
+        self._parallel_threshold = value
+
+    def build(self, boxes: np.ndarray) -> BVHTree:
+        """Build a BVH over N boxes, given as an (N, 2, D) array or a BoxArray."""
+        boxes = self._prepare_boxes(boxes)
+        n = boxes.shape[0]
+        if n == 0:
+            return self._empty_tree(boxes.shape[2])
+        order = self._initial_order(boxes)
+        # The boxes are kept coordinate-major, (2, D, N), so that every
+        # gather and reduction of the build runs over contiguous rows.
+        boxes = np.ascontiguousarray(boxes.transpose(1, 2, 0))
+        if self._is_parallel and self.workers > 1 and n >= self._parallel_threshold:
+            return self._build_parallel(boxes, order)
+        info, node_boxes = self._build_levels(boxes, order, 0, n, 0)
+        return BVHTree(info, node_boxes, order)
+
+    def _initial_order(self, boxes: np.ndarray) -> np.ndarray:
+        """Get the order of the primitives before the root is split."""
+        return np.arange(boxes.shape[0], dtype=np.int64)
+
+    def _split_nodes(
+        self,
+        boxes: np.ndarray,
+        order: np.ndarray,
+        begins: np.ndarray,
+        ends: np.ndarray,
+    ) -> np.ndarray:
+        """Split the nodes [begins, ends) of <order> in two, in place.
+
+        <boxes> is a coordinate-major (2, D, n) array holding the boxes of the
+        primitives of the nodes, node after node, in the current order. Every
+        node is reordered so that its left child comes first, and the position
+        where the right child starts is returned for each node.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def _shared_arrays(self) -> dict[str, np.ndarray]:
+        """Get the per-build arrays, besides the boxes, that the workers need."""
+        return {}
+
+    def _attach_shared_arrays(self, arrays: dict[str, np.ndarray]) -> None:
+        """Use the per-build arrays of _shared_arrays() inside a worker."""
+
+    def _build_range(
+        self, boxes: np.ndarray, order: np.ndarray, begin: int, end: int, level: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Rebuild the subtree of the primitives [begin, end) of <order>.
+
+        <boxes> are the coordinate-major (2, D, N) boxes of all the primitives.
+        Returns the node info and node boxes of the subtree, rooted at 0.
+        """
+        return self._build_levels(boxes, order, begin, end, level)
+
+    def _build_levels(
+        self,
+        boxes: np.ndarray,
+        order: np.ndarray,
+        begin: int,
+        end: int,
+        level: int,
+        task_size: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Top-down build of the subtree of the primitives [begin, end) of
+        # <order>, rooted at <level>, one whole level of the tree at a time:
+        # all the nodes of a level are bounded and split together by
+        # vectorized operations, so the Python overhead is paid per level and
+        # not per node. Nodes of at most <task_size> primitives are left as
+        # leaves, to be built later by the workers of the parallel mode.
+        # Returns the node info and node boxes of the subtree, rooted at 0.
+        dimension = boxes.shape[1]
+        max_size = self._leaf_node_size if task_size is None else task_size
+        infos = []
+        bounds = []
+        begins = np.full(1, begin, dtype=np.int64)
+        ends = np.full(1, end, dtype=np.int64)
+        next_node = 1
+        while begins.size > 0:
+            counts = ends - begins
+            starts = np.cumsum(counts) - counts
+            level_boxes = np.take(boxes, order[_ranges(begins, counts)], axis=2)
+            node_boxes = np.empty((begins.size, 2, dimension))
+            node_boxes[:, 0] = np.minimum.reduceat(level_boxes[0], starts, axis=1).T
+            node_boxes[:, 1] = np.maximum.reduceat(level_boxes[1], starts, axis=1).T
+
+            info = np.empty((begins.size, 4), dtype=np.int32)
+            info[:, 0] = 1
+            info[:, 1] = begins
+            info[:, 2] = ends
+            info[:, 3] = level
+
+            split = np.flatnonzero((counts > max_size) & (level < self._max_tree_depth))
+            if split.size > 0:
+                if split.size < begins.size:
+                    level_boxes = np.take(
+                        level_boxes, _ranges(starts[split], counts[split]), axis=2
+                    )
+                mids = self._split_nodes(level_boxes, order, begins[split], ends[split])
+                children = next_node + 2 * np.arange(split.size)
+                info[split, 0] = 0
+                info[split, 1] = children
+                info[split, 2] = children + 1
+                next_node += 2 * split.size
+                begins, ends = (
+                    np.stack([begins[split], mids], axis=1).ravel(),
+                    np.stack([mids, ends[split]], axis=1).ravel(),
+                )
+            else:
+                begins = ends = np.zeros(0, dtype=np.int64)
+
+            infos.append(info)
+            bounds.append(node_boxes)
+            level += 1
+        return np.concatenate(infos), np.concatenate(bounds)
+
+    def _build_parallel(self, boxes: np.ndarray, order: np.ndarray) -> BVHTree:
+        # The top levels are split serially until there are a few subtrees per
+        # worker; the subtrees are then built by a process pool. The workers
+        # read the boxes and reorder their own disjoint ranges of <order>
+        # through shared memory, and their node arrays are stitched under the
+        # top tree.
+        n = order.shape[0]
+        workers = self.workers
+        task_size = max(self._leaf_node_size, n // (4 * workers))
+        info, node_boxes = self._build_levels(boxes, order, 0, n, 0, task_size)
+        counts = info[:, 2] - info[:, 1]
+        tasks = np.flatnonzero(
+            (info[:, 0] == 1)
+            & (counts > self._leaf_node_size)
+            & (info[:, 3] < self._max_tree_depth)
+        )
+        if tasks.size == 0:
+            return BVHTree(info, node_boxes, order)
+
+        arrays = {"boxes": boxes, "order": order, **self._shared_arrays()}
+        blocks = {}
+        try:
+            for name, array in arrays.items():
+                block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+                blocks[name] = block
+                np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            specs = {
+                name: (blocks[name].name, array.shape, array.dtype.str)
+                for name, array in arrays.items()
+            }
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        _build_task,
+                        self,
+                        specs,
+                        int(info[task, 1]),
+                        int(info[task, 2]),
+                        int(info[task, 3]),
+                    )
+                    for task in tasks
+                ]
+                subtrees = [future.result() for future in futures]
+            order = np.ndarray(n, np.int64, buffer=blocks["order"].buf).copy()
+        finally:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+
+        info, node_boxes = _stitch(info, node_boxes, tasks, subtrees)
+        return BVHTree(info, node_boxes, order)
+
+    @staticmethod
+    def _prepare_boxes(boxes) -> np.ndarray:
+        if isinstance(boxes, BoxArray):
+            boxes = boxes.data
+        boxes = np.asarray(boxes, dtype=np.float64)
+        if boxes.ndim != 3 or boxes.shape[1] != 2:
+            raise ValueError("Boxes must have shape (N, 2, D)")
+        return boxes
+
+    @staticmethod
+    def _empty_tree(dimension: int) -> BVHTree:
+        return BVHTree(
+            np.zeros((0, 4), dtype=np.int32),
+            np.zeros((0, 2, dimension), dtype=np.float64),
+            np.zeros(0, dtype=np.int64),
+        )
+
+
+def _ranges(begins: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    # Concatenation of the ranges [begins[i], begins[i] + counts[i]).
+    starts = np.cumsum(counts) - counts
+    return np.repeat(begins - starts, counts) + np.arange(counts.sum())
+
+
+def _build_task(
+    builder: BVHBuilderBase,
+    specs: dict[str, tuple[str, tuple[int, ...], str]],
+    begin: int,
+    end: int,
+    level: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Worker side of BVHBuilderBase._build_parallel(): builds the subtree of
+    # the primitives [begin, end) on the shared boxes and order.
+    blocks = {
+        name: shared_memory.SharedMemory(name=spec[0]) for name, spec in specs.items()
+    }
+    try:
+        arrays = {
+            name: np.ndarray(shape, dtype, buffer=blocks[name].buf)
+            for name, (_, shape, dtype) in specs.items()
+        }
+        boxes = arrays.pop("boxes")
+        order = arrays.pop("order")
+        builder._attach_shared_arrays(arrays)
+        result = builder._build_levels(boxes, order, begin, end, level)
+        builder._attach_shared_arrays({})
+        del boxes, order, arrays
+        return result
+    finally:
+        for block in blocks.values():
+            block.close()
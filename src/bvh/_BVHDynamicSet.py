@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import copy
+
+import numpy as np
+
+from ._BVHBuilderBase import BVHBuilderBase
+from ._BVHBinnedBuilder import BVHBinnedBuilder
+from ._BVHTree import BVHTree, surface_area
+from ._BvhSet import BVHSet
+
+
+# A set of boxes whose BVH is edited in place, one primitive at a time.
+#
+# Every leaf holds one primitive. As in the dynamic tree of Box2D, a box is
+# inserted next to the sibling found by a greedy descent on the surface area
+# heuristic, and removed by replacing its parent with its sibling; the path
+# up to the root is then refitted and rebalanced by tree rotations lifting
+# the higher grandchild of every node whose children heights differ by more
+# than one. insert(), remove() and update() are thus O(log N).
+# Large imports and rebuild() go through the bulk builder instead.
+#
+# The primitives are identified by the ids returned by insert(); the ids of
+# removed primitives are reused. The queries of BVHSet run on snapshot(), a
+# compact BVHSet built from the tree by one vectorized pass after every batch
+# of edits, whose primitive indices are these ids.
+class BVHDynamicSet:
+    _builder: BVHBuilderBase
+    _boxes: np.ndarray
+    _leaf_of: np.ndarray
+    _free_ids: list[int]
+    _nb_ids: int
+    _node_boxes: np.ndarray
+    _children: np.ndarray
+    _parent: np.ndarray
+    _height: np.ndarray
+    _primitive: np.ndarray
+    _free_nodes: list[int]
+    _root: int
+    _snapshot: BVHSet | None
+
+    def __init__(self, boxes: np.ndarray, builder: BVHBuilderBase | None = None):
+        self._builder = BVHBinnedBuilder() if builder is None else builder
+        boxes = BVHBuilderBase._prepare_boxes(boxes)
+        self._boxes = boxes.copy()
+        self._leaf_of = np.full(boxes.shape[0], -1, dtype=np.int64)
+        self._free_ids = []
+        self._nb_ids = boxes.shape[0]
+        self.rebuild()
+
+    def __len__(self) -> int:
+        return self._nb_ids - len(self._free_ids)
+
+    def __str__(self) -> str:
+        return f"BVHDynamicSet(size={len(self)}, height={self.height})"
+
+    @property
+    def builder(self) -> BVHBuilderBase:
+        return self._builder
+
+    @property
+    def dimension(self) -> int:
+        return self._boxes.shape[2]
+
+    @property
+    def height(self) -> int:
+        """Get the height of the tree, 0 for a single leaf or an empty set."""
+        return 0 if self._root < 0 else int(self._height[self._root])
+
+    def ids(self) -> np.ndarray:
+        """Get the ids of the primitives of the set, in increasing order."""
+        return np.flatnonzero(self._leaf_of[: self._nb_ids] >= 0)
+
+    def box(self, index: int) -> np.ndarray:
+        self._check_id(index)
+        return self._boxes[index]
+
+    def insert(self, box) -> int:
+        """Insert a (2, D) box, or a BVHBox, and return its primitive id."""
+        box = self._prepare_box(box)
+        if self._free_ids:
+            index = self._free_ids.pop()
+        else:
+            index = self._nb_ids
+            if index == self._boxes.shape[0]:
+                self._grow_ids(max(1, 2 * index))
+            self._nb_ids += 1
+        self._boxes[index] = box
+        self._insert_leaf(index)
+        return index
+
+    def insert_many(self, boxes: np.ndarray, bulk_fraction: float = 0.5) -> np.ndarray:
+        """Insert (K, 2, D) boxes and return their primitive ids.
+
+        When K exceeds <bulk_fraction> times the size of the set, the whole
+        tree is rebuilt by the bulk builder; otherwise the boxes are inserted
+        one by one.
+        """
+        boxes = BVHBuilderBase._prepare_boxes(boxes)
+        if boxes.shape[2] != self.dimension:
+            raise ValueError("Boxes must have the dimension of the set.")
+        if boxes.shape[0] <= bulk_fraction * len(self):
+            return np.array([self.insert(box) for box in boxes], dtype=np.int64)
+        reused = self._free_ids[::-1][: boxes.shape[0]]
+        del self._free_ids[len(self._free_ids) - len(reused) :]
+        start = self._nb_ids
+        end = start + boxes.shape[0] - len(reused)
+        if end > self._boxes.shape[0]:
+            self._grow_ids(max(end, 2 * self._boxes.shape[0]))
+        self._nb_ids = end
+        ids = np.concatenate([np.array(reused, dtype=np.int64), np.arange(start, end)])
+        self._boxes[ids] = boxes
+        self.rebuild()
+        return ids
+
+    def remove(self, index: int) -> None:
+        """Remove the primitive of id <index>."""
+        self._check_id(index)
+        self._remove_leaf(self._leaf_of[index])
+        self._leaf_of[index] = -1
+        self._boxes[index, 0] = np.inf
+        self._boxes[index, 1] = -np.inf
+        self._free_ids.append(index)
+
+    def update(self, index: int, box) -> None:
+        """Move the primitive of id <index> to a new (2, D) box."""
+        self._check_id(index)
+        box = self._prepare_box(box)
+        self._remove_leaf(self._leaf_of[index])
+        self._boxes[index] = box
+        self._insert_leaf(index)
+
+    def rebuild(self) -> None:
+        """Rebuild the whole tree over the current boxes with the bulk builder."""
+        ids = np.setdiff1d(np.arange(self._nb_ids), self._free_ids)
+        n = ids.size
+        self._leaf_of[:] = -1
+        self._allocate_nodes(max(1, 2 * n - 1))
+        self._snapshot = None
+        if n == 0:
+            return
+        # The bulk builder is used with one primitive per leaf; leaves left
+        # larger by the maximum depth keep their first primitive, the node
+        # boxes are refitted to them, and the other primitives are inserted.
+        builder = copy.copy(self._builder)
+        builder._leaf_node_size = 1
+        tree = builder.build(self._boxes[ids])
+        info = tree.node_info
+        m = tree.length
+        is_leaf = info[:, 0] == 1
+        inner = ~is_leaf
+        self._children[:m][inner] = info[inner, 1:3]
+        self._parent[:m] = tree.parents()
+        leaves = np.flatnonzero(is_leaf)
+        primitives = ids[tree.indices[info[leaves, 1]]]
+        self._primitive[leaves] = primitives
+        self._leaf_of[primitives] = leaves
+        self._node_boxes[leaves] = self._boxes[primitives]
+        self._height[:m] = 0
+        for nodes in tree._plan()[1]:
+            left, right = info[nodes, 1], info[nodes, 2]
+            self._height[nodes] = 1 + np.maximum(
+                self._height[left], self._height[right]
+            )
+            self._node_boxes[nodes, 0] = np.minimum(
+                self._node_boxes[left, 0], self._node_boxes[right, 0]
+            )
+            self._node_boxes[nodes, 1] = np.maximum(
+                self._node_boxes[left, 1], self._node_boxes[right, 1]
+            )
+        self._free_nodes = list(range(self._parent.size - 1, m - 1, -1))
+        self._root = 0
+        extra = info[leaves, 2] - info[leaves, 1] > 1
+        for leaf in leaves[extra]:
+            for position in range(info[leaf, 1] + 1, info[leaf, 2]):
+                self._insert_leaf(int(ids[tree.indices[position]]))
+
+    def snapshot(self) -> BVHSet:
+        """Get the current boxes and tree as a BVHSet, to be queried.
+
+        The snapshot is rebuilt from the tree, in one vectorized pass, at the
+        first call after an edit. Its primitive indices are the ids of this
+        set, the rows of removed ids being void boxes; it must not be refitted.
+        """
+        if self._snapshot is None:
+            self._snapshot = BVHSet._from_tree(
+                self._boxes[: self._nb_ids].copy(), self.tree(), self._builder
+            )
+        return self._snapshot
+
+    def tree(self) -> BVHTree:
+        """Get the tree in the BVHTree layout, nodes numbered breadth first."""
+        if self._root < 0:
+            return BVHBuilderBase._empty_tree(self.dimension)
+        levels = []
+        frontier = np.array([self._root], dtype=np.int64)
+        while frontier.size > 0:
+            levels.append(frontier)
+            frontier = frontier[self._children[frontier, 0] >= 0]
+            frontier = self._children[frontier].ravel()
+        reached = np.concatenate(levels)
+        number = np.full(self._parent.size, -1, dtype=np.int64)
+        number[reached] = np.arange(reached.size)
+        info = np.empty((reached.size, 4), dtype=np.int32)
+        info[:, 3] = np.repeat(np.arange(len(levels)), [lv.size for lv in levels])
+        is_leaf = self._children[reached, 0] < 0
+        leaves = np.flatnonzero(is_leaf)
+        info[leaves, 0] = 1
+        info[leaves, 1] = np.arange(leaves.size)
+        info[leaves, 2] = info[leaves, 1] + 1
+        inner = np.flatnonzero(~is_leaf)
+        info[inner, 0] = 0
+        info[inner, 1:3] = number[self._children[reached[inner]]]
+        indices = self._primitive[reached[leaves]]
+        return BVHTree(info, self._node_boxes[reached], indices)
+
+    def intersect_rays(self, *args, **kwargs) -> tuple[np.ndarray, np.ndarray]:
+        """See BVHSet.intersect_rays(); the primitives are given by id."""
+        return self.snapshot().intersect_rays(*args, **kwargs)
+
+    def nearest(self, *args, **kwargs) -> tuple[np.ndarray, np.ndarray]:
+        """See BVHSet.nearest(); the primitives are given by id."""
+        return self.snapshot().nearest(*args, **kwargs)
+
+    def k_nearest(self, *args, **kwargs) -> tuple[np.ndarray, np.ndarray]:
+        """See BVHSet.k_nearest(); the primitives are given by id."""
+        return self.snapshot().k_nearest(*args, **kwargs)
+
+    def overlapping_pairs(
+        self, other: BVHSet | BVHDynamicSet | None = None, batch_size: int = 1 << 20
+    ) -> np.ndarray:
+        """See BVHSet.overlapping_pairs(); the primitives are given by id."""
+        if isinstance(other, BVHDynamicSet):
+            other = other.snapshot()
+        return self.snapshot().overlapping_pairs(other, batch_size)
+
+    def _check_id(self, index: int) -> None:
+        if not 0 <= index < self._nb_ids or self._leaf_of[index] < 0:
+            raise ValueError(f"No primitive of id {index} in the set.")
+
+    def _prepare_box(self, box) -> np.ndarray:
+        box = np.asarray(getattr(box, "data", box), dtype=np.float64)
+        if box.shape != (2, self.dimension):
+            raise ValueError(f"Box must have shape (2, {self.dimension}).")
+        return box
+
+    def _grow_ids(self, capacity: int) -> None:
+        boxes = np.empty((capacity, 2, self.dimension))
+        boxes[:, 0] = np.inf
+        boxes[:, 1] = -np.inf
+        boxes[: self._boxes.shape[0]] = self._boxes
+        self._boxes = boxes
+        leaf_of = np.full(capacity, -1, dtype=np.int64)
+        leaf_of[: self._leaf_of.size] = self._leaf_of
+        self._leaf_of = leaf_of
+
+    def _allocate_nodes(self, capacity: int) -> None:
+        self._node_boxes = np.empty((capacity, 2, self.dimension))
+        self._children = np.full((capacity, 2), -1, dtype=np.int64)
+        self._parent = np.full(capacity, -1, dtype=np.int64)
+        self._height = np.zeros(capacity, dtype=np.int64)
+        self._primitive = np.full(capacity, -1, dtype=np.int64)
+        self._free_nodes = list(range(capacity - 1, -1, -1))
+        self._root = -1
+
+    def _new_node(self) -> int:
+        if not self._free_nodes:
+            size = self._parent.size
+            self._node_boxes = np.concatenate(
+                [self._node_boxes, np.empty_like(self._node_boxes)]
+            )
+            self._children = np.concatenate(
+                [self._children, np.full_like(self._children, -1)]
+            )
+            self._parent = np.concatenate([self._parent, np.full(size, -1)])
+            self._height = np.concatenate([self._height, np.zeros(size, np.int64)])
+            self._primitive = np.concatenate([self._primitive, np.full(size, -1)])
+            self._free_nodes = list(range(2 * size - 1, size - 1, -1))
+        node = self._free_nodes.pop()
+        self._children[node] = -1
+        self._parent[node] = -1
+        self._height[node] = 0
+        self._primitive[node] = -1
+        return node
+
+    def _free_node(self, node: int) -> None:
+        self._free_nodes.append(node)
+
+    def _insert_leaf(self, index: int) -> None:
+        self._snapshot = None
+        leaf = self._new_node()
+        box = self._boxes[index]
+        self._node_boxes[leaf] = box
+        self._primitive[leaf] = index
+        self._leaf_of[index] = leaf
+        if self._root < 0:
+            self._root = leaf
+            return
+
+        # Greedy descent: stop where pairing the new leaf with the node costs
+        # less than pushing it down into either child.
+        node = self._root
+        while self._children[node, 0] >= 0:
+            # Areas of the node and its two children, alone and with the box.
+            nodes = np.array([node, *self._children[node]])
+            boxes = self._node_boxes[nodes]
+            area = surface_area(boxes[:, 0], boxes[:, 1])
+            combined = surface_area(
+                np.minimum(boxes[:, 0], box[0]), np.maximum(boxes[:, 1], box[1])
+            )
+            cost = 2.0 * combined[0]
+            inheritance = 2.0 * (combined[0] - area[0])
+            child_costs = combined[1:] + inheritance
+            child_costs -= np.where(self._children[nodes[1:], 0] >= 0, area[1:], 0.0)
+            if cost < child_costs[0] and cost < child_costs[1]:
+                break
+            node = int(nodes[1 + int(child_costs[1] < child_costs[0])])
+
+        sibling = node
+        old_parent = int(self._parent[sibling])
+        parent = self._new_node()
+        self._parent[parent] = old_parent
+        _union(self._node_boxes[sibling], box, self._node_boxes[parent])
+        self._height[parent] = self._height[sibling] + 1
+        self._children[parent] = (sibling, leaf)
+        self._parent[sibling] = parent
+        self._parent[leaf] = parent
+        if old_parent < 0:
+            self._root = parent
+        else:
+            self._replace_child(old_parent, sibling, parent)
+        self._fix_upwards(old_parent)
+
+    def _remove_leaf(self, leaf: int) -> None:
+        self._snapshot = None
+        if leaf == self._root:
+            self._root = -1
+            self._free_node(leaf)
+            return
+        parent = int(self._parent[leaf])
+        grandparent = int(self._parent[parent])
+        left, right = self._children[parent]
+        sibling = int(right if left == leaf else left)
+        self._parent[sibling] = grandparent
+        if grandparent < 0:
+            self._root = sibling
+        else:
+            self._replace_child(grandparent, parent, sibling)
+        self._free_node(parent)
+        self._free_node(leaf)
+        self._fix_upwards(grandparent)
+
+    def _replace_child(self, parent: int, old: int, new: int) -> None:
+        slot = 0 if self._children[parent, 0] == old else 1
+        self._children[parent, slot] = new
+
+    def _fix_upwards(self, node: int) -> None:
+        # Rebalances, then refits, every node from <node> up to the root.
+        while node >= 0:
+            node = self._balance(node)
+            left, right = self._children[node]
+            self._height[node] = 1 + max(self._height[left], self._height[right])
+            _union(
+                self._node_boxes[left], self._node_boxes[right], self._node_boxes[node]
+            )
+            node = int(self._parent[node])
+
+    def _balance(self, a: int) -> int:
+        # Lifts the higher child of <a> when its children heights differ by
+        # more than one, and returns the new root of the subtree.
+        if self._children[a, 0] < 0 or self._height[a] < 2:
+            return a
+        b, c = (int(child) for child in self._children[a])
+        balance = self._height[c] - self._height[b]
+        if balance > 1:
+            return self._rotate(a, 1)
+        if balance < -1:
+            return self._rotate(a, 0)
+        return a
+
+    def _rotate(self, a: int, slot: int) -> int:
+        # Lifts the child <slot> of <a>, c, in place of a: a takes the lower
+        # child of c in place of c, and c keeps the higher one.
+        c = int(self._children[a, slot])
+        other = int(self._children[a, 1 - slot])
+        f, g = (int(child) for child in self._children[c])
+        parent = int(self._parent[a])
+        self._parent[c] = parent
+        self._parent[a] = c
+        if parent < 0:
+            self._root = c
+        else:
+            self._replace_child(parent, a, c)
+        high, low = (f, g) if self._height[f] > self._height[g] else (g, f)
+        self._children[c] = (a, high)
+        self._children[a, slot] = low
+        self._parent[low] = a
+        _union(self._node_boxes[other], self._node_boxes[low], self._node_boxes[a])
+        self._height[a] = 1 + max(self._height[other], self._height[low])
+        _union(self._node_boxes[a], self._node_boxes[high], self._node_boxes[c])
+        self._height[c] = 1 + max(self._height[a], self._height[high])
+        return c
+
+
+def _union(box_a: np.ndarray, box_b: np.ndarray, out: np.ndarray) -> None:
+    # Writes the (2, D) box bounding two others to <out>.
+    np.minimum(box_a[0], box_b[0], out=out[0])
+    np.maximum(box_a[1], box_b[1], out=out[1])
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import Callable
+
+import numpy as np
+
+from ..primitive import Trsf3D
+from ._BVHBuilderBase import BVHBuilderBase
+from ._BvhSet import BVHSet, _points, _rays
+
+
+# Two-level BVH over instances of shared 3D parts.
+#
+# Every part is a BVHSet built once in its own space; an instance places a
+# part in the world with a Trsf3D. The top level is a BVHSet over the world
+# bounds of the instances, so a build only costs O(unique parts + instances),
+# and the geometry of a part is never duplicated.
+# Queries run on the top level; the rays and points reaching an instance are
+# moved into the space of its part by the inverse transform of the instance,
+# cached with the transforms, and traverse the part BVH there. A Trsf3D being
+# a rotation times a scale, ray parameters are the same in both spaces and
+# distances are divided by the absolute scale.
+class BVHInstanceSet:
+    _parts: list[BVHSet]
+    _part_indices: np.ndarray
+    _transforms: list[Trsf3D]
+    _matrices: np.ndarray
+    _locs: np.ndarray
+    _inverse_matrices: np.ndarray
+    _inverse_locs: np.ndarray
+    _scales: np.ndarray
+    _top: BVHSet
+
+    def __init__(
+        self,
+        parts: list[BVHSet],
+        part_indices,
+        transforms: list[Trsf3D],
+        builder: BVHBuilderBase | None = None,
+    ):
+        for part in parts:
+            if part.dimension != 3:
+                raise ValueError("Instanced parts must be 3D.")
+            if len(part) == 0:
+                raise ValueError("Instanced parts must not be empty.")
+        part_indices = np.asarray(part_indices, dtype=np.int64).reshape(-1)
+        if part_indices.size != len(transforms):
+            raise ValueError("Every instance must have one part and one transform.")
+        if np.any((part_indices < 0) | (part_indices >= len(parts))):
+            raise ValueError("Part index out of range.")
+        self._parts = list(parts)
+        self._part_indices = part_indices
+        self._set_transforms(transforms)
+        self._top = BVHSet(self._instance_boxes(), builder)
+
+    def __len__(self) -> int:
+        return self._part_indices.size
+
+    def __str__(self) -> str:
+        return f"BVHInstanceSet(parts={len(self._parts)}, instances={len(self)})"
+
+    @property
+    def parts(self) -> list[BVHSet]:
+        return self._parts
+
+    @property
+    def part_indices(self) -> np.ndarray:
+        """Get the index of the part of every instance."""
+        return self._part_indices
+
+    @property
+    def transforms(self) -> list[Trsf3D]:
+        return self._transforms
+
+    @property
+    def top_level(self) -> BVHSet:
+        """Get the BVHSet over the world bounds of the instances."""
+        return self._top
+
+    def inverse_affines(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the cached inverse transforms as (K, 3, 3) and (K, 3) arrays."""
+        return self._inverse_matrices, self._inverse_locs
+
+    def set_transforms(
+        self, transforms: list[Trsf3D], max_cost_growth: float | None = None
+    ) -> float:
+        """Move the instances to new placements, refitting the top level.
+
+        See BVHSet.refit() for <max_cost_growth> and the returned value.
+        """
+        if len(transforms) != len(self):
+            raise ValueError("Every instance must have one transform.")
+        self._set_transforms(transforms)
+        return self._top.refit(self._instance_boxes(), max_cost_growth)
+
+    def intersect_rays(
+        self,
+        origins,
+        directions=None,
+        tmax=np.inf,
+        intersector: (
+            Callable[[int, np.ndarray, np.ndarray, np.ndarray], np.ndarray] | None
+        ) = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the closest instance and primitive hit by every ray.
+
+        See BVHSet.intersect_rays() for the rays and <tmax>. <intersector>,
+        when given, is called with a part index and the part-space origins,
+        directions and primitive indices of (ray, primitive) pairs of that
+        part.
+        Returns the instance and the primitive index in its part, -1 for a
+        miss, and t, inf for a miss.
+        """
+        origins, directions = _rays(origins, directions)
+
+        def part_query(part, instances, o, d):
+            local_o, local_d = self._to_local(instances, o, d)
+            part_intersector = None
+            if intersector is not None:
+                index = self._part_indices[instances[0]]
+                part_intersector = partial(intersector, index)
+            return part.intersect_rays(local_o, local_d, intersector=part_intersector)
+
+        # The top level only needs the distance of every (ray, instance)
+        # pair; the primitive is found again for the closest instances.
+        def instance_t(o, d, instances):
+            return self._by_part(instances, part_query, o, d)[1]
+
+        instance, t = self._top.intersect_rays(origins, directions, tmax, instance_t)
+        prim = np.full(instance.shape, -1, dtype=np.int64)
+        hit = instance >= 0
+        prim[hit] = self._by_part(
+            instance[hit], part_query, origins[hit], directions[hit]
+        )[0]
+        return instance, prim, t
+
+    def nearest(
+        self,
+        points,
+        distance: Callable[[int, np.ndarray, np.ndarray], np.ndarray] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the closest instance and primitive to every point.
+
+        See BVHSet.nearest() for the points. <distance>, when given, is
+        called with a part index and the part-space points and primitive
+        indices of (point, primitive) pairs of that part, and returns their
+        part-space distances.
+        Returns the instance, the primitive index in its part, and the world
+        distance.
+        """
+        points = _points(points)
+
+        def part_query(part, instances, p):
+            (local,) = self._to_local(instances, p)
+            part_distance = None
+            if distance is not None:
+                index = self._part_indices[instances[0]]
+                part_distance = partial(distance, index)
+            prim, d = part.nearest(local, part_distance)
+            return prim, d * self._scales[instances]
+
+        def instance_distance(p, instances):
+            return self._by_part(instances, part_query, p)[1]
+
+        instance, d = self._top.nearest(points, instance_distance)
+        prim = np.full(instance.shape, -1, dtype=np.int64)
+        found = instance >= 0
+        prim[found] = self._by_part(instance[found], part_query, points[found])[0]
+        return instance, prim, d
+
+    def _set_transforms(self, transforms: list[Trsf3D]) -> None:
+        self._transforms = list(transforms)
+        self._matrices, self._locs = Trsf3D.to_affine_many(self._transforms)
+        self._inverse_matrices = np.linalg.inv(self._matrices)
+        self._inverse_locs = -np.einsum(
+            "kij,kj->ki", self._inverse_matrices, self._locs
+        )
+        self._scales = np.abs(np.cbrt(np.linalg.det(self._matrices)))
+
+    def _instance_boxes(self) -> np.ndarray:
+        # World bounds of the instances, from the root boxes of their parts.
+        roots = np.stack([part.tree.node_boxes[0] for part in self._parts])
+        roots = roots[self._part_indices]
+        center = np.einsum("kij,kj->ki", self._matrices, roots.mean(axis=1))
+        center += self._locs
+        half = np.einsum(
+            "kij,kj->ki", np.abs(self._matrices), 0.5 * (roots[:, 1] - roots[:, 0])
+        )
+        return np.stack([center - half, center + half], axis=1)
+
+    def _to_local(self, instances: np.ndarray, points: np.ndarray, *vectors):
+        # Moves points, then vectors, into the part space of their instances.
+        inverse = self._inverse_matrices[instances]
+        local = [
+            np.einsum("kij,kj->ki", inverse, points) + self._inverse_locs[instances]
+        ]
+        local += [np.einsum("kij,kj->ki", inverse, v) for v in vectors]
+        return local
+
+    def _by_part(self, instances: np.ndarray, query, *arrays):
+        # Runs query(part, instances, *arrays) on the pairs of every part and
+        # gathers the (index, value) results back in the order of the pairs.
+        index = np.full(instances.shape, -1, dtype=np.int64)
+        value = np.full(instances.shape, np.inf)
+        parts = self._part_indices[instances]
+        for part in np.unique(parts):
+            pairs = np.flatnonzero(parts == part)
+            index[pairs], value[pairs] = query(
+                self._parts[part], instances[pairs], *(a[pairs] for a in arrays)
+            )
+        return index, value
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ._BVHBuilderBase import BVHBuilderBase
+from ._BVHTree import BVHTree
+
+
+# Builds a linear BVH (LBVH) from the Morton codes of the box centroids.
+#
+# The centroids are quantized on a regular grid over their bounds and the
+# bits of the grid coordinates are interleaved into one code per primitive,
+# either on 30 bits (10 bits per axis in 3D) or on 63 bits (21 bits per axis).
+# The codes are radix sorted, and every node is split where the highest bit
+# differing between its first and last codes flips; nodes whose codes are all
+# equal are cut in the middle. The primitives are never reordered after the
+# sort, which makes the build much faster than a SAH build, at the price of
+# a looser tree.
+class BVHLinearBuilder(BVHBuilderBase):
+    _code_bits: int
+    _sorted_codes: np.ndarray | None
+
+    def __init__(
+        self,
+        leaf_node_size: int = 5,
+        max_tree_depth: int = 32,
+        is_parallel: bool = False,
+        code_bits: int = 30,
+        workers: int | None = None,
+        parallel_threshold: int = 200_000,
+    ):
+        super().__init__(
+            leaf_node_size, max_tree_depth, is_parallel, workers, parallel_threshold
+        )
+        if code_bits not in (30, 63):
+            raise ValueError("Morton codes must have 30 or 63 bits.")
+        self._code_bits = code_bits
+        self._sorted_codes = None
+
+    @property
+    def code_bits(self) -> int:
+        """Get the number of bits of the Morton codes."""
+        return self._code_bits
+
+    def build(self, boxes: np.ndarray) -> BVHTree:
+        try:
+            return super().build(boxes)
+        finally:
+            self._sorted_codes = None
+
+    def morton_codes(self, boxes: np.ndarray) -> np.ndarray:
+        """Get the Morton codes of the centroids of (N, 2, D) boxes as uint64."""
+        boxes = self._prepare_boxes(boxes)
+        return self._morton_codes(0.5 * (boxes[:, 0] + boxes[:, 1]))
+
+    def _morton_codes(self, centroids: np.ndarray) -> np.ndarray:
+        # Codes of (N, D) centroids, on a grid over their bounds.
+        dimension = centroids.shape[1]
+        bits = self._code_bits // dimension
+        if bits == 0:
+            raise ValueError("Too many dimensions for the Morton code size.")
+        cmin = centroids.min(axis=0)
+        extent = centroids.max(axis=0) - cmin
+        scale = np.divide(
+            (1 << bits) - 1, extent, out=np.zeros_like(extent), where=extent > 0.0
+        )
+        grid = ((centroids - cmin) * scale).astype(np.uint64)
+        codes = np.zeros(centroids.shape[0], dtype=np.uint64)
+        for axis in range(dimension):
+            codes |= _spread_bits(grid[:, axis], bits, dimension) << np.uint64(axis)
+        return codes
+
+    def _initial_order(self, boxes: np.ndarray) -> np.ndarray:
+        codes = self.morton_codes(boxes)
+        order = _radix_argsort(codes, self._code_bits)
+        self._sorted_codes = codes[order]
+        return order
+
+    def _build_range(
+        self, boxes: np.ndarray, order: np.ndarray, begin: int, end: int, level: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # The range gets its own codes, on a grid over its centroids. Outside
+        # the range, the codes are padded with the lowest and highest values
+        # so that the array stays sorted for the searches of _split_nodes().
+        primitives = order[begin:end]
+        lo, hi = np.take(boxes, primitives, axis=2)
+        codes = self._morton_codes(0.5 * (lo + hi).T)
+        local = _radix_argsort(codes, self._code_bits)
+        order[begin:end] = primitives[local]
+        sorted_codes = np.full(order.shape[0], np.iinfo(np.uint64).max)
+        sorted_codes[:begin] = 0
+        sorted_codes[begin:end] = codes[local]
+        self._sorted_codes = sorted_codes
+        try:
+            return super()._build_range(boxes, order, begin, end, level)
+        finally:
+            self._sorted_codes = None
+
+    def _shared_arrays(self) -> dict[str, np.ndarray]:
+        return {"codes": self._sorted_codes}
+
+    def _attach_shared_arrays(self, arrays: dict[str, np.ndarray]) -> None:
+        self._sorted_codes = arrays.get("codes")
+
+    def __getstate__(self) -> dict:
+        # The sorted codes reach the workers through shared memory.
+        state = self.__dict__.copy()
+        state["_sorted_codes"] = None
+        return state
+
+    def _split_nodes(
+        self,
+        boxes: np.ndarray,
+        order: np.ndarray,
+        begins: np.ndarray,
+        ends: np.ndarray,
+    ) -> np.ndarray:
+        codes = self._sorted_codes
+        first = codes[begins]
+        last = codes[ends - 1]
+        highest = _highest_bit(first ^ last)
+        # The codes of a node share their bits above <highest>; the right
+        # child starts at the first code having that bit set.
+        threshold = ((first >> highest) | np.uint64(1)) << highest
+        mids = np.searchsorted(codes, threshold).astype(np.int64)
+        same = first == last
+        mids[same] = (begins[same] + ends[same]) // 2
+        return mids
+
+
+def _spread_bits(values: np.ndarray, bits: int, dimension: int) -> np.ndarray:
+    # Moves bit i of <values> to bit i * dimension, by halving groups of bits:
+    # once groups of s bits are in place, bit i sits at
+    # (i // s) * s * dimension + i % s.
+    values = values.astype(np.uint64)
+    if dimension == 1:
+        return values
+    group = 1
+    while group < bits:
+        group *= 2
+    while group > 1:
+        group //= 2
+        mask = 0
+        for i in range(bits):
+            mask |= 1 << ((i // group) * group * dimension + i % group)
+        values = (values | (values << np.uint64(group * (dimension - 1)))) & np.uint64(
+            mask
+        )
+    return values
+
+
+def _highest_bit(values: np.ndarray) -> np.ndarray:
+    # Index of the highest set bit of every non-zero uint64, 0 for zero.
+    highest = np.zeros(values.shape, dtype=np.uint64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        shift = np.uint64(shift)
+        upper = (values >> (highest + shift)) != 0
+        highest[upper] += shift
+    return highest
+
+
+def _radix_argsort(codes: np.ndarray, bits: int) -> np.ndarray:
+    # Least significant digit radix sort on 16-bit digits; the stable sort of
+    # NumPy is itself a radix sort for 16-bit integers.
+    order = np.arange(codes.shape[0], dtype=np.int64)
+    for shift in range(0, bits, 16):
+        digits = ((codes[order] >> np.uint64(shift)) & np.uint64(0xFFFF)).astype(
+            np.uint16
+        )
+        order = order[np.argsort(digits, kind="stable")]
+    return order
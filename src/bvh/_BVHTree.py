@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+# A bounding volume hierarchy stored as flat arrays, ready to be traversed
+# with NumPy.
+#
+# Node i is described by:
+# - node_info[i] = (is_leaf, a, b, level)
+#   * for an inner node, a and b are the indices of the left and right
+#     children;
+#   * for a leaf, [a, b) is the range of its primitives in <indices>.
+# - node_boxes[i] = (min_point, max_point), the (2, D) bounds of the node.
+#
+# indices[k] is the index, in the boxes given to the builder, of the k-th
+# primitive in tree order. Node 0 is the root.
+class BVHTree:
+    _node_info: np.ndarray
+    _node_boxes: np.ndarray
+    _indices: np.ndarray
+    _refit_plan: tuple[np.ndarray, list[np.ndarray]] | None
+
+    def __init__(
+        self,
+        node_info: np.ndarray,
+        node_boxes: np.ndarray,
+        indices: np.ndarray,
+    ) -> None:
+        self._node_info = np.asarray(node_info, dtype=np.int32)
+        self._node_boxes = np.asarray(node_boxes, dtype=np.float64)
+        self._indices = np.asarray(indices, dtype=np.int64)
+        self._refit_plan = None
+
+    def __str__(self) -> str:
+        return (
+            f"BVHTree(length={self.length}, depth={self.depth}, "
+            f"dimension={self.dimension}, primitives={len(self._indices)})"
+        )
+
+    @property
+    def node_info(self) -> np.ndarray:
+        return self._node_info
+
+    @property
+    def node_boxes(self) -> np.ndarray:
+        return self._node_boxes
+
+    @property
+    def indices(self) -> np.ndarray:
+        return self._indices
+
+    @property
+    def min_points(self) -> np.ndarray:
+        return self._node_boxes[:, 0]
+
+    @property
+    def max_points(self) -> np.ndarray:
+        return self._node_boxes[:, 1]
+
+    @property
+    def length(self) -> int:
+        return self._node_info.shape[0]
+
+    @property
+    def dimension(self) -> int:
+        return self._node_boxes.shape[2]
+
+    @property
+    def depth(self) -> int:
+        if self.length == 0:
+            return 0
+        return int(self._node_info[:, 3].max())
+
+    def is_leaf(self, node: int) -> bool:
+        return bool(self._node_info[node, 0])
+
+    def left_child(self, node: int) -> int:
+        return int(self._node_info[node, 1])
+
+    def right_child(self, node: int) -> int:
+        return int(self._node_info[node, 2])
+
+    def begin_primitive(self, node: int) -> int:
+        return int(self._node_info[node, 1])
+
+    def end_primitive(self, node: int) -> int:
+        return int(self._node_info[node, 2])
+
+    def nb_primitives(self, node: int) -> int:
+        return int(self._node_info[node, 2] - self._node_info[node, 1])
+
+    def level(self, node: int) -> int:
+        return int(self._node_info[node, 3])
+
+    def leaf_primitives(self, node: int) -> np.ndarray:
+        return self._indices[self._node_info[node, 1] : self._node_info[node, 2]]
+
+    def sah_cost(
+        self, traversal_cost: float = 1.0, intersection_cost: float = 1.0
+    ) -> float:
+        """Get the expected cost of a random ray query, relative to the root."""
+        if self.length == 0:
+            return 0.0
+        area = surface_area(self.min_points, self.max_points)
+        if area[0] <= 0.0:
+            return intersection_cost * len(self._indices)
+        is_leaf = self._node_info[:, 0] == 1
+        count = self._node_info[:, 2] - self._node_info[:, 1]
+        cost = np.where(is_leaf, intersection_cost * count, traversal_cost)
+        return float((area * cost).sum() / area[0])
+
+    def refit(self, boxes: np.ndarray) -> None:
+        """Recompute the node boxes, in place, for new (N, 2, D) primitive boxes.
+
+        The hierarchy is kept as is: the leaves are bounded from their
+        primitives, then the inner nodes from their children, one level at a
+        time from the deepest.
+        """
+        boxes = np.asarray(boxes, dtype=np.float64)
+        if boxes.shape != (len(self._indices), 2, self.dimension):
+            raise ValueError("Boxes must have shape (N, 2, D) for the N primitives.")
+        if self.length == 0:
+            return
+        leaves, levels = self._plan()
+        starts = self._node_info[leaves, 1]
+        primitive_boxes = boxes[self._indices]
+        node_boxes = self._node_boxes
+        node_boxes[leaves, 0] = np.minimum.reduceat(primitive_boxes[:, 0], starts)
+        node_boxes[leaves, 1] = np.maximum.reduceat(primitive_boxes[:, 1], starts)
+        for nodes in levels:
+            left = self._node_info[nodes, 1]
+            right = self._node_info[nodes, 2]
+            node_boxes[nodes, 0] = np.minimum(node_boxes[left, 0], node_boxes[right, 0])
+            node_boxes[nodes, 1] = np.maximum(node_boxes[left, 1], node_boxes[right, 1])
+
+    def node_ranges(self) -> np.ndarray:
+        """Get the (M, 2) range [begin, end) of the primitives of every node."""
+        ranges = self._node_info[:, 1:3].astype(np.int64)
+        if self.length == 0:
+            return ranges
+        _, levels = self._plan()
+        for nodes in levels:
+            left = self._node_info[nodes, 1]
+            right = self._node_info[nodes, 2]
+            ranges[nodes, 0] = np.minimum(ranges[left, 0], ranges[right, 0])
+            ranges[nodes, 1] = np.maximum(ranges[left, 1], ranges[right, 1])
+        return ranges
+
+    def parents(self) -> np.ndarray:
+        """Get the parent of every node, -1 for the root."""
+        parents = np.full(self.length, -1, dtype=np.int64)
+        inner = np.flatnonzero(self._node_info[:, 0] == 0)
+        parents[self._node_info[inner, 1]] = inner
+        parents[self._node_info[inner, 2]] = inner
+        return parents
+
+    def _plan(self) -> tuple[np.ndarray, list[np.ndarray]]:
+        # The leaves sorted by first primitive, and the inner nodes grouped by
+        # level, deepest first.
+        if self._refit_plan is None:
+            info = self._node_info
+            leaves = np.flatnonzero(info[:, 0] == 1)
+            leaves = leaves[np.argsort(info[leaves, 1], kind="stable")]
+            inner = np.flatnonzero(info[:, 0] == 0)
+            inner = inner[np.argsort(-info[inner, 3], kind="stable")]
+            cuts = np.flatnonzero(np.diff(info[inner, 3])) + 1
+            self._refit_plan = (leaves, np.split(inner, cuts))
+        return self._refit_plan
+
+
+def surface_area(min_points: np.ndarray, max_points: np.ndarray) -> np.ndarray:
+    # Dimension-generic measure used by the surface area heuristic:
+    # the length in 1D, the area in 2D, half the surface area in 3D
+    # (the sum of the products of every pair of extents).
+    extent = np.maximum(max_points - min_points, 0.0)
+    d = extent.shape[-1]
+    if d == 1:
+        return extent[..., 0]
+    area = np.zeros(extent.shape[:-1])
+    for i in range(d):
+        for j in range(i + 1, d):
+            area += extent[..., i] * extent[..., j]
+    return area
+
+
+def _stitch(
+    info: np.ndarray,
+    node_boxes: np.ndarray,
+    nodes: np.ndarray,
+    subtrees: list[tuple[np.ndarray, np.ndarray]],
+) -> tuple[np.ndarray, np.ndarray]:
+    # Replaces every node of <nodes> by the root of its subtree, given as the
+    # (node info, node boxes) of a tree rooted at 0; the other subtree nodes
+    # are appended.
+    info = info.copy()
+    node_boxes = node_boxes.copy()
+    infos = [info]
+    bounds = [node_boxes]
+    next_node = info.shape[0]
+    for node, (sub_info, sub_boxes) in zip(nodes, subtrees):
+        sub_info = sub_info.copy()
+        inner = sub_info[:, 0] == 0
+        sub_info[inner, 1:3] += next_node - 1
+        info[node] = sub_info[0]
+        node_boxes[node] = sub_boxes[0]
+        infos.append(sub_info[1:])
+        bounds.append(sub_boxes[1:])
+        next_node += sub_info.shape[0] - 1
+    return np.concatenate(infos), np.concatenate(bounds)
+
+
+def _compact(info: np.ndarray, node_boxes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Drops the nodes that cannot be reached from the root, renumbering the
+    # others in breadth-first order.
+    reached = [np.zeros(1, dtype=np.int64)]
+    frontier = reached[0]
+    while frontier.size > 0:
+        frontier = frontier[info[frontier, 0] == 0]
+        frontier = info[frontier, 1:3].ravel().astype(np.int64)
+        reached.append(frontier)
+    reached = np.concatenate(reached)
+    number = np.full(info.shape[0], -1, dtype=np.int64)
+    number[reached] = np.arange(reached.size)
+    info = info[reached]
+    inner = info[:, 0] == 0
+    info[inner, 1] = number[info[inner, 1]]
+    info[inner, 2] = number[info[inner, 2]]
+    return info, node_boxes[reached]
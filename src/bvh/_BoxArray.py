@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ._BVHBox import BVHBox, _coords
+from ._BVHTree import surface_area
+
+if TYPE_CHECKING:
+    from ..primitive import Trsf3D
+
+
+# Structure-of-arrays counterpart of BVHBox.
+# The corners of K boxes in N dimensions are stored in a single (K, 2, N)
+# float64 buffer, the layout taken by the BVH builders, and every operation
+# of BVHBox is applied to all the boxes at once.
+# Operands may be another BoxArray (box by box), a single BVHBox or point
+# (broadcast to every box), or a (K, N) array of points (one per box).
+# Integer indexing returns a BVHBox sharing memory with the buffer, slicing
+# returns a BoxArray sharing memory with the buffer.
+class BoxArray:
+    _data: np.ndarray
+
+    __array_ufunc__ = None
+
+    def __init__(self, data=(), N: int = 3) -> None:
+        data = np.asarray(data, dtype=np.float64)
+        if data.size == 0:
+            data = data.reshape(0, 2, N)
+        if data.ndim != 3 or data.shape[1] != 2:
+            raise ValueError("BoxArray data must have shape (K, 2, N)")
+        self._data = data
+
+    @staticmethod
+    def void(k: int, N: int = 3) -> BoxArray:
+        boxes = BoxArray(np.empty((k, 2, N), dtype=np.float64))
+        boxes.clear()
+        return boxes
+
+    @staticmethod
+    def from_points(points) -> BoxArray:
+        points = np.asarray(points, dtype=np.float64)
+        return BoxArray(np.stack([points, points], axis=1))
+
+    @staticmethod
+    def from_box_list(boxes: list[BVHBox]) -> BoxArray:
+        return BoxArray([box.data for box in boxes], boxes[0].N if boxes else 3)
+
+    def __str__(self) -> str:
+        return f"BoxArray({self._data})"
+
+    def __len__(self) -> int:
+        return self._data.shape[0]
+
+    def __iter__(self):
+        for row in self._data:
+            yield BVHBox._view(row)
+
+    def __getitem__(self, index) -> BVHBox | BoxArray:
+        if isinstance(index, (int, np.integer)):
+            return BVHBox._view(self._data[index])
+        return BoxArray(self._data[index])
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(value, (BVHBox, BoxArray)):
+            self._data[index] = value.data
+        else:
+            self._data[index] = value
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+    @data.setter
+    def data(self, value: np.ndarray) -> None:
+        self._data = value
+
+    @property
+    def N(self) -> int:
+        return self._data.shape[2]
+
+    @property
+    def min_points(self) -> np.ndarray:
+        return self._data[:, 0]
+
+    @property
+    def max_points(self) -> np.ndarray:
+        return self._data[:, 1]
+
+    def copy(self) -> BoxArray:
+        return BoxArray(self._data.copy())
+
+    def clear(self) -> None:
+        self._data[:, 0] = np.inf
+        self._data[:, 1] = -np.inf
+
+    def is_void(self) -> np.ndarray:
+        return np.any(self._data[:, 0] > self._data[:, 1], axis=1)
+
+    def add_points(self, points) -> None:
+        points = _points_operand(points)
+        np.minimum(self._data[:, 0], points, out=self._data[:, 0])
+        np.maximum(self._data[:, 1], points, out=self._data[:, 1])
+
+    def add_boxes(self, other: BoxArray | BVHBox) -> None:
+        lo, hi = _corners(other)
+        np.minimum(self._data[:, 0], lo, out=self._data[:, 0])
+        np.maximum(self._data[:, 1], hi, out=self._data[:, 1])
+
+    def union(self) -> BVHBox:
+        """Get the box bounding all the boxes."""
+        box = BVHBox(self.N)
+        if len(self) > 0:
+            box.data[0] = self._data[:, 0].min(axis=0)
+            box.data[1] = self._data[:, 1].max(axis=0)
+        return box
+
+    def is_out(self, other) -> np.ndarray:
+        """Check which boxes a box, boxes, a point or points lie outside of."""
+        if isinstance(other, (BVHBox, BoxArray)):
+            lo, hi = _corners(other)
+        else:
+            lo = hi = _points_operand(other)
+        return np.any(lo > self._data[:, 1], axis=-1) | np.any(
+            hi < self._data[:, 0], axis=-1
+        )
+
+    def center(self, axis: int | None = None) -> np.ndarray:
+        if axis is None:
+            return 0.5 * (self._data[:, 0] + self._data[:, 1])
+        return 0.5 * (self._data[:, 0, axis] + self._data[:, 1, axis])
+
+    def size(self) -> np.ndarray:
+        return np.maximum(self._data[:, 1] - self._data[:, 0], 0.0)
+
+    def area(self) -> np.ndarray:
+        """Get the surface area heuristic measure of every box, see BVHBox."""
+        return surface_area(self._data[:, 0], self._data[:, 1])
+
+    def volume(self) -> np.ndarray:
+        return np.prod(self.size(), axis=1)
+
+    def transform(self, trsf3d: Trsf3D) -> BoxArray:
+        """Get the boxes bounding these 3D boxes once transformed."""
+        if self.N != 3:
+            raise ValueError("Only 3D boxes can be transformed by a Trsf3D.")
+        matrix, loc = trsf3d.to_affine()
+        # Void boxes have infinite corners and stay void.
+        kept = ~self.is_void()
+        boxes = BoxArray.void(self._data.shape[0])
+        if np.any(kept):
+            lo, hi = self._data[kept, 0], self._data[kept, 1]
+            center = (0.5 * (lo + hi)) @ matrix.T + loc
+            half = (0.5 * (hi - lo)) @ np.abs(matrix).T
+            boxes[kept] = BoxArray(np.stack([center - half, center + half], axis=1))
+        return boxes
+
+    def square_distance_to(self, points) -> np.ndarray:
+        points = _points_operand(points)
+        gap = np.maximum(self._data[:, 0] - points, points - self._data[:, 1])
+        gap = np.maximum(gap, 0.0)
+        return np.einsum("ij,ij->i", gap, gap)
+
+    def distance_to(self, points) -> np.ndarray:
+        """Get the distance from a point, or one point per box, to every box."""
+        return np.sqrt(self.square_distance_to(points))
+
+
+def _corners(other: BoxArray | BVHBox) -> tuple[np.ndarray, np.ndarray]:
+    if isinstance(other, BVHBox):
+        return other.data[0], other.data[1]
+    return other.data[:, 0], other.data[:, 1]
+
+
+def _points_operand(points) -> np.ndarray:
+    if isinstance(points, np.ndarray):
+        return points.astype(np.float64, copy=False)
+    if isinstance(points, (list, tuple)) and points and hasattr(points[0], "to_tuple"):
+        return np.asarray([point.to_tuple() for point in points], dtype=np.float64)
+    return _coords(points)
@@ -1,2 +1,700 @@
+from __future__ import annotations
+
+import os
+from typing import Callable
+
+import numpy as np
+
+from ..primitive import Ax3D, Lin3D, Point3D, XyzArray
+from ._BVHBuilderBase import BVHBuilderBase, _ranges
+from ._BVHBinnedBuilder import BVHBinnedBuilder
+from ._BVHLinearBuilder import BVHLinearBuilder
+from ._BVHTree import BVHTree, _compact, _stitch, surface_area
+
+
+# A set of N axis-aligned boxes, (N, 2, D), with the BVH built over them.
+#
+# Queries work on whole batches of rays or points at once: every query keeps
+# its own explicit stack of nodes, and each step of the traversal pops one
+# node for all the queries still running and tests them with NumPy.
+# As in the OCCT traversal, the children of a node are visited nearest first
+# and nodes farther than the current best result are pruned.
+#
+# A built set is saved to a flat little-endian file: a 64-byte header (magic,
+# format version, sizes, builder parameters, SAH cost at build time) followed
+# by the node info, node boxes, node areas at build time, primitive order and
+# primitive boxes, each at a 64-byte aligned offset. Loading maps the arrays
+# with numpy.memmap, so it costs no parsing and several processes share the
+# page-cached file.
 class BVHSet:
-    pass
+    _boxes: np.ndarray
+    _builder: BVHBuilderBase
+    _tree: BVHTree
+    _build_cost: float
+    _build_areas: np.ndarray
+
+    def __init__(self, boxes: np.ndarray, builder: BVHBuilderBase | None = None):
+        self._builder = BVHBinnedBuilder() if builder is None else builder
+        self._boxes = BVHBuilderBase._prepare_boxes(boxes)
+        self.build()
+
+    def __len__(self) -> int:
+        return self._boxes.shape[0]
+
+    def __str__(self) -> str:
+        return f"BVHSet(size={len(self)}, tree={self._tree})"
+
+    @property
+    def boxes(self) -> np.ndarray:
+        return self._boxes
+
+    @property
+    def builder(self) -> BVHBuilderBase:
+        return self._builder
+
+    @property
+    def tree(self) -> BVHTree:
+        return self._tree
+
+    @property
+    def dimension(self) -> int:
+        return self._boxes.shape[2]
+
+    def box(self, index: int) -> np.ndarray:
+        return self._boxes[index]
+
+    @property
+    def cost_growth(self) -> float:
+        """Get the SAH cost of the tree relative to its cost when built."""
+        if self._build_cost == 0.0:
+            return 1.0
+        return self._tree.sah_cost() / self._build_cost
+
+    def build(self) -> None:
+        """Rebuild the BVH over the current boxes."""
+        self._tree = self._builder.build(self._boxes)
+        self._reset_quality()
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Save the set and its built BVH to a file, see load()."""
+        builder = type(self._builder)
+        header = np.zeros((), dtype=_FILE_HEADER)
+        header["magic"] = _FILE_MAGIC
+        header["version"] = _FILE_VERSION
+        header["dimension"] = self.dimension
+        header["nb_nodes"] = self._tree.length
+        header["nb_primitives"] = len(self)
+        header["builder"] = _FILE_BUILDERS.get(builder, 0)
+        header["leaf_node_size"] = self._builder.leaf_node_size
+        header["max_tree_depth"] = self._builder.max_tree_depth
+        header["is_parallel"] = self._builder.is_parallel
+        if builder is BVHBinnedBuilder:
+            header["builder_option"] = self._builder.bins
+        elif builder is BVHLinearBuilder:
+            header["builder_option"] = self._builder.code_bits
+        header["build_cost"] = self._build_cost
+        arrays = (
+            self._tree.node_info,
+            self._tree.node_boxes,
+            self._build_areas,
+            self._tree.indices,
+            self._boxes,
+        )
+        with open(path, "wb") as file:
+            file.write(header.tobytes())
+            layout = _file_layout(self.dimension, self._tree.length, len(self))
+            for array, (dtype, shape, offset) in zip(arrays, layout):
+                file.seek(offset)
+                np.ascontiguousarray(array, dtype=dtype).reshape(shape).tofile(file)
+
+    @staticmethod
+    def load(path: str | os.PathLike, mmap_mode: str | None = "r") -> BVHSet:
+        """Load a set saved by save(), without rebuilding its BVH.
+
+        The arrays are memory-mapped with <mmap_mode>, as for numpy.memmap;
+        "r" maps them read-only, which forbids refit(), "c" maps them copy on
+        write. None reads them into memory.
+        The builder, used by later rebuilds, is recreated from the saved
+        parameters; builders other than the binned and linear ones are
+        replaced by a binned builder.
+        """
+        header = np.fromfile(path, dtype=_FILE_HEADER, count=1)
+        if header.size == 0 or header[0]["magic"] != _FILE_MAGIC:
+            raise ValueError(f"{path} is not a BVHSet file.")
+        header = header[0]
+        if header["version"] != _FILE_VERSION:
+            raise ValueError(f"Unsupported BVHSet file version {header['version']}.")
+        layout = _file_layout(
+            int(header["dimension"]),
+            int(header["nb_nodes"]),
+            int(header["nb_primitives"]),
+        )
+        arrays = []
+        for dtype, shape, offset in layout:
+            if np.prod(shape) == 0:
+                arrays.append(np.zeros(shape, dtype=dtype))
+            elif mmap_mode is None:
+                count = int(np.prod(shape))
+                array = np.fromfile(path, dtype=dtype, count=count, offset=offset)
+                arrays.append(array.reshape(shape))
+            else:
+                arrays.append(np.memmap(path, dtype, mmap_mode, offset, shape))
+        info, node_boxes, areas, indices, boxes = arrays
+
+        leaf_node_size = int(header["leaf_node_size"])
+        max_tree_depth = int(header["max_tree_depth"])
+        is_parallel = bool(header["is_parallel"])
+        option = int(header["builder_option"])
+        if header["builder"] == _FILE_BUILDERS[BVHLinearBuilder]:
+            builder = BVHLinearBuilder(
+                leaf_node_size, max_tree_depth, is_parallel, code_bits=option
+            )
+        elif header["builder"] == _FILE_BUILDERS[BVHBinnedBuilder]:
+            builder = BVHBinnedBuilder(
+                leaf_node_size, max_tree_depth, is_parallel, bins=option
+            )
+        else:
+            builder = BVHBinnedBuilder(leaf_node_size, max_tree_depth, is_parallel)
+
+        tree = BVHTree(info, node_boxes, indices)
+        return BVHSet._from_tree(
+            boxes, tree, builder, float(header["build_cost"]), areas
+        )
+
+    @staticmethod
+    def _from_tree(
+        boxes: np.ndarray,
+        tree: BVHTree,
+        builder: BVHBuilderBase,
+        build_cost: float | None = None,
+        build_areas: np.ndarray | None = None,
+    ) -> BVHSet:
+        # A set over an already built tree; its quality at build time is
+        # measured unless given.
+        bvh_set = BVHSet.__new__(BVHSet)
+        bvh_set._builder = builder
+        bvh_set._boxes = boxes
+        bvh_set._tree = tree
+        if build_cost is None:
+            bvh_set._reset_quality()
+        else:
+            bvh_set._build_cost = build_cost
+            bvh_set._build_areas = build_areas
+        return bvh_set
+
+    def refit(self, boxes: np.ndarray, max_cost_growth: float | None = None) -> float:
+        """Move the primitives to new (N, 2, D) boxes, keeping the hierarchy.
+
+        The node boxes are refitted bottom-up, without any re-partitioning.
+        When <max_cost_growth> is given and the SAH cost of the tree has grown
+        beyond it, the subtrees whose boxes grew the most are rebuilt, or the
+        whole tree when the root itself did.
+        Returns the cost growth measured after the refit.
+        """
+        boxes = BVHBuilderBase._prepare_boxes(boxes)
+        if boxes.shape != self._boxes.shape:
+            raise ValueError("Refit boxes must have the shape of the set boxes.")
+        self._boxes = boxes
+        self._tree.refit(boxes)
+        growth = self.cost_growth
+        if max_cost_growth is not None and growth > max_cost_growth:
+            self._rebuild_degraded(max_cost_growth)
+        return growth
+
+    def _reset_quality(self) -> None:
+        self._build_cost = self._tree.sah_cost()
+        self._build_areas = surface_area(self._tree.min_points, self._tree.max_points)
+
+    def _rebuild_degraded(self, max_growth: float) -> None:
+        # The degraded nodes are the inner nodes whose area grew by more than
+        # <max_growth> since the build; the ones without a degraded ancestor
+        # are rebuilt.
+        tree = self._tree
+        info = tree.node_info
+        areas = surface_area(tree.min_points, tree.max_points)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            degraded = (info[:, 0] == 0) & ~(areas <= max_growth * self._build_areas)
+        if degraded[0]:
+            self.build()
+            return
+        below = np.zeros(tree.length, dtype=bool)
+        for nodes in reversed(tree._plan()[1]):
+            below[info[nodes, 1]] = below[info[nodes, 2]] = (
+                below[nodes] | degraded[nodes]
+            )
+        roots = np.flatnonzero(degraded & ~below)
+        if roots.size == 0:
+            return
+        ranges = tree.node_ranges()
+        order = tree.indices.copy()
+        boxes = np.ascontiguousarray(self._boxes.transpose(1, 2, 0))
+        subtrees = [
+            self._builder._build_range(
+                boxes, order, int(ranges[r, 0]), int(ranges[r, 1]), int(info[r, 3])
+            )
+            for r in roots
+        ]
+        info, node_boxes = _compact(
+            *_stitch(tree.node_info, tree.node_boxes, roots, subtrees)
+        )
+        self._tree = BVHTree(info, node_boxes, order)
+        self._reset_quality()
+
+    def intersect_rays(
+        self,
+        origins,
+        directions=None,
+        tmax=np.inf,
+        intersector: (
+            Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray] | None
+        ) = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Get the closest primitive hit by every ray and its distance.
+
+        The rays are given either as (M, D) arrays of origins and directions,
+        or as a Lin3D, an Ax3D or a list of them. Only hits with t in
+        [0, tmax] count, tmax being a scalar or one value per ray. By default
+        a primitive is hit where the ray enters its box; <intersector>
+        replaces this test: it is called with the origins, directions and
+        primitive indices of (ray, primitive) pairs and returns their t, inf
+        for a miss.
+        Returns the primitive index, -1 for a miss, and t, inf for a miss.
+        """
+        origins, directions = _rays(origins, directions)
+        m = origins.shape[0]
+        tree = self._tree
+        best_t = np.array(np.broadcast_to(tmax, (m,)), dtype=np.float64)
+        best_index = np.full(m, -1, dtype=np.int64)
+        if m == 0 or tree.length == 0:
+            best_t[:] = np.inf
+            return best_index, best_t
+        with np.errstate(divide="ignore"):
+            inverse = 1.0 / directions
+        info = tree.node_info
+        node_boxes = tree.node_boxes
+        indices = tree.indices
+
+        # Per-ray stacks of (node, entry distance), the root first.
+        stack = np.zeros((m, tree.depth + 2), dtype=np.int64)
+        stack_t = np.zeros((m, tree.depth + 2))
+        size = np.zeros(m, dtype=np.int64)
+        rays = np.arange(m)
+        hit, entry = _slab(node_boxes[0], origins, inverse, best_t)
+        rays = rays[hit]
+        stack_t[rays, 0] = entry[hit]
+        size[rays] = 1
+
+        while rays.size > 0:
+            size[rays] -= 1
+            node = stack[rays, size[rays]]
+            keep = stack_t[rays, size[rays]] <= best_t[rays]
+            rays = rays[keep]
+            node = node[keep]
+            is_leaf = info[node, 0] == 1
+
+            leaf_rays = rays[is_leaf]
+            if leaf_rays.size > 0:
+                leaves = node[is_leaf]
+                counts = (info[leaves, 2] - info[leaves, 1]).astype(np.int64)
+                prims = indices[_ranges(info[leaves, 1].astype(np.int64), counts)]
+                pair_rays = np.repeat(leaf_rays, counts)
+                if intersector is None:
+                    hit, t = _slab(
+                        self._boxes[prims],
+                        origins[pair_rays],
+                        inverse[pair_rays],
+                        best_t[pair_rays],
+                    )
+                    t[~hit] = np.inf
+                else:
+                    t = np.asarray(
+                        intersector(origins[pair_rays], directions[pair_rays], prims),
+                        dtype=np.float64,
+                    )
+                    t[(t < 0.0) | (t > best_t[pair_rays])] = np.inf
+                _keep_closest(
+                    leaf_rays, counts, prims, t, best_index, best_t, len(self)
+                )
+
+            inner_rays = rays[~is_leaf]
+            if inner_rays.size > 0:
+                inner = node[~is_leaf]
+                o = origins[inner_rays]
+                inv = inverse[inner_rays]
+                limit = best_t[inner_rays]
+                left = info[inner, 1].astype(np.int64)
+                right = info[inner, 2].astype(np.int64)
+                hit_l, t_l = _slab(node_boxes[left], o, inv, limit)
+                hit_r, t_r = _slab(node_boxes[right], o, inv, limit)
+                # The nearer child is pushed last, to be popped first.
+                swap = t_l < t_r
+                near, far = np.where(swap, left, right), np.where(swap, right, left)
+                t_near, t_far = np.where(swap, t_l, t_r), np.where(swap, t_r, t_l)
+                hit_near = np.where(swap, hit_l, hit_r)
+                hit_far = np.where(swap, hit_r, hit_l)
+                for hit, child, t in ((hit_far, far, t_far), (hit_near, near, t_near)):
+                    pushed = inner_rays[hit]
+                    stack[pushed, size[pushed]] = child[hit]
+                    stack_t[pushed, size[pushed]] = t[hit]
+                    size[pushed] += 1
+
+            rays = np.flatnonzero(size > 0)
+
+        best_t[best_index < 0] = np.inf
+        return best_index, best_t
+
+    def nearest(
+        self,
+        points,
+        distance: Callable[[np.ndarray, np.ndarray], np.ndarray] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Get the closest primitive to every point and its distance.
+
+        See k_nearest() for the arguments; returns (M,) arrays.
+        """
+        indices, distances = self.k_nearest(points, 1, distance)
+        return indices[:, 0], distances[:, 0]
+
+    def k_nearest(
+        self,
+        points,
+        k: int,
+        distance: Callable[[np.ndarray, np.ndarray], np.ndarray] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Get the k closest primitives to every point and their distances.
+
+        The points are given as an (M, D) array, an XyzArray, a Point3D or a
+        list of them. By default the distance to a primitive is the distance
+        to its box; <distance> replaces it: it is called with the points and
+        primitive indices of (point, primitive) pairs and must never return
+        less than the distance to the box of the primitive.
+        Returns (M, k) arrays sorted by distance, padded with index -1 and
+        distance inf when the set has fewer than k primitives.
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1.")
+        points = _points(points)
+        m = points.shape[0]
+        tree = self._tree
+        best_index = np.full((m, k), -1, dtype=np.int64)
+        best_distance = np.full((m, k), np.inf)
+        if m == 0 or tree.length == 0:
+            return best_index, best_distance
+        info = tree.node_info
+        node_boxes = tree.node_boxes
+        indices = tree.indices
+
+        # Per-point stacks of (node, distance to the node box), the root first.
+        stack = np.zeros((m, tree.depth + 2), dtype=np.int64)
+        stack_d = np.zeros((m, tree.depth + 2))
+        stack_d[:, 0] = _box_distance(node_boxes[0], points)
+        size = np.ones(m, dtype=np.int64)
+        queries = np.arange(m)
+
+        while queries.size > 0:
+            size[queries] -= 1
+            node = stack[queries, size[queries]]
+            keep = stack_d[queries, size[queries]] <= best_distance[queries, -1]
+            queries = queries[keep]
+            node = node[keep]
+            is_leaf = info[node, 0] == 1
+
+            leaf_queries = queries[is_leaf]
+            if leaf_queries.size > 0:
+                leaves = node[is_leaf]
+                counts = (info[leaves, 2] - info[leaves, 1]).astype(np.int64)
+                prims = indices[_ranges(info[leaves, 1].astype(np.int64), counts)]
+                pair_queries = np.repeat(leaf_queries, counts)
+                if distance is None:
+                    d = _box_distance(self._boxes[prims], points[pair_queries])
+                else:
+                    d = np.asarray(
+                        distance(points[pair_queries], prims), dtype=np.float64
+                    )
+                _keep_nearest(leaf_queries, counts, prims, d, best_index, best_distance)
+
+            inner_queries = queries[~is_leaf]
+            if inner_queries.size > 0:
+                inner = node[~is_leaf]
+                p = points[inner_queries]
+                limit = best_distance[inner_queries, -1]
+                left = info[inner, 1].astype(np.int64)
+                right = info[inner, 2].astype(np.int64)
+                d_l = _box_distance(node_boxes[left], p)
+                d_r = _box_distance(node_boxes[right], p)
+                # The nearer child is pushed last, to be popped first.
+                swap = d_l < d_r
+                near, far = np.where(swap, left, right), np.where(swap, right, left)
+                d_near, d_far = np.where(swap, d_l, d_r), np.where(swap, d_r, d_l)
+                for child, d in ((far, d_far), (near, d_near)):
+                    pushed = d <= limit
+                    q = inner_queries[pushed]
+                    stack[q, size[q]] = child[pushed]
+                    stack_d[q, size[q]] = d[pushed]
+                    size[q] += 1
+
+            queries = np.flatnonzero(size > 0)
+
+        return best_index, best_distance
+
+    def overlapping_pairs(
+        self, other: BVHSet | None = None, batch_size: int = 1 << 20
+    ) -> np.ndarray:
+        """Get the pairs of overlapping boxes, touching ones included.
+
+        With <other>, returns the (P, 2) pairs (i, j) of a box i of this set
+        overlapping a box j of <other>. Without, returns the pairs i < j of
+        overlapping boxes of this set.
+        The two trees are traversed together: the node pairs whose boxes
+        overlap are refined, at most <batch_size> of them per NumPy step.
+        """
+        is_self = other is None
+        other = self if is_self else other
+        if other.dimension != self.dimension:
+            raise ValueError("Both sets must have the same dimension.")
+        tree_a, tree_b = self._tree, other._tree
+        if tree_a.length == 0 or tree_b.length == 0:
+            return np.zeros((0, 2), dtype=np.int64)
+        info_a, info_b = tree_a.node_info, tree_b.node_info
+        boxes_a, boxes_b = tree_a.node_boxes, tree_b.node_boxes
+        area_a = surface_area(tree_a.min_points, tree_a.max_points)
+        area_b = surface_area(tree_b.min_points, tree_b.max_points)
+
+        pairs = []
+        pending = [(np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64))]
+        while pending:
+            a, b = pending.pop()
+            if a.size > batch_size:
+                pending.append((a[batch_size:], b[batch_size:]))
+                a, b = a[:batch_size], b[:batch_size]
+            overlap = _overlap(boxes_a[a], boxes_b[b])
+            a, b = a[overlap], b[overlap]
+            leaf_a = info_a[a, 0] == 1
+            leaf_b = info_b[b, 0] == 1
+            same = (a == b) if is_self else np.zeros(a.size, dtype=bool)
+            children = []
+
+            # A node against itself: the pairs inside a leaf, or the pairs of
+            # its children (left, left), (right, right) and (left, right).
+            within = same & leaf_a
+            if np.any(within):
+                pairs.append(self._leaf_pairs(a[within], a[within], other, True))
+            node = a[same & ~leaf_a]
+            left = info_a[node, 1].astype(np.int64)
+            right = info_a[node, 2].astype(np.int64)
+            children.append(
+                (
+                    np.concatenate([left, right, left]),
+                    np.concatenate([left, right, right]),
+                )
+            )
+
+            both = ~same & leaf_a & leaf_b
+            if np.any(both):
+                pairs.append(self._leaf_pairs(a[both], b[both], other, False))
+            # Otherwise the inner node with the larger area is descended.
+            rest = ~same & ~(leaf_a & leaf_b)
+            down_a = rest & ~leaf_a & (leaf_b | (area_a[a] >= area_b[b]))
+            down_b = rest & ~down_a
+            node, partner = a[down_a], b[down_a]
+            children.append(
+                (
+                    np.concatenate([info_a[node, 1], info_a[node, 2]]).astype(np.int64),
+                    np.concatenate([partner, partner]),
+                )
+            )
+            node, partner = b[down_b], a[down_b]
+            children.append(
+                (
+                    np.concatenate([partner, partner]),
+                    np.concatenate([info_b[node, 1], info_b[node, 2]]).astype(np.int64),
+                )
+            )
+            child_a = np.concatenate([c[0] for c in children])
+            child_b = np.concatenate([c[1] for c in children])
+            if child_a.size > 0:
+                pending.append((child_a, child_b))
+
+        if not pairs:
+            return np.zeros((0, 2), dtype=np.int64)
+        pairs = np.concatenate(pairs)
+        if is_self:
+            pairs.sort(axis=1)
+        return pairs
+
+    def _leaf_pairs(
+        self, a: np.ndarray, b: np.ndarray, other: BVHSet, within: bool
+    ) -> np.ndarray:
+        # Overlapping primitive pairs of the leaf pairs (a, b); with <within>,
+        # a == b and every unordered pair of the leaf is taken once.
+        info_a, info_b = self._tree.node_info, other._tree.node_info
+        count_a = (info_a[a, 2] - info_a[a, 1]).astype(np.int64)
+        count_b = (info_b[b, 2] - info_b[b, 1]).astype(np.int64)
+        combos = count_a * count_b
+        pair = np.repeat(np.arange(a.size), combos)
+        local = np.arange(combos.sum()) - np.repeat(np.cumsum(combos) - combos, combos)
+        i = local // count_b[pair]
+        j = local % count_b[pair]
+        if within:
+            keep = i < j
+            pair, i, j = pair[keep], i[keep], j[keep]
+        prim_a = self._tree.indices[info_a[a, 1][pair] + i]
+        prim_b = other._tree.indices[info_b[b, 1][pair] + j]
+        overlap = _overlap(self._boxes[prim_a], other._boxes[prim_b])
+        return np.stack([prim_a[overlap], prim_b[overlap]], axis=1)
+
+
+_FILE_MAGIC = b"PYBVHSET"
+_FILE_VERSION = 1
+_FILE_ALIGNMENT = 64
+_FILE_HEADER = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("dimension", "<u4"),
+        ("nb_nodes", "<u8"),
+        ("nb_primitives", "<u8"),
+        ("builder", "<u4"),
+        ("leaf_node_size", "<u4"),
+        ("max_tree_depth", "<u4"),
+        ("builder_option", "<u4"),
+        ("build_cost", "<f8"),
+        ("is_parallel", "u1"),
+        ("reserved", "V7"),
+    ]
+)
+# Builders recreated by BVHSet.load(), 0 standing for any other builder.
+_FILE_BUILDERS = {BVHBinnedBuilder: 1, BVHLinearBuilder: 2}
+
+
+def _file_layout(
+    dimension: int, nb_nodes: int, nb_primitives: int
+) -> list[tuple[str, tuple[int, ...], int]]:
+    # (dtype, shape, offset) of the node info, node boxes, node areas at build
+    # time, primitive order and primitive boxes in a BVHSet file.
+    shapes = (
+        ("<i4", (nb_nodes, 4)),
+        ("<f8", (nb_nodes, 2, dimension)),
+        ("<f8", (nb_nodes,)),
+        ("<i8", (nb_primitives,)),
+        ("<f8", (nb_primitives, 2, dimension)),
+    )
+    layout = []
+    offset = _FILE_HEADER.itemsize
+    for dtype, shape in shapes:
+        offset = -(-offset // _FILE_ALIGNMENT) * _FILE_ALIGNMENT
+        layout.append((dtype, shape, offset))
+        offset += np.dtype(dtype).itemsize * int(np.prod(shape))
+    return layout
+
+
+def _rays(origins, directions) -> tuple[np.ndarray, np.ndarray]:
+    # (M, D) origin and unit direction arrays from arrays, XyzArrays, or Lin3D
+    # and Ax3D objects.
+    if isinstance(origins, (Lin3D, Ax3D)):
+        origins = [origins]
+    if isinstance(origins, (list, tuple)) and origins and directions is None:
+        directions = [ray.dir.to_tuple() for ray in origins]
+        origins = [ray.loc.to_tuple() for ray in origins]
+    if directions is None:
+        raise ValueError("Ray directions are required with origin arrays.")
+    if isinstance(origins, XyzArray):
+        origins = origins.data
+    if isinstance(directions, XyzArray):
+        directions = directions.data
+    origins = np.atleast_2d(np.asarray(origins, dtype=np.float64))
+    directions = np.atleast_2d(np.asarray(directions, dtype=np.float64))
+    origins, directions = np.broadcast_arrays(origins, directions)
+    return origins, directions
+
+
+def _points(points) -> np.ndarray:
+    # (M, D) point array from an array, an XyzArray, or Point3D objects.
+    if isinstance(points, Point3D):
+        points = [points]
+    if isinstance(points, (list, tuple)) and points and isinstance(points[0], Point3D):
+        points = [point.to_tuple() for point in points]
+    if isinstance(points, XyzArray):
+        points = points.data
+    return np.atleast_2d(np.asarray(points, dtype=np.float64))
+
+
+def _box_distance(boxes: np.ndarray, points: np.ndarray) -> np.ndarray:
+    # Euclidean distance from points to (K, 2, D) boxes, or to one (2, D) box,
+    # null inside.
+    gap = np.maximum(boxes[..., 0, :] - points, points - boxes[..., 1, :])
+    gap = np.maximum(gap, 0.0)
+    return np.sqrt(np.einsum("...i,...i->...", gap, gap))
+
+
+def _slab(
+    boxes: np.ndarray, origins: np.ndarray, inverse: np.ndarray, tmax: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    # Slab test of rays against (K, 2, D) boxes, or one (2, D) box for all.
+    # Returns whether each ray enters its box within [0, tmax], and where.
+    # fmin/fmax skip the NaN of a ray lying in the plane of a slab.
+    with np.errstate(invalid="ignore"):
+        t1 = (boxes[..., 0, :] - origins) * inverse
+        t2 = (boxes[..., 1, :] - origins) * inverse
+    near = np.fmax.reduce(np.fmin(t1, t2), axis=-1)
+    far = np.fmin.reduce(np.fmax(t1, t2), axis=-1)
+    near = np.maximum(near, 0.0)
+    return (near <= far) & (near <= tmax), near
+
+
+def _keep_closest(
+    rays: np.ndarray,
+    counts: np.ndarray,
+    prims: np.ndarray,
+    t: np.ndarray,
+    best_index: np.ndarray,
+    best_t: np.ndarray,
+    n: int,
+) -> None:
+    # Updates the closest hit of every ray from its (ray, primitive) pairs,
+    # consecutive for each ray; ties go to the lowest primitive index.
+    starts = np.cumsum(counts) - counts
+    closest = np.minimum.reduceat(t, starts)
+    key = np.where(t == np.repeat(closest, counts), prims, n)
+    prim = np.minimum.reduceat(key, starts)
+    current = best_index[rays]
+    better = (closest < best_t[rays]) | (
+        (closest == best_t[rays])
+        & np.isfinite(closest)
+        & ((current < 0) | (prim < current))
+    )
+    best_t[rays[better]] = closest[better]
+    best_index[rays[better]] = prim[better]
+
+
+def _keep_nearest(
+    queries: np.ndarray,
+    counts: np.ndarray,
+    prims: np.ndarray,
+    d: np.ndarray,
+    best_index: np.ndarray,
+    best_distance: np.ndarray,
+) -> None:
+    # Merges the (query, primitive) pairs, consecutive for each query, into
+    # the sorted k best results of the queries.
+    k = best_index.shape[1]
+    starts = np.cumsum(counts) - counts
+    rows = np.repeat(np.arange(queries.size), counts)
+    cols = k + np.arange(prims.size) - starts[rows]
+    width = k + int(counts.max())
+    merged_d = np.full((queries.size, width), np.inf)
+    merged_i = np.full((queries.size, width), -1, dtype=np.int64)
+    merged_d[:, :k] = best_distance[queries]
+    merged_i[:, :k] = best_index[queries]
+    merged_d[rows, cols] = d
+    merged_i[rows, cols] = prims
+    kept = np.argsort(merged_d, axis=1, kind="stable")[:, :k]
+    best_distance[queries] = np.take_along_axis(merged_d, kept, axis=1)
+    best_index[queries] = np.take_along_axis(merged_i, kept, axis=1)
+
+
+def _overlap(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    # Whether (K, 2, D) boxes overlap pairwise, touching included.
+    return np.all(
+        (boxes_a[:, 0] <= boxes_b[:, 1]) & (boxes_b[:, 0] <= boxes_a[:, 1]), axis=1
+    )
@@ -0,0 +1,11 @@
+from ._BVHBoxBase import BVHBoxBase
+from ._BVHBox import BVHBox
+from ._BoxArray import BoxArray
+from ._BVHTree import BVHTree
+from ._BVHBuilderBase import BVHBuilderBase
+from ._BVHBinnedBuilder import BVHBinnedBuilder
+from ._BVHLinearBuilder import BVHLinearBuilder
+from ._BvhSet import BVHSet
+from ._BVHInstanceSet import BVHInstanceSet
+from ._BVHDynamicSet import BVHDynamicSet
+from ._BVHWideSet import BVHWideSet
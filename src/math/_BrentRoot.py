@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ._Function import Function, _broadcast_bounds
+from ._FunctionRoot import _call
+
+
+# Root of a Function in a bracket [lower, upper], by Brent's method.
+#
+# Every iteration tries an inverse quadratic or secant interpolation through
+# the last points, and falls back to a bisection when the interpolation
+# leaves the bracket or converges too slowly, so no derivative is needed and
+# the convergence is never slower than bisection. The iterations stop once
+# the bracket is below <tolerance> around the root, or the value is null.
+# As for FunctionRoot, lower and upper may be arrays of K independent
+# problems, or <parameters> may hold one row per problem; every problem
+# converges separately and each iteration calls value() once on the
+# unfinished ones.
+class BrentRoot:
+    _root: float | np.ndarray
+    _nb_iterations: int | np.ndarray
+    _converged: np.ndarray
+
+    def __init__(
+        self,
+        function: Function,
+        lower,
+        upper,
+        tolerance: float = 1.0e-12,
+        max_iterations: int = 100,
+        parameters=None,
+    ):
+        lower, upper = _broadcast_bounds(parameters, lower, upper)
+        scalar = lower.ndim == 0
+        a = lower.reshape(-1).copy()
+        b = upper.reshape(-1).copy()
+        lanes = np.arange(a.size)
+        fa = _call(function.value, a, parameters, lanes, scalar)
+        fb = _call(function.value, b, parameters, lanes, scalar)
+        if np.any(fa * fb > 0.0):
+            raise ValueError("Roots must be bracketed by lower and upper")
+        # b is the best estimate, c the other end of the bracket, and a the
+        # previous b; d is the last step and e the one before.
+        c, fc = a.copy(), fa.copy()
+        d = b - a
+        e = d.copy()
+        eps = np.finfo(np.float64).eps
+        nb_iterations = np.zeros(a.size, dtype=np.int64)
+        converged = np.zeros(a.size, dtype=bool)
+
+        active = lanes
+        for iteration in range(max_iterations + 1):
+            # Keeps the root between b and c, with b the closest to it.
+            opposite = fb[active] * fc[active] > 0.0
+            moved = active[opposite]
+            c[moved], fc[moved] = a[moved], fa[moved]
+            d[moved] = e[moved] = b[moved] - a[moved]
+            swap = active[np.abs(fc[active]) < np.abs(fb[active])]
+            a[swap], fa[swap] = b[swap], fb[swap]
+            b[swap], fb[swap] = c[swap], fc[swap]
+            c[swap], fc[swap] = a[swap], fa[swap]
+
+            ab, fab, bb, fbb = a[active], fa[active], b[active], fb[active]
+            cb, fcb, db, eb = c[active], fc[active], d[active], e[active]
+            tol = 2.0 * eps * np.abs(bb) + 0.5 * tolerance
+            xm = 0.5 * (cb - bb)
+            done = (np.abs(xm) <= tol) | (fbb == 0.0)
+            converged[active] = done
+            if iteration == max_iterations:
+                break
+            keep = ~done
+            active = active[keep]
+            if active.size == 0:
+                break
+            ab, fab, bb, fbb = ab[keep], fab[keep], bb[keep], fbb[keep]
+            cb, fcb, db, eb = cb[keep], fcb[keep], db[keep], eb[keep]
+            tol, xm = tol[keep], xm[keep]
+
+            # Inverse quadratic interpolation, or secant when a == c.
+            with np.errstate(divide="ignore", invalid="ignore"):
+                s = fbb / fab
+                q = fab / fcb
+                r = fbb / fcb
+                secant = ab == cb
+                p = np.where(
+                    secant,
+                    2.0 * xm * s,
+                    s * (2.0 * xm * q * (q - r) - (bb - ab) * (r - 1.0)),
+                )
+                q = np.where(secant, 1.0 - s, (q - 1.0) * (r - 1.0) * (s - 1.0))
+            q = np.where(p > 0.0, -q, q)
+            p = np.abs(p)
+            interpolate = (np.abs(eb) >= tol) & (np.abs(fab) > np.abs(fbb))
+            interpolate &= 2.0 * p < np.minimum(
+                3.0 * xm * q - np.abs(tol * q), np.abs(eb * q)
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                step = np.where(interpolate, p / q, xm)
+            e[active] = np.where(interpolate, db, xm)
+            d[active] = step
+
+            a[active], fa[active] = bb, fbb
+            bb = bb + np.where(np.abs(step) > tol, step, np.copysign(tol, xm))
+            b[active] = bb
+            fb[active] = _call(function.value, bb, parameters, active, scalar)
+            nb_iterations[active] += 1
+
+        self._converged = converged
+        if scalar:
+            self._root = float(b[0])
+            self._nb_iterations = int(nb_iterations[0])
+        else:
+            self._root = b
+            self._nb_iterations = nb_iterations
+
+    @property
+    def is_done(self) -> bool:
+        """Tell whether every problem reached the tolerance."""
+        return bool(self._converged.all())
+
+    @property
+    def converged(self) -> np.ndarray:
+        """Get whether each problem reached the tolerance."""
+        return self._converged
+
+    @property
+    def root(self) -> float | np.ndarray:
+        return self._root
+
+    @property
+    def nb_iterations(self) -> int | np.ndarray:
+        return self._nb_iterations
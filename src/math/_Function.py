@@ -1,4 +1,15 @@
+import numpy as np
+
+
 class Function:
 
     def value(self, x):
         raise NotImplementedError("Subclasses should implement this method.")
+
+
+def _broadcast_bounds(parameters, *bounds):
+    # Broadcasts the bounds of a batch of problems to one per row of
+    # <parameters>; a scalar or no parameters leave them as they are.
+    bounds = [np.asarray(bound, dtype=np.float64) for bound in bounds]
+    shape = () if parameters is None or np.ndim(parameters) == 0 else len(parameters)
+    return np.broadcast_arrays(*bounds, np.empty(shape))[:-1]
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ._Function import _broadcast_bounds
+from ._FunctionWithDerivative import FunctionWithDerivative
+
+
+# Root of a FunctionWithDerivative in a bracket [lower, upper], by the
+# Newton-Raphson method with bisection safeguards.
+#
+# The value changes sign between the bounds, and the bracket shrinks around
+# the root at every iteration: a Newton step leaving the bracket, or not
+# halving the previous step, is replaced by a bisection, so the iterations
+# keep the quadratic convergence of Newton near the root without ever
+# diverging. The iterations stop once a Newton step or the bracket is below
+# <tolerance>, or the value is null.
+# guess, lower and upper may be arrays of K independent problems, such as
+# the foot-point parameters of K points on an Elips2D, and <parameters> may
+# hold one row per problem, the bounds being broadcast to its length; they
+# are given to value() and derivative() as a second argument, a scalar being
+# shared by all the problems. Every problem converges separately: the
+# finished ones are masked out, and each iteration calls value() and
+# derivative() once on the unfinished ones.
+class FunctionRoot:
+    _root: float | np.ndarray
+    _nb_iterations: int | np.ndarray
+    _converged: np.ndarray
+
+    def __init__(
+        self,
+        function: FunctionWithDerivative,
+        guess,
+        lower,
+        upper,
+        tolerance: float = 1.0e-12,
+        max_iterations: int = 100,
+        parameters=None,
+    ):
+        if guess is None:
+            guess = 0.5 * (np.asarray(lower) + np.asarray(upper))
+        guess, lower, upper = _broadcast_bounds(parameters, guess, lower, upper)
+        scalar = guess.ndim == 0
+        lower, upper = (
+            np.minimum(lower, upper).reshape(-1),
+            np.maximum(lower, upper).reshape(-1),
+        )
+        x = np.clip(guess.reshape(-1), lower, upper)
+        lanes = np.arange(x.size)
+
+        f_lower = _call(function.value, lower, parameters, lanes, scalar)
+        f_upper = _call(function.value, upper, parameters, lanes, scalar)
+        if np.any(f_lower * f_upper > 0.0):
+            raise ValueError("Roots must be bracketed by lower and upper")
+        # Bracket oriented so that the value is negative at low, positive
+        # at high.
+        low = np.where(f_lower < 0.0, lower, upper)
+        high = np.where(f_lower < 0.0, upper, lower)
+        step = np.abs(upper - lower)
+        previous_step = step.copy()
+        fx = _call(function.value, x, parameters, lanes, scalar)
+        dfx = _call(function.derivative, x, parameters, lanes, scalar)
+        nb_iterations = np.zeros(x.size, dtype=np.int64)
+        converged = (fx == 0.0) | (f_lower == 0.0) | (f_upper == 0.0)
+        x[f_lower == 0.0] = lower[f_lower == 0.0]
+        x[f_upper == 0.0] = upper[f_upper == 0.0]
+
+        active = np.flatnonzero(~converged)
+        for _ in range(max_iterations):
+            if active.size == 0:
+                break
+            xa, fa, da = x[active], fx[active], dfx[active]
+            la, ha = low[active], high[active]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton = xa - fa / da
+            bisect = (
+                ~np.isfinite(newton)
+                | ((newton - la) * (newton - ha) > 0.0)
+                | (np.abs(2.0 * fa) > np.abs(previous_step[active] * da))
+            )
+            middle = 0.5 * (la + ha)
+            new_x = np.where(bisect, middle, newton)
+            previous_step[active] = step[active]
+            step[active] = np.abs(new_x - xa)
+            x[active] = new_x
+            nb_iterations[active] += 1
+
+            fa = _call(function.value, new_x, parameters, active, scalar)
+            fx[active] = fa
+            dfx[active] = _call(function.derivative, new_x, parameters, active, scalar)
+            negative = fa < 0.0
+            low[active] = np.where(negative, new_x, la)
+            high[active] = np.where(negative, ha, new_x)
+            done = (
+                (~bisect & (step[active] <= tolerance))
+                | (np.abs(high[active] - low[active]) <= tolerance)
+                | (fa == 0.0)
+            )
+            converged[active] = done
+            active = active[~done]
+
+        self._converged = converged
+        if scalar:
+            self._root = float(x[0])
+            self._nb_iterations = int(nb_iterations[0])
+        else:
+            self._root = x
+            self._nb_iterations = nb_iterations
+
+    @property
+    def is_done(self) -> bool:
+        """Tell whether every problem reached the tolerance."""
+        return bool(self._converged.all())
+
+    @property
+    def converged(self) -> np.ndarray:
+        """Get whether each problem reached the tolerance."""
+        return self._converged
+
+    @property
+    def root(self) -> float | np.ndarray:
+        return self._root
+
+    @property
+    def nb_iterations(self) -> int | np.ndarray:
+        return self._nb_iterations
+
+
+def _call(method, x: np.ndarray, parameters, lanes: np.ndarray, scalar: bool):
+    # Values of a Function method on the nodes <x> of problems <lanes>, with
+    # their parameter rows; a single problem or a scalar gets its parameters
+    # as they are.
+    # The values are returned in a new array.
+    if parameters is None:
+        y = method(x)
+    elif scalar or np.ndim(parameters) == 0:
+        y = method(x, parameters)
+    else:
+        y = method(x, np.asarray(parameters)[lanes])
+    return np.broadcast_to(np.asarray(y, dtype=np.float64), x.shape).copy()
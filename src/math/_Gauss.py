@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+
+from ._Function import Function, _broadcast_bounds
+
+# Kronrod 15-point extension of the 7-point Gauss rule on [-1, 1], from
+# QUADPACK: the odd Kronrod nodes are the Gauss ones.
+_KRONROD_POSITIVE_NODES = np.array(
+    [
+        0.991455371120812639206854697526329,
+        0.949107912342758524526189684047851,
+        0.864864423359769072789712788640926,
+        0.741531185599394439863864773280788,
+        0.586087235467691130294144845693013,
+        0.405845151377397166906606412076961,
+        0.207784955007898467600689403773245,
+    ]
+)
+_KRONROD_POSITIVE_WEIGHTS = np.array(
+    [
+        0.022935322010529224963732008058970,
+        0.063092092629978553290700663189204,
+        0.104790010322250183839876322541518,
+        0.140653259715525918745189590510238,
+        0.169004726639267902826583426598550,
+        0.190350578064785409913256402421014,
+        0.204432940075298892414161999234649,
+    ]
+)
+_KRONROD_NODES = np.concatenate(
+    [-_KRONROD_POSITIVE_NODES, [0.0], _KRONROD_POSITIVE_NODES[::-1]]
+)
+_KRONROD_WEIGHTS = np.concatenate(
+    [
+        _KRONROD_POSITIVE_WEIGHTS,
+        [0.209482141084727828012999174891714],
+        _KRONROD_POSITIVE_WEIGHTS[::-1],
+    ]
+)
+_GAUSS_WEIGHTS = np.zeros(15)
+_GAUSS_WEIGHTS[[1, 3, 5, 13, 11, 9]] = np.tile(
+    [
+        0.129484966168869693270611432679082,
+        0.279705391489276667901467771423780,
+        0.381830050505118944950369775488975,
+    ],
+    2,
+)
+_GAUSS_WEIGHTS[7] = 0.417959183673469387755102040816327
+
+
+@lru_cache(maxsize=128)
+def gauss_points(order: int) -> tuple[np.ndarray, np.ndarray]:
+    """Get the Gauss-Legendre nodes and weights of <order> points on [-1, 1].
+
+    The tables are computed once per order and cached; they are read-only.
+    """
+    if order < 1:
+        raise ValueError("Gauss order must be at least 1")
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+    nodes.flags.writeable = False
+    weights.flags.writeable = False
+    return nodes, weights
+
+
+# Gauss-Legendre integration of a Function over [lower, upper].
+#
+# An <order>-point rule is exact for polynomials of degree 2 * order - 1.
+# lower and upper may be arrays of K bounds: the K integrals are then computed
+# together, and the Function is evaluated by a single value() call on the
+# (K, order) array of all the nodes, so it must accept arrays. With
+# vectorized=False, value() is called on one float node at a time instead.
+# <parameters>, when given, is passed to value() as a second argument, for a
+# family of integrands over the same nodes, such as the radii of K ellipses:
+# an array holds one row per integral, the bounds being broadcast to its
+# length, while a scalar is shared by all the integrals.
+class GaussSingleIntegration:
+    _value: float | np.ndarray
+    _order: int
+
+    def __init__(
+        self,
+        function: Function,
+        lower,
+        upper,
+        order: int = 15,
+        vectorized: bool = True,
+        parameters=None,
+    ):
+        nodes, weights = gauss_points(order)
+        lower, upper = _broadcast_bounds(parameters, lower, upper)
+        half = 0.5 * (upper - lower)
+        middle = 0.5 * (upper + lower)
+        x = middle[..., None] + half[..., None] * nodes
+        y = _evaluate(function, x, vectorized, parameters)
+        value = half * (y @ weights)
+        self._value = float(value) if value.ndim == 0 else value
+        self._order = order
+
+    @property
+    def value(self) -> float | np.ndarray:
+        """Get the integral, or the (K,) integrals over arrays of bounds."""
+        return self._value
+
+    @property
+    def order(self) -> int:
+        return self._order
+
+
+# Adaptive Gauss-Kronrod integration of a Function over [lower, upper].
+#
+# Every interval is integrated by the 15-point Kronrod rule, and the error of
+# the embedded 7-point Gauss rule, scaled as in QUADPACK, estimates the
+# error. The subintervals of an integral form a priority queue on their
+# error: the worst one is bisected until the total error is below
+# max(abs_tol, rel_tol * |integral|) or max_intervals is reached, so the
+# nodes go where the integrand needs them. <nb_intervals> equal subintervals
+# are integrated to start with, as a composite rule.
+# lower and upper may be arrays of K bounds, or <parameters> may hold K rows,
+# as for GaussSingleIntegration: the K integrals are then refined together,
+# the worst subintervals of all the unfinished ones being bisected by a
+# single value() call on the (n, 15) array of their nodes; the parameter
+# rows are given along, and finished integrals are left out.
+class GaussKronrodIntegration:
+    _value: float | np.ndarray
+    _error: float | np.ndarray
+    _nb_intervals: int | np.ndarray
+    _converged: np.ndarray
+
+    def __init__(
+        self,
+        function: Function,
+        lower,
+        upper,
+        abs_tol: float = 1.0e-10,
+        rel_tol: float = 1.0e-10,
+        max_intervals: int = 100,
+        nb_intervals: int = 1,
+        vectorized: bool = True,
+        parameters=None,
+    ):
+        if abs_tol < 0.0 or rel_tol < 0.0:
+            raise ValueError("Tolerances must not be negative")
+        if nb_intervals < 1 or max_intervals < nb_intervals:
+            raise ValueError("max_intervals must be at least nb_intervals >= 1")
+        lower, upper = _broadcast_bounds(parameters, lower, upper)
+        scalar = lower.ndim == 0
+        lower = lower.reshape(-1)
+        upper = upper.reshape(-1)
+        k = lower.size
+
+        # Queues of subintervals, one row per integral.
+        starts = np.empty((k, max_intervals))
+        ends = np.empty((k, max_intervals))
+        integrals = np.zeros((k, max_intervals))
+        errors = np.full((k, max_intervals), -np.inf)
+        steps = np.linspace(0.0, 1.0, nb_intervals + 1)
+        bounds = lower[:, None] + (upper - lower)[:, None] * steps
+        starts[:, :nb_intervals] = bounds[:, :-1]
+        ends[:, :nb_intervals] = bounds[:, 1:]
+        first, first_errors = _kronrod(
+            function,
+            starts[:, :nb_intervals].reshape(-1),
+            ends[:, :nb_intervals].reshape(-1),
+            vectorized,
+            _rows(parameters, np.repeat(np.arange(k), nb_intervals), scalar),
+        )
+        integrals[:, :nb_intervals] = first.reshape(k, nb_intervals)
+        errors[:, :nb_intervals] = first_errors.reshape(k, nb_intervals)
+        count = np.full(k, nb_intervals)
+        value = integrals.sum(axis=1)
+        error = errors[:, :nb_intervals].sum(axis=1)
+
+        while True:
+            converged = error <= np.maximum(abs_tol, rel_tol * np.abs(value))
+            active = np.flatnonzero(~converged & (count < max_intervals))
+            if active.size == 0:
+                break
+            worst = np.argmax(errors[active], axis=1)
+            a = starts[active, worst]
+            b = ends[active, worst]
+            middle = 0.5 * (a + b)
+            halves, half_errors = _kronrod(
+                function,
+                np.concatenate([a, middle]),
+                np.concatenate([middle, b]),
+                vectorized,
+                _rows(parameters, np.concatenate([active, active]), scalar),
+            )
+            n = active.size
+            value[active] += halves[:n] + halves[n:] - integrals[active, worst]
+            error[active] += half_errors[:n] + half_errors[n:]
+            error[active] -= errors[active, worst]
+            last = count[active]
+            ends[active, worst] = middle
+            integrals[active, worst] = halves[:n]
+            errors[active, worst] = half_errors[:n]
+            starts[active, last] = middle
+            ends[active, last] = b
+            integrals[active, last] = halves[n:]
+            errors[active, last] = half_errors[n:]
+            count[active] += 1
+
+        self._converged = converged
+        if scalar:
+            self._value = float(value[0])
+            self._error = float(error[0])
+            self._nb_intervals = int(count[0])
+        else:
+            self._value = value
+            self._error = error
+            self._nb_intervals = count
+
+    @property
+    def is_done(self) -> bool:
+        """Tell whether every integral reached the tolerance."""
+        return bool(self._converged.all())
+
+    @property
+    def converged(self) -> np.ndarray:
+        """Get whether each integral reached the tolerance."""
+        return self._converged
+
+    @property
+    def value(self) -> float | np.ndarray:
+        return self._value
+
+    @property
+    def error(self) -> float | np.ndarray:
+        """Get the estimated absolute error of the integrals."""
+        return self._error
+
+    @property
+    def nb_intervals(self) -> int | np.ndarray:
+        """Get the number of subintervals used by the integrals."""
+        return self._nb_intervals
+
+
+def _evaluate(function: Function, x: np.ndarray, vectorized: bool, parameters):
+    # Values of the function on the nodes <x>, by a single call when
+    # vectorized, else node by node, with the parameter row of its integral.
+    if vectorized:
+        if parameters is None:
+            y = function.value(x)
+        else:
+            y = function.value(x, parameters)
+        return np.broadcast_to(np.asarray(y, dtype=np.float64), x.shape)
+    rows = parameters is not None and np.ndim(parameters) > 0
+    if rows:
+        parameters = np.asarray(parameters)
+    y = np.empty(x.shape)
+    for index in np.ndindex(x.shape):
+        if parameters is None:
+            y[index] = function.value(float(x[index]))
+        elif rows:
+            y[index] = function.value(float(x[index]), parameters[index[:-1]])
+        else:
+            y[index] = function.value(float(x[index]), parameters)
+    return y
+
+
+def _rows(parameters, rows: np.ndarray, scalar: bool):
+    # The parameter rows of the integrals of the intervals given to _kronrod();
+    # a single integral or a scalar gets its parameters as they are.
+    if parameters is None or scalar or np.ndim(parameters) == 0:
+        return parameters
+    return np.asarray(parameters)[rows]
+
+
+def _kronrod(
+    function: Function,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    vectorized: bool,
+    parameters,
+) -> tuple[np.ndarray, np.ndarray]:
+    # The Kronrod integrals of intervals and their QUADPACK error estimates.
+    half = 0.5 * (upper - lower)
+    x = 0.5 * (upper + lower)[:, None] + half[:, None] * _KRONROD_NODES
+    y = _evaluate(function, x, vectorized, parameters)
+    kronrod = y @ _KRONROD_WEIGHTS
+    gauss = y @ _GAUSS_WEIGHTS
+    mean = 0.5 * kronrod
+    width = np.abs(half)
+    absolute = width * (np.abs(y) @ _KRONROD_WEIGHTS)
+    deviation = width * (np.abs(y - mean[:, None]) @ _KRONROD_WEIGHTS)
+    error = width * np.abs(kronrod - gauss)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaled = deviation * np.minimum(1.0, (200.0 * error / deviation) ** 1.5)
+    error = np.where((deviation != 0.0) & (error != 0.0), scaled, error)
+    error = np.maximum(error, 50.0 * np.finfo(np.float64).eps * absolute)
+    return half * kronrod, error
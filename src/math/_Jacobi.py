@@ -1,8 +1,17 @@
 import sys
+
+import numpy as np
+
 from ._MathVector import MathVector
 from ._MathMatrix import MathMatrix
 
 
+# Eigen-decomposition of a symmetric matrix by the cyclic Jacobi method.
+# Every sweep goes over all the (p, q) pairs in the round-robin order of a
+# tournament: the n - 1 rounds of a sweep are made of n / 2 disjoint pairs,
+# whose rotations commute and are applied together, as NumPy updates of the
+# rows and then the columns of the pairs. The eigenvectors are the columns of
+# eigen_vectors, sorted with the eigenvalues in increasing order.
 class Jocobi:
     _matrix: MathMatrix
     _done: bool
@@ -37,107 +46,95 @@ class Jocobi:
 
     def solve(self):
         n = self._matrix.shape[0]
-
-        b = MathVector.zeros(n)
-        z = MathVector.zeros(n)
-
-        for i in range(n):
-            b[i] = self._matrix[i, i]
-            self._eigen_values[i] = self._matrix[i, i]
-
+        a = self._matrix._data
+        v = self._eigen_vectors._data
         self._nb_rotations = 0
-
-        tresh = 0.0
+        rounds = _round_robin(n)
 
         for i in range(50):
-            sm = 0.0
-            for j in range(n):
-                for k in range(j + 1, n):
-                    sm += abs(self._matrix[j, k])
+            sm = np.abs(np.triu(a, 1)).sum()
             if sm < sys.float_info.epsilon:
+                self._eigen_values._data[:] = np.diag(a)
                 self._done = True
                 self.eigen_sort()
                 return 0
 
-            if i < 4:
-                tresh = (0.2 * sm) / (n * n)
-            else:
-                tresh = 0.0
-
-            for j in range(n):
-                for k in range(j + 1, n):
-                    g = 100.0 * abs(self._matrix[j, k])
-                    if i > 4 and (
-                        abs(self._eigen_values[j]) + g == abs(self._eigen_values[j])
-                        and abs(self._eigen_values[k]) + g == abs(self._eigen_values[k])
-                    ):
-                        self._matrix[j, k] = 0.0
-                    elif abs(self._matrix[j, k]) > tresh:
-                        h = self._eigen_values[k] - self._eigen_values[j]
-                        if abs(h) + g == abs(h):
-                            t = self._matrix[j, k] / h
-                        else:
-                            theta = 0.5 * h / self._matrix[j, k]
-                            t = 1.0 / (abs(theta) + (1.0 + theta * theta) ** 0.5)
-                            if theta < 0.0:
-                                t = -t
-                        c = 1.0 / (1.0 + t * t) ** 0.5
-                        s = t * c
-                        tau = s / (1.0 + c)
-                        h = t * self._matrix[j, k]
-                        z[j] -= h
-                        z[k] += h
-                        self._eigen_values[j] -= h
-                        self._eigen_values[k] += h
-                        self._matrix[j, k] = 0.0
-
-                        for l in range(j):
-                            self.rotate(l, j, l, k, s, tau)
-                        for l in range(j + 1, k):
-                            self.rotate(j, l, l, k, s, tau)
-                        for l in range(k + 1, n):
-                            self.rotate(j, l, k, l, s, tau)
-
-                        for l in range(n):
-                            g = self._eigen_vectors[l, j]
-                            h = self._eigen_vectors[l, k]
-                            self._eigen_vectors[l, j] = g - s * (h + g * tau)
-                            self._eigen_vectors[l, k] = h + s * (g - h * tau)
-
-                        self._nb_rotations += 1
-
-            for j in range(n):
-                b[j] += z[j]
-                self._eigen_values[j] = b[j]
-                z[j] = 0.0
-
+            # The first sweeps only rotate the largest off-diagonal terms.
+            tresh = (0.2 * sm) / (n * n) if i < 4 else 0.0
+
+            for p, q in rounds:
+                apq = a[p, q]
+                app = a[p, p]
+                aqq = a[q, q]
+                g = 100.0 * np.abs(apq)
+                if i > 4:
+                    # Terms negligible against both diagonal terms are dropped.
+                    negligible = (np.abs(app) + g == np.abs(app)) & (
+                        np.abs(aqq) + g == np.abs(aqq)
+                    )
+                    a[p[negligible], q[negligible]] = 0.0
+                    a[q[negligible], p[negligible]] = 0.0
+                    apq = np.where(negligible, 0.0, apq)
+                rotated = np.abs(apq) > tresh
+                if not rotated.any():
+                    continue
+                p, q = p[rotated], q[rotated]
+                apq, g = apq[rotated], g[rotated]
+                h = aqq[rotated] - app[rotated]
+
+                # t = tan(angle), the smaller root of t^2 + 2 t theta - 1 = 0.
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    theta = 0.5 * h / apq
+                    t = np.where(
+                        np.abs(h) + g == np.abs(h),
+                        apq / h,
+                        np.sign(theta) / (np.abs(theta) + np.sqrt(1.0 + theta * theta)),
+                    )
+                t[theta == 0.0] = 1.0
+                c = 1.0 / np.sqrt(1.0 + t * t)
+                s = t * c
+
+                row_p = a[p]
+                row_q = a[q]
+                a[p] = c[:, None] * row_p - s[:, None] * row_q
+                a[q] = s[:, None] * row_p + c[:, None] * row_q
+                column_p = a[:, p]
+                column_q = a[:, q]
+                a[:, p] = c * column_p - s * column_q
+                a[:, q] = s * column_p + c * column_q
+                a[p, q] = 0.0
+                a[q, p] = 0.0
+                column_p = v[:, p]
+                column_q = v[:, q]
+                v[:, p] = c * column_p - s * column_q
+                v[:, q] = s * column_p + c * column_q
+
+                self._nb_rotations += p.size
+
+        self._eigen_values._data[:] = np.diag(a)
         self.eigen_sort()
-        raise -1
+        return -1
 
     def eigen_sort(self):
-        n = len(self._eigen_values)
-
-        for i in range(n):
-            p = self._eigen_values[i]
-            k = i
-            for j in range(i + 1, n):
-                if self._eigen_values[j] < p:
-                    p = self._eigen_values[j]
-                    k = j
-            if k != i:
-                self._eigen_values[i], self._eigen_values[k] = (
-                    self._eigen_values[k],
-                    self._eigen_values[i],
-                )
-                for j in range(n):
-                    self._eigen_vectors[j, i], self._eigen_vectors[j, k] = (
-                        self._eigen_vectors[j, k],
-                        self._eigen_vectors[j, i],
-                    )
-
-    def rotate(self, i, j, k, l, s, tau):
-        g = self._matrix[i, j]
-        h = self._matrix[k, l]
-
-        self._matrix[i, j] = g - s * (h + g * tau)
-        self._matrix[k, l] = h + s * (g - h * tau)
+        order = np.argsort(self._eigen_values._data, kind="stable")
+        self._eigen_values._data[:] = self._eigen_values._data[order]
+        self._eigen_vectors._data[:] = self._eigen_vectors._data[:, order]
+
+
+def _round_robin(n: int) -> list[tuple[np.ndarray, np.ndarray]]:
+    # The rounds of a round-robin tournament between n players, by the circle
+    # method: player 0 stays in place while the others turn. Each round is
+    # given as the arrays of p < q of its pairs; with an odd n, a dummy player
+    # sits out one player per round.
+    m = n + n % 2
+    players = np.arange(m)
+    rounds = []
+    for _ in range(m - 1):
+        first = players[: m // 2]
+        second = players[m // 2 :][::-1]
+        p = np.minimum(first, second)
+        q = np.maximum(first, second)
+        real = q < n
+        rounds.append((p[real], q[real]))
+        players = np.concatenate([players[:1], players[-1:], players[1:-1]])
+    return rounds
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ..primitive import Dir3D, Matrix3DStack, Point3D, RAx23D, XyzArray
+
+
+# Eigen-decomposition of K symmetric 3x3 matrices at once, given as a
+# Matrix3DStack or a (K, 3, 3) array; only their symmetric part is used.
+#
+# The cyclic Jacobi method is run on all the matrices together: each sweep
+# applies the rotations of the (0, 1), (0, 2) and (1, 2) pairs as NumPy
+# updates of the whole stack, and the sweeps stop once every off-diagonal
+# term is negligible against its diagonal, which takes a handful of sweeps
+# thanks to the quadratic convergence of the method. Repeated eigenvalues
+# need no special case.
+# The eigenvalues of every matrix are sorted in increasing order, and its
+# eigenvectors, the columns of eigen_vectors, form a right-handed basis.
+class Jacobi3DStack:
+    _eigen_values: np.ndarray
+    _eigen_vectors: np.ndarray
+    _nb_sweeps: int
+
+    def __init__(self, matrices: Matrix3DStack | np.ndarray, max_sweeps: int = 16):
+        if isinstance(matrices, Matrix3DStack):
+            matrices = matrices.data
+        matrices = np.asarray(matrices, dtype=np.float64)
+        if matrices.ndim == 2:
+            matrices = matrices[None]
+        if matrices.ndim != 3 or matrices.shape[1:] != (3, 3):
+            raise ValueError("Matrices must have shape (K, 3, 3)")
+        self._solve(0.5 * (matrices + matrices.transpose(0, 2, 1)), max_sweeps)
+
+    def __len__(self) -> int:
+        return self._eigen_values.shape[0]
+
+    @property
+    def eigen_values(self) -> np.ndarray:
+        """Get the (K, 3) eigenvalues, in increasing order."""
+        return self._eigen_values
+
+    @property
+    def eigen_vectors(self) -> np.ndarray:
+        """Get the (K, 3, 3) eigenvectors, as columns."""
+        return self._eigen_vectors
+
+    def eigen_vector(self, index: int) -> XyzArray:
+        """Get the eigenvectors of the <index>-th eigenvalue of every matrix."""
+        return XyzArray(self._eigen_vectors[:, :, index].copy())
+
+    def frame(self, index: int, origin: Point3D | None = None) -> RAx23D:
+        """Get the principal frame of one matrix.
+
+        The X direction is the eigenvector of the largest eigenvalue and the
+        main direction the one of the smallest, such as the normal of a
+        flat point neighbourhood.
+        """
+        vectors = self._eigen_vectors[index]
+        return RAx23D(
+            Point3D() if origin is None else origin,
+            Dir3D(*vectors[:, 0].tolist()),
+            Dir3D(*vectors[:, 2].tolist()),
+        )
+
+    def _solve(self, matrices: np.ndarray, max_sweeps: int) -> None:
+        # The six distinct terms of the matrices and the nine of the
+        # eigenvectors are kept as contiguous (K,) arrays, so that a rotation
+        # is a few operations on whole arrays.
+        a = {(i, j): matrices[:, i, j].copy() for i in range(3) for j in range(i, 3)}
+        v = {
+            (i, j): np.full(len(matrices), float(i == j))
+            for i in range(3)
+            for j in range(3)
+        }
+        eps = np.finfo(np.float64).eps
+        self._nb_sweeps = 0
+        for _ in range(max_sweeps):
+            off = np.maximum(
+                np.maximum(np.abs(a[0, 1]), np.abs(a[0, 2])), np.abs(a[1, 2])
+            )
+            diagonal = np.maximum(
+                np.maximum(np.abs(a[0, 0]), np.abs(a[1, 1])), np.abs(a[2, 2])
+            )
+            if np.all(off <= eps * diagonal):
+                break
+            self._nb_sweeps += 1
+            for p, q, r in ((0, 1, 2), (0, 2, 1), (1, 2, 0)):
+                apq = a[p, q]
+                # t = tan(angle), the smaller root of t^2 + 2 t theta - 1 = 0;
+                # null terms get the identity rotation.
+                with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                    theta = 0.5 * (a[q, q] - a[p, p]) / apq
+                    t = np.where(theta >= 0.0, 1.0, -1.0) / (
+                        np.abs(theta) + np.hypot(theta, 1.0)
+                    )
+                t[apq == 0.0] = 0.0
+                c = 1.0 / np.sqrt(1.0 + t * t)
+                s = t * c
+
+                a[p, p] = a[p, p] - t * apq
+                a[q, q] = a[q, q] + t * apq
+                a[p, q] = np.zeros_like(apq)
+                rp, rq = (min(r, p), max(r, p)), (min(r, q), max(r, q))
+                a[rp], a[rq] = c * a[rp] - s * a[rq], s * a[rp] + c * a[rq]
+                for i in range(3):
+                    v[i, p], v[i, q] = (
+                        c * v[i, p] - s * v[i, q],
+                        s * v[i, p] + c * v[i, q],
+                    )
+
+        values = np.stack([a[0, 0], a[1, 1], a[2, 2]], axis=1)
+        vectors = np.stack([[v[i, j] for j in range(3)] for i in range(3)]).transpose(
+            2, 0, 1
+        )
+        order = np.argsort(values, axis=1, kind="stable")
+        self._eigen_values = np.take_along_axis(values, order, axis=1)
+        vectors = np.take_along_axis(vectors, order[:, None, :], axis=2)
+        # The rotations keep a unit determinant, the sort may flip its sign.
+        vectors[:, :, 2] *= np.sign(np.linalg.det(vectors))[:, None]
+        self._eigen_vectors = vectors
@@ -1,3 +1,9 @@
 from ._MathVector import MathVector
 from ._MathMatrix import MathMatrix
-from ._Jacobi import Jocobi
\ No newline at end of file
+from ._Function import Function
+from ._FunctionWithDerivative import FunctionWithDerivative
+from ._Jacobi import Jocobi
+from ._Jacobi3DStack import Jacobi3DStack
+from ._Gauss import GaussKronrodIntegration, GaussSingleIntegration, gauss_points
+from ._BrentRoot import BrentRoot
+from ._FunctionRoot import FunctionRoot
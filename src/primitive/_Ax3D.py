@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from ._RAx23D import RAx23D
+    from ._Trsf3D import Trsf3D
     from ._Vec3D import Vec3D
 
 from ..config import TOLERANCE
@@ -10,13 +12,17 @@ from ._Point3D import Point3D
 from ._Dir3D import Dir3D
 
 
+# Memory budget (CPython 3.11, 64-bit): 48 bytes for the Ax3D plus a
+# Point3D and a Dir3D (168 bytes each), 384 bytes in all.
 class Ax3D:
+    __slots__ = ("_loc", "_dir")
+
     _loc: Point3D
     _dir: Dir3D
 
-    def __init__(self, loc: Point3D = Point3D(), dir: Dir3D = Dir3D()) -> None:
-        self._loc = loc
-        self._dir = dir
+    def __init__(self, loc: Point3D | None = None, dir: Dir3D | None = None) -> None:
+        self._loc = Point3D() if loc is None else loc
+        self._dir = Dir3D() if dir is None else dir
 
     def __str__(self) -> str:
         return f"Ax3D(loc={self._loc}, dir={self._dir})"
@@ -40,6 +46,10 @@ class Ax3D:
     def copy(self) -> Ax3D:
         return Ax3D(self._loc.copy(), self._dir.copy())
 
+    def _assign(self, other: Ax3D) -> None:
+        self._loc._assign(other._loc)
+        self._dir._assign(other._dir)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Ax3D):
             return NotImplemented
@@ -80,14 +90,14 @@ class Ax3D:
         self._dir.mirror_by_ax3d(a1)
         return self
 
-    def mirror_by_rax23d(self, a2: Ax3D) -> Ax3D:
+    def mirror_by_rax23d(self, a2: RAx23D) -> Ax3D:
         self._loc.mirror_by_rax23d(a2)
         self._dir.mirror_by_rax23d(a2)
         return self
 
-    def rotate(self, point: Point3D, angle: float) -> Ax3D:
-        self._loc.rotate(point, angle)
-        self._dir.rotate(point, angle)
+    def rotate(self, ax3d: Ax3D, angle: float) -> Ax3D:
+        self._loc.rotate(ax3d, angle)
+        self._dir.rotate(ax3d, angle)
         return self
 
     def scale(self, point: Point3D, factor: float) -> Ax3D:
@@ -96,7 +106,7 @@ class Ax3D:
             self._dir.reverse()
         return self
 
-    def transform(self, trsf3d) -> Ax3D:
+    def transform(self, trsf3d: Trsf3D) -> Ax3D:
         self._loc.transform(trsf3d)
         self._dir.transform(trsf3d)
         return self
@@ -108,3 +118,27 @@ class Ax3D:
     def translate_by_2points(self, p1: Point3D, p2: Point3D) -> Ax3D:
         self._loc.translate_by_2points(p1, p2)
         return self
+
+    def mirror_by_point_into(self, point: Point3D, out: Ax3D) -> Ax3D:
+        out._assign(self)
+        return out.mirror_by_point(point)
+
+    def mirror_by_ax3d_into(self, ax3d: Ax3D, out: Ax3D) -> Ax3D:
+        out._assign(self)
+        return out.mirror_by_ax3d(ax3d)
+
+    def mirror_by_rax23d_into(self, rax23d: RAx23D, out: Ax3D) -> Ax3D:
+        out._assign(self)
+        return out.mirror_by_rax23d(rax23d)
+
+    def rotate_into(self, ax3d: Ax3D, angle: float, out: Ax3D) -> Ax3D:
+        out._assign(self)
+        return out.rotate(ax3d, angle)
+
+    def scale_into(self, point: Point3D, factor: float, out: Ax3D) -> Ax3D:
+        out._assign(self)
+        return out.scale(point, factor)
+
+    def transform_into(self, trsf3d: Trsf3D, out: Ax3D) -> Ax3D:
+        out._assign(self)
+        return out.transform(trsf3d)
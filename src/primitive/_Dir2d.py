@@ -12,7 +12,11 @@ if TYPE_CHECKING:
     from ._Trsf2D import Trsf2D
 
 
+# Memory budget (CPython 3.11, 64-bit): 40 bytes for the Dir2D, 48 for its
+# Xy and 24 per float coordinate, 136 bytes in all.
 class Dir2D:
+    __slots__ = ("_coord",)
+
     _coord: Xy
 
     def __init__(self, x: float = 1.0, y: float = 0.0) -> None:
@@ -58,6 +62,10 @@ class Dir2D:
     def copy(self) -> Dir2D:
         return Dir2D(self._coord.x, self._coord.y)
 
+    def _assign(self, other: Dir2D) -> None:
+        self._coord.x = other._coord.x
+        self._coord.y = other._coord.y
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Dir2D):
             return NotImplemented
@@ -127,45 +135,60 @@ class Dir2D:
         y = self._coord.y
 
         m1 = 2 * a * b
-        xx = (2 * a * a - 1) * x + m1 * y
-        yy = m1 * x + (2 * b * b - 1) * y
-        self._coord = Xy(xx, yy)
+        self._coord.x = (2 * a * a - 1) * x + m1 * y
+        self._coord.y = m1 * x + (2 * b * b - 1) * y
         self.normalize()
         return self
 
-    def mirror_by_ax2d(self, ax2d: Ax2D):
+    def mirror_by_ax2d(self, ax2d: Ax2D) -> Dir2D:
         xy = ax2d.dir.coord
         a, b = xy.x, xy.y
         x, y = self._coord.x, self._coord.y
         m1 = 2 * a * b
-        xx = (2 * a * a - 1) * x + m1 * y
-        yy = m1 * x + (2 * b * b - 1) * y
-        self._coord = Xy(xx, yy)
+        self._coord.x = (2 * a * a - 1) * x + m1 * y
+        self._coord.y = m1 * x + (2 * b * b - 1) * y
         return self
 
     def rotate(self, angle: float) -> Dir2D:
-        from ._Trsf2D import Trsf2D
-        from ._Point2D import Point2D
-
-        trsf = Trsf2D()
-        trsf.set_rotation(Point2D(0, 0), angle)
-        self._coord = trsf.matrix @ self._coord
-
+        c = math.cos(angle)
+        s = math.sin(angle)
+        x, y = self._coord.x, self._coord.y
+        self._coord.x = c * x - s * y
+        self._coord.y = s * x + c * y
         return self
 
-    def transform(self, trsf2d: Trsf2D):
+    def transform(self, trsf2d: Trsf2D) -> Dir2D:
         from ._TrsfForm import TrsfForm
 
         if trsf2d.trsf_form == TrsfForm.IDENTITY:
-            return
+            return self
         elif trsf2d.trsf_form == TrsfForm.PNTMIRROR:
             self.reverse()
         elif trsf2d.trsf_form == TrsfForm.SCALE:
             if trsf2d.scale < 0:
                 self.reverse()
         else:
-            self._coord = trsf2d.matrix @ self._coord
+            m = trsf2d.matrix
+            x, y = self._coord.x, self._coord.y
+            self._coord.x = m[0, 0] * x + m[0, 1] * y
+            self._coord.y = m[1, 0] * x + m[1, 1] * y
             self.normalize()
             if trsf2d.scale < 0:
                 self.reverse()
         return self
+
+    def mirror_by_dir2d_into(self, dir: Dir2D, out: Dir2D) -> Dir2D:
+        out._assign(self)
+        return out.mirror_by_dir2d(dir)
+
+    def mirror_by_ax2d_into(self, ax2d: Ax2D, out: Dir2D) -> Dir2D:
+        out._assign(self)
+        return out.mirror_by_ax2d(ax2d)
+
+    def rotate_into(self, angle: float, out: Dir2D) -> Dir2D:
+        out._assign(self)
+        return out.rotate(angle)
+
+    def transform_into(self, trsf2d: Trsf2D, out: Dir2D) -> Dir2D:
+        out._assign(self)
+        return out.transform(trsf2d)
@@ -7,12 +7,19 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ._Vec3D import Vec3D
     from ._Point3D import Point3D
+    from ._Ax3D import Ax3D
+    from ._RAx23D import RAx23D
+    from ._Trsf3D import Trsf3D
 
 from ..config import FLOAT_PRINT_PRECISION, TOLERANCE
 from ._Xyz import Xyz
 
 
+# Memory budget (CPython 3.11, 64-bit): 40 bytes for the Dir3D, 56 for its
+# Xyz and 24 per float coordinate, 168 bytes in all.
 class Dir3D:
+    __slots__ = ("_coord",)
+
     _coord: Xyz
 
     def __init__(self, x: float = 1.0, y: float = 0.0, z: float = 0.0) -> None:
@@ -75,6 +82,11 @@ class Dir3D:
     def copy(self) -> Dir3D:
         return Dir3D(self._coord.x, self._coord.y, self._coord.z)
 
+    def _assign(self, other: Dir3D) -> None:
+        self._coord.x = other._coord.x
+        self._coord.y = other._coord.y
+        self._coord.z = other._coord.z
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Dir3D):
             return NotImplemented
@@ -164,14 +176,82 @@ class Dir3D:
         xyz = self._coord.cross_cross(dir1._coord, dir2._coord)
         return Dir3D(xyz.x, xyz.y, xyz.z)
 
-    def rotate(self, ax1, angle):
-        raise NotImplementedError
+    def mirror_by_dir3d(self, dir: Dir3D) -> Dir3D:
+        # D' = 2 * (D . V) * V - D
+        vx, vy, vz = dir._coord.x, dir._coord.y, dir._coord.z
+        x, y, z = self._coord.x, self._coord.y, self._coord.z
+        d = 2.0 * (x * vx + y * vy + z * vz)
+        self._coord.x = d * vx - x
+        self._coord.y = d * vy - y
+        self._coord.z = d * vz - z
+        self.normalize()
+        return self
+
+    def mirror_by_ax3d(self, ax3d: Ax3D) -> Dir3D:
+        return self.mirror_by_dir3d(ax3d.dir)
+
+    def mirror_by_rax23d(self, rax23d: RAx23D) -> Dir3D:
+        # Mirror through the plane of normal N: D' = D - 2 * (D . N) * N
+        n = rax23d.dir._coord
+        d = 2.0 * (self._coord @ n)
+        self._coord.x -= d * n.x
+        self._coord.y -= d * n.y
+        self._coord.z -= d * n.z
+        self.normalize()
+        return self
+
+    def rotate(self, ax3d: Ax3D, angle: float) -> Dir3D:
+        # Rodrigues' formula: D' = D * cos + (A ^ D) * sin + A * (A . D) * (1 - cos)
+        c = math.cos(angle)
+        s = math.sin(angle)
+        a = ax3d.dir._coord
+        ax, ay, az = a.x, a.y, a.z
+        x, y, z = self._coord.x, self._coord.y, self._coord.z
+        k = (ax * x + ay * y + az * z) * (1.0 - c)
+        self._coord.x = x * c + (ay * z - az * y) * s + ax * k
+        self._coord.y = y * c + (az * x - ax * z) * s + ay * k
+        self._coord.z = z * c + (ax * y - ay * x) * s + az * k
+        self.normalize()
+        return self
+
+    def transform(self, trsf3d: Trsf3D) -> Dir3D:
+        from ._TrsfForm import TrsfForm
+
+        form = trsf3d.trsf_form
+        if form in {TrsfForm.IDENTITY, TrsfForm.TRANSLATION}:
+            return self
+        elif form == TrsfForm.PNTMIRROR:
+            self.reverse()
+        elif form == TrsfForm.SCALE:
+            if trsf3d.scale < 0.0:
+                self.reverse()
+        else:
+            m = trsf3d.matrix
+            x, y, z = self._coord.x, self._coord.y, self._coord.z
+            self._coord.x = m[0, 0] * x + m[0, 1] * y + m[0, 2] * z
+            self._coord.y = m[1, 0] * x + m[1, 1] * y + m[1, 2] * z
+            self._coord.z = m[2, 0] * x + m[2, 1] * y + m[2, 2] * z
+            self.normalize()
+            if trsf3d.scale < 0.0:
+                self.reverse()
+        return self
+
+    def mirror_by_dir3d_into(self, dir: Dir3D, out: Dir3D) -> Dir3D:
+        out._assign(self)
+        return out.mirror_by_dir3d(dir)
+
+    def mirror_by_ax3d_into(self, ax3d: Ax3D, out: Dir3D) -> Dir3D:
+        out._assign(self)
+        return out.mirror_by_ax3d(ax3d)
 
-    def mirror_by_ax3d(self):
-        raise NotImplementedError
+    def mirror_by_rax23d_into(self, rax23d: RAx23D, out: Dir3D) -> Dir3D:
+        out._assign(self)
+        return out.mirror_by_rax23d(rax23d)
 
-    def mirror_by_rax23d(self):
-        raise NotImplementedError
+    def rotate_into(self, ax3d: Ax3D, angle: float, out: Dir3D) -> Dir3D:
+        out._assign(self)
+        return out.rotate(ax3d, angle)
 
-    def transform(self):
-        raise NotImplementedError
+    def transform_into(self, trsf3d: Trsf3D, out: Dir3D) -> Dir3D:
+        out._assign(self)
+        return out.transform(trsf3d)
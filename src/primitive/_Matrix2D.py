@@ -1,29 +1,55 @@
 from __future__ import annotations
 
 import sys
+import math
 import numpy as np
 
+from ._Xy import Xy
 
+
+# A 2x2 matrix stored as four scalar floats.
+# Products, determinant and inverse are written out by hand, which is much
+# cheaper than going through NumPy for such a small matrix.
+# <data> builds an ndarray from the coefficients on each access: modifying
+# the returned array does not modify the matrix, assign <data> instead.
 class Matrix2D:
-    _data: np.ndarray
+    __slots__ = ("_a11", "_a12", "_a21", "_a22")
+
+    _a11: float
+    _a12: float
+    _a21: float
+    _a22: float
 
-    def __init__(self, data=[[1.0, 0.0], [0.0, 1.0]]):
-        self._data = np.array(data, dtype=float)
+    def __init__(self, data=None):
+        if data is None:
+            self._a11, self._a12, self._a21, self._a22 = 1.0, 0.0, 0.0, 1.0
+        else:
+            self.data = data
+
+    @staticmethod
+    def from_values(a11: float, a12: float, a21: float, a22: float) -> Matrix2D:
+        m = Matrix2D.__new__(Matrix2D)
+        m._a11 = a11
+        m._a12 = a12
+        m._a21 = a21
+        m._a22 = a22
+        return m
 
     def __str__(self) -> str:
-        return f"Matrix2D(data={self._data.tolist()})"
+        return f"Matrix2D(data={self.to_list()})"
 
     @property
     def data(self) -> np.ndarray:
-        return self._data
+        return np.array([[self._a11, self._a12], [self._a21, self._a22]])
 
     @data.setter
-    def data(self, value: np.ndarray) -> None:
-        self._data = value
+    def data(self, value) -> None:
+        (a11, a12), (a21, a22) = np.asarray(value, dtype=float).tolist()
+        self._a11, self._a12, self._a21, self._a22 = a11, a12, a21, a22
 
     @property
     def determinant(self) -> float:
-        return np.linalg.det(self._data)
+        return self._a11 * self._a22 - self._a12 * self._a21
 
     def is_singular(self) -> bool:
         if abs(self.determinant) < sys.float_info.epsilon:
@@ -31,58 +57,122 @@ class Matrix2D:
         return False
 
     def copy(self) -> Matrix2D:
-        return Matrix2D(self._data.copy())
+        return Matrix2D.from_values(self._a11, self._a12, self._a21, self._a22)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Matrix2D):
             return NotImplemented
-        return np.array_equal(self._data, other._data)
+        return (
+            self._a11 == other._a11
+            and self._a12 == other._a12
+            and self._a21 == other._a21
+            and self._a22 == other._a22
+        )
 
     def get_col(self, index: int) -> np.ndarray:
-        return self._data[:, index]
+        if index == 0:
+            return np.array([self._a11, self._a21])
+        elif index == 1:
+            return np.array([self._a12, self._a22])
+        raise IndexError("Index out of range for Matrix2D object")
 
     def get_row(self, index: int) -> np.ndarray:
-        return self._data[index, :]
-
-    def set_col(self, index: int, value: np.ndarray) -> None:
-        self._data[:, index] = value
+        if index == 0:
+            return np.array([self._a11, self._a12])
+        elif index == 1:
+            return np.array([self._a21, self._a22])
+        raise IndexError("Index out of range for Matrix2D object")
+
+    def set_col(self, index: int, value) -> None:
+        if index == 0:
+            self._a11, self._a21 = float(value[0]), float(value[1])
+        elif index == 1:
+            self._a12, self._a22 = float(value[0]), float(value[1])
+        else:
+            raise IndexError("Index out of range for Matrix2D object")
 
-    def set_row(self, index: int, value: np.ndarray) -> None:
-        self._data[index, :] = value
+    def set_row(self, index: int, value) -> None:
+        if index == 0:
+            self._a11, self._a12 = float(value[0]), float(value[1])
+        elif index == 1:
+            self._a21, self._a22 = float(value[0]), float(value[1])
+        else:
+            raise IndexError("Index out of range for Matrix2D object")
 
     def get_diagonal(self) -> np.ndarray:
-        return np.diagonal(self._data)
+        return np.array([self._a11, self._a22])
 
-    def set_diagonal(self, value: np.ndarray) -> None:
-        np.fill_diagonal(self._data, value)
+    def set_diagonal(self, value) -> None:
+        if isinstance(value, (int, float)):
+            self._a11 = self._a22 = float(value)
+        else:
+            self._a11, self._a22 = float(value[0]), float(value[1])
 
     def set_identity(self) -> None:
-        self._data = np.identity(2)
+        self._a11, self._a12, self._a21, self._a22 = 1.0, 0.0, 0.0, 1.0
 
     def set_rotation(self, angle):
-        c = np.cos(angle)
-        s = np.sin(angle)
-        self._data = np.array([[c, -s], [s, c]])
+        c = math.cos(angle)
+        s = math.sin(angle)
+        self._a11, self._a12, self._a21, self._a22 = c, -s, s, c
 
     def set_scale(self, sx: float, sy: float = None) -> None:
         if sy is None:
             sy = sx
-        self._data = np.array([[sx, 0.0], [0.0, sy]])
-
-    def __getitem__(self, index: tuple[int, int]) -> float:
-        return self._data[index]
+        self._a11, self._a12, self._a21, self._a22 = sx, 0.0, 0.0, sy
+
+    def __getitem__(self, index: tuple[int, int] | int) -> float | np.ndarray:
+        if isinstance(index, tuple):
+            i, j = index
+            if i == 0:
+                if j == 0:
+                    return self._a11
+                elif j == 1:
+                    return self._a12
+            elif i == 1:
+                if j == 0:
+                    return self._a21
+                elif j == 1:
+                    return self._a22
+            raise IndexError("Index out of range for Matrix2D object")
+        return self.get_row(index)
 
     def __setitem__(self, index: tuple[int, int], value: float) -> None:
-        self._data[index] = value
+        i, j = index
+        if i == 0:
+            if j == 0:
+                self._a11 = value
+                return
+            elif j == 1:
+                self._a12 = value
+                return
+        elif i == 1:
+            if j == 0:
+                self._a21 = value
+                return
+            elif j == 1:
+                self._a22 = value
+                return
+        raise IndexError("Index out of range for Matrix2D object")
 
     def to_list(self) -> list[list[float]]:
-        return self._data.tolist()
+        return [[self._a11, self._a12], [self._a21, self._a22]]
 
     def __add__(self, other: Matrix2D | int | float) -> Matrix2D:
         if isinstance(other, Matrix2D):
-            return Matrix2D(self._data + other._data)
+            return Matrix2D.from_values(
+                self._a11 + other._a11,
+                self._a12 + other._a12,
+                self._a21 + other._a21,
+                self._a22 + other._a22,
+            )
         elif isinstance(other, (int, float)):
-            return Matrix2D(self._data + other)
+            return Matrix2D.from_values(
+                self._a11 + other,
+                self._a12 + other,
+                self._a21 + other,
+                self._a22 + other,
+            )
         else:
             return NotImplemented
 
@@ -91,108 +181,202 @@ class Matrix2D:
 
     def __iadd__(self, other: Matrix2D | int | float) -> Matrix2D:
         if isinstance(other, Matrix2D):
-            self._data += other._data
+            self._a11 += other._a11
+            self._a12 += other._a12
+            self._a21 += other._a21
+            self._a22 += other._a22
         elif isinstance(other, (int, float)):
-            self._data += other
+            self._a11 += other
+            self._a12 += other
+            self._a21 += other
+            self._a22 += other
         else:
             return NotImplemented
         return self
 
     def __sub__(self, other: Matrix2D | int | float) -> Matrix2D:
         if isinstance(other, Matrix2D):
-            return Matrix2D(self._data - other._data)
+            return Matrix2D.from_values(
+                self._a11 - other._a11,
+                self._a12 - other._a12,
+                self._a21 - other._a21,
+                self._a22 - other._a22,
+            )
         elif isinstance(other, (int, float)):
-            return Matrix2D(self._data - other)
+            return Matrix2D.from_values(
+                self._a11 - other,
+                self._a12 - other,
+                self._a21 - other,
+                self._a22 - other,
+            )
         else:
             return NotImplemented
 
     def __rsub__(self, other: int | float) -> Matrix2D:
         if isinstance(other, (int, float)):
-            return Matrix2D(other - self._data)
+            return Matrix2D.from_values(
+                other - self._a11,
+                other - self._a12,
+                other - self._a21,
+                other - self._a22,
+            )
         else:
             return NotImplemented
 
     def __isub__(self, other: Matrix2D | int | float) -> Matrix2D:
         if isinstance(other, Matrix2D):
-            self._data -= other._data
+            self._a11 -= other._a11
+            self._a12 -= other._a12
+            self._a21 -= other._a21
+            self._a22 -= other._a22
         elif isinstance(other, (int, float)):
-            self._data -= other
+            self._a11 -= other
+            self._a12 -= other
+            self._a21 -= other
+            self._a22 -= other
         else:
             return NotImplemented
         return self
 
     def __mul__(self, other: Matrix2D | int | float) -> Matrix2D:
         if isinstance(other, Matrix2D):
-            return Matrix2D(self._data * other._data)
+            return Matrix2D.from_values(
+                self._a11 * other._a11,
+                self._a12 * other._a12,
+                self._a21 * other._a21,
+                self._a22 * other._a22,
+            )
         elif isinstance(other, (int, float)):
-            return Matrix2D(self._data * other)
+            return Matrix2D.from_values(
+                self._a11 * other,
+                self._a12 * other,
+                self._a21 * other,
+                self._a22 * other,
+            )
         else:
             return NotImplemented
 
     def __rmul__(self, other: int | float) -> Matrix2D:
         if isinstance(other, (int, float)):
-            return Matrix2D(self._data * other)
+            return self.__mul__(other)
         else:
             return NotImplemented
 
     def __imul__(self, other: Matrix2D | int | float) -> Matrix2D:
         if isinstance(other, Matrix2D):
-            self._data *= other._data
+            self._a11 *= other._a11
+            self._a12 *= other._a12
+            self._a21 *= other._a21
+            self._a22 *= other._a22
         elif isinstance(other, (int, float)):
-            self._data *= other
+            self._a11 *= other
+            self._a12 *= other
+            self._a21 *= other
+            self._a22 *= other
         else:
             return NotImplemented
         return self
 
-    def __matmul__(self, other: Matrix2D) -> Matrix2D:
+    def __matmul__(self, other: Matrix2D | Xy) -> Matrix2D | Xy:
         if isinstance(other, Matrix2D):
-            return Matrix2D(self._data @ other._data)
+            return Matrix2D.from_values(
+                self._a11 * other._a11 + self._a12 * other._a21,
+                self._a11 * other._a12 + self._a12 * other._a22,
+                self._a21 * other._a11 + self._a22 * other._a21,
+                self._a21 * other._a12 + self._a22 * other._a22,
+            )
+        elif isinstance(other, Xy):
+            x, y = other.x, other.y
+            return Xy(self._a11 * x + self._a12 * y, self._a21 * x + self._a22 * y)
         else:
             return NotImplemented
 
     def __imatmul__(self, other: Matrix2D) -> Matrix2D:
         if isinstance(other, Matrix2D):
-            self._data @= other._data
+            self._a11, self._a12, self._a21, self._a22 = (
+                self._a11 * other._a11 + self._a12 * other._a21,
+                self._a11 * other._a12 + self._a12 * other._a22,
+                self._a21 * other._a11 + self._a22 * other._a21,
+                self._a21 * other._a12 + self._a22 * other._a22,
+            )
             return self
         else:
             return NotImplemented
 
     def __truediv__(self, other: Matrix2D | int | float) -> Matrix2D:
         if isinstance(other, Matrix2D):
-            return Matrix2D(self._data / other._data)
+            return Matrix2D.from_values(
+                self._a11 / other._a11,
+                self._a12 / other._a12,
+                self._a21 / other._a21,
+                self._a22 / other._a22,
+            )
         elif isinstance(other, (int, float)):
-            return Matrix2D(self._data / other)
+            return Matrix2D.from_values(
+                self._a11 / other,
+                self._a12 / other,
+                self._a21 / other,
+                self._a22 / other,
+            )
         else:
             return NotImplemented
 
     def __rtruediv__(self, other: int | float) -> Matrix2D:
         if isinstance(other, (int, float)):
-            return Matrix2D(other / self._data)
+            return Matrix2D.from_values(
+                other / self._a11,
+                other / self._a12,
+                other / self._a21,
+                other / self._a22,
+            )
         else:
             return NotImplemented
 
     def __itruediv__(self, other: Matrix2D | int | float) -> Matrix2D:
         if isinstance(other, Matrix2D):
-            self._data /= other._data
+            self._a11 /= other._a11
+            self._a12 /= other._a12
+            self._a21 /= other._a21
+            self._a22 /= other._a22
         elif isinstance(other, (int, float)):
-            self._data /= other
+            self._a11 /= other
+            self._a12 /= other
+            self._a21 /= other
+            self._a22 /= other
         else:
             return NotImplemented
         return self
 
     def __pow__(self, power: int) -> Matrix2D:
-        return Matrix2D(np.linalg.matrix_power(self._data, power))
+        result = self.copy()
+        result.__ipow__(power)
+        return result
 
     def __ipow__(self, power: int) -> Matrix2D:
-        self._data = np.linalg.matrix_power(self._data, power)
+        if power < 0:
+            self.invert()
+            power = -power
+        base = self.copy()
+        self.set_identity()
+        while power > 0:
+            if power % 2 == 1:
+                self @= base
+            base @= base
+            power //= 2
         return self
 
     def transpose(self) -> Matrix2D:
-        self._data = self._data.T
+        self._a12, self._a21 = self._a21, self._a12
         return self
 
     def invert(self) -> Matrix2D:
-        if self.is_singular():
+        det = self.determinant
+        if abs(det) < sys.float_info.epsilon:
             raise ValueError("Matrix is singular and cannot be inverted.")
-        self._data = np.linalg.inv(self._data)
+        self._a11, self._a12, self._a21, self._a22 = (
+            self._a22 / det,
+            -self._a12 / det,
+            -self._a21 / det,
+            self._a11 / det,
+        )
         return self
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import sys
+import numpy as np
+
+from ._Xy import Xy
+from ._XyArray import XyArray
+from ._Matrix2D import Matrix2D
+
+
+# Structure-of-arrays counterpart of Matrix2D.
+# K matrices are stored in a single (K, 2, 2) float64 buffer and every
+# operation of Matrix2D is applied to all of them at once.
+# Operands may be another Matrix2DStack (matrix by matrix), a single Matrix2D
+# (broadcast to every matrix), a scalar, or a 1D ndarray of length K (one
+# scalar per matrix).
+# Integer indexing returns a Matrix2D copy, slicing returns a Matrix2DStack
+# sharing memory with the buffer, which the in-place operators, transpose()
+# and invert() write through.
+# The set_* methods resize the stack to the number of inputs they are given.
+class Matrix2DStack:
+    _data: np.ndarray
+
+    __array_ufunc__ = None
+
+    def __init__(self, data=()) -> None:
+        data = np.asarray(data, dtype=np.float64)
+        if data.size == 0:
+            data = data.reshape(0, 2, 2)
+        if data.ndim != 3 or data.shape[1:] != (2, 2):
+            raise ValueError("Matrix2DStack data must have shape (K, 2, 2)")
+        self._data = data
+
+    @staticmethod
+    def identity(k: int) -> Matrix2DStack:
+        return Matrix2DStack(np.broadcast_to(np.eye(2), (k, 2, 2)).copy())
+
+    @staticmethod
+    def zeros(k: int) -> Matrix2DStack:
+        return Matrix2DStack(np.zeros((k, 2, 2), dtype=np.float64))
+
+    @staticmethod
+    def from_matrix_list(matrices: list[Matrix2D]) -> Matrix2DStack:
+        return Matrix2DStack([m.to_list() for m in matrices])
+
+    def __str__(self) -> str:
+        return f"Matrix2DStack({self._data})"
+
+    def __len__(self) -> int:
+        return self._data.shape[0]
+
+    def __iter__(self):
+        for (a11, a12), (a21, a22) in self._data.tolist():
+            yield Matrix2D.from_values(a11, a12, a21, a22)
+
+    def __getitem__(self, index) -> Matrix2D | Matrix2DStack:
+        if isinstance(index, (int, np.integer)):
+            (a11, a12), (a21, a22) = self._data[index].tolist()
+            return Matrix2D.from_values(a11, a12, a21, a22)
+        return Matrix2DStack(self._data[index])
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(value, Matrix2D):
+            self._data[index] = value.to_list()
+        elif isinstance(value, Matrix2DStack):
+            self._data[index] = value._data
+        else:
+            self._data[index] = value
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+    @data.setter
+    def data(self, value: np.ndarray) -> None:
+        self._data = value
+
+    @property
+    def determinant(self) -> np.ndarray:
+        a = self._data
+        return a[:, 0, 0] * a[:, 1, 1] - a[:, 0, 1] * a[:, 1, 0]
+
+    def is_singular(self) -> np.ndarray:
+        return np.abs(self.determinant) < sys.float_info.epsilon
+
+    def copy(self) -> Matrix2DStack:
+        return Matrix2DStack(self._data.copy())
+
+    def to_list(self) -> list[list[list[float]]]:
+        return self._data.tolist()
+
+    def to_matrix_list(self) -> list[Matrix2D]:
+        return list(self)
+
+    def get_col(self, index: int) -> XyArray:
+        return XyArray(self._data[:, :, index])
+
+    def get_row(self, index: int) -> XyArray:
+        return XyArray(self._data[:, index, :])
+
+    def set_col(self, index: int, value: XyArray | Xy | np.ndarray) -> None:
+        self._data[:, :, index] = _xy_operand(value)
+
+    def set_row(self, index: int, value: XyArray | Xy | np.ndarray) -> None:
+        self._data[:, index, :] = _xy_operand(value)
+
+    def get_diagonal(self) -> XyArray:
+        return XyArray(np.diagonal(self._data, axis1=1, axis2=2).copy())
+
+    def set_diagonal(self, value) -> None:
+        if isinstance(value, (int, float, np.number)):
+            value = np.full(2, float(value))
+        idx = np.arange(2)
+        self._data[:, idx, idx] = _xy_operand(value)
+
+    def set_identity(self) -> None:
+        self._data[...] = np.eye(2)
+
+    def set_rotation(self, angles) -> None:
+        angles = np.asarray(angles, dtype=np.float64).reshape(-1)
+        c = np.cos(angles)
+        s = np.sin(angles)
+        self._data = np.stack([c, -s, s, c], axis=-1).reshape(-1, 2, 2)
+
+    def set_scale(self, sx, sy=None) -> None:
+        sx = np.asarray(sx, dtype=np.float64)
+        sy = sx if sy is None else np.asarray(sy, dtype=np.float64)
+        sx, sy = np.broadcast_arrays(sx, sy)
+        if sx.ndim == 0:
+            sx = np.full(len(self), float(sx))
+            sy = np.full(len(self), float(sy))
+        data = np.zeros((sx.shape[0], 2, 2), dtype=np.float64)
+        data[:, 0, 0] = sx
+        data[:, 1, 1] = sy
+        self._data = data
+
+    def _operand(self, other):
+        if isinstance(other, Matrix2DStack):
+            return other._data
+        if isinstance(other, Matrix2D):
+            return np.array(other.to_list(), dtype=np.float64)
+        if isinstance(other, (int, float, np.number)):
+            return other
+        if isinstance(other, np.ndarray):
+            if other.ndim == 1:
+                return other[:, None, None]
+            return other
+        return NotImplemented
+
+    def __add__(self, other) -> Matrix2DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Matrix2DStack(self._data + other)
+
+    def __iadd__(self, other) -> Matrix2DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data += other
+        return self
+
+    def __radd__(self, other) -> Matrix2DStack:
+        return self.__add__(other)
+
+    def __sub__(self, other) -> Matrix2DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Matrix2DStack(self._data - other)
+
+    def __isub__(self, other) -> Matrix2DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data -= other
+        return self
+
+    def __rsub__(self, other) -> Matrix2DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Matrix2DStack(other - self._data)
+
+    def __mul__(self, other) -> Matrix2DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Matrix2DStack(self._data * other)
+
+    def __imul__(self, other) -> Matrix2DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data *= other
+        return self
+
+    def __rmul__(self, other) -> Matrix2DStack:
+        return self.__mul__(other)
+
+    def __truediv__(self, other) -> Matrix2DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Matrix2DStack(self._data / other)
+
+    def __itruediv__(self, other) -> Matrix2DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data /= other
+        return self
+
+    def __matmul__(
+        self, other: Matrix2DStack | Matrix2D | XyArray | Xy
+    ) -> Matrix2DStack | XyArray:
+        # Against coordinates, matrix k is applied to row k (or every matrix
+        # to the same Xy).
+        if isinstance(other, (XyArray, Xy)):
+            xy = np.broadcast_to(_xy_operand(other), (len(self), 2))
+            return XyArray(np.einsum("kij,kj->ki", self._data, xy))
+        other = self._operand(other)
+        if other is NotImplemented or isinstance(other, (int, float, np.number)):
+            return NotImplemented
+        return Matrix2DStack(np.matmul(self._data, other))
+
+    def __rmatmul__(self, other: Matrix2D) -> Matrix2DStack:
+        if isinstance(other, Matrix2D):
+            return Matrix2DStack(np.matmul(self._operand(other), self._data))
+        return NotImplemented
+
+    def __imatmul__(self, other: Matrix2DStack | Matrix2D) -> Matrix2DStack:
+        if isinstance(other, (Matrix2DStack, Matrix2D)):
+            self._data[...] = np.matmul(self._data, self._operand(other))
+            return self
+        return NotImplemented
+
+    def __pow__(self, power: int) -> Matrix2DStack:
+        return Matrix2DStack(np.linalg.matrix_power(self._data, power))
+
+    def __ipow__(self, power: int) -> Matrix2DStack:
+        self._data[...] = np.linalg.matrix_power(self._data, power)
+        return self
+
+    def transpose(self) -> Matrix2DStack:
+        self._data[...] = self._data.transpose(0, 2, 1).copy()
+        return self
+
+    def invert(self) -> Matrix2DStack:
+        det = self.determinant
+        if np.any(np.abs(det) < sys.float_info.epsilon):
+            raise ValueError("Matrix is singular and cannot be inverted.")
+        a = self._data
+        inv = np.empty_like(a)
+        inv[:, 0, 0] = a[:, 1, 1]
+        inv[:, 0, 1] = -a[:, 0, 1]
+        inv[:, 1, 0] = -a[:, 1, 0]
+        inv[:, 1, 1] = a[:, 0, 0]
+        inv /= det[:, None, None]
+        self._data[...] = inv
+        return self
+
+
+def _xy_operand(value) -> np.ndarray:
+    if isinstance(value, XyArray):
+        return value.data
+    if isinstance(value, Xy):
+        return np.array(value.to_tuple(), dtype=np.float64)
+    return np.asarray(value, dtype=np.float64)
@@ -1,31 +1,110 @@
 from __future__ import annotations
 
 import sys
+import math
 import numpy as np
 
 from ._Xyz import Xyz
 
 
+# A 3x3 matrix stored as nine scalar floats.
+# Products, transpose, determinant and inverse are written out by hand, which
+# is much cheaper than going through NumPy for such a small matrix.
+# The ndarray is only built when <data> is requested: modifying the returned
+# array does not modify the matrix, assign <data> instead.
 class Matrix3D:
-    _data: np.ndarray
+    __slots__ = (
+        "_a11",
+        "_a12",
+        "_a13",
+        "_a21",
+        "_a22",
+        "_a23",
+        "_a31",
+        "_a32",
+        "_a33",
+    )
+
+    _a11: float
+    _a12: float
+    _a13: float
+    _a21: float
+    _a22: float
+    _a23: float
+    _a31: float
+    _a32: float
+    _a33: float
+
+    def __init__(self, data=None):
+        if data is None:
+            self.set_identity()
+        else:
+            self.data = data
+
+    @staticmethod
+    def from_values(
+        a11: float,
+        a12: float,
+        a13: float,
+        a21: float,
+        a22: float,
+        a23: float,
+        a31: float,
+        a32: float,
+        a33: float,
+    ) -> Matrix3D:
+        m = Matrix3D.__new__(Matrix3D)
+        m._set_values(a11, a12, a13, a21, a22, a23, a31, a32, a33)
+        return m
+
+    def _values(self) -> tuple[float, ...]:
+        return (
+            self._a11,
+            self._a12,
+            self._a13,
+            self._a21,
+            self._a22,
+            self._a23,
+            self._a31,
+            self._a32,
+            self._a33,
+        )
 
-    def __init__(self, data=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]):
-        self._data = np.array(data, dtype=float)
+    def _set_values(
+        self,
+        a11: float,
+        a12: float,
+        a13: float,
+        a21: float,
+        a22: float,
+        a23: float,
+        a31: float,
+        a32: float,
+        a33: float,
+    ) -> None:
+        self._a11, self._a12, self._a13 = a11, a12, a13
+        self._a21, self._a22, self._a23 = a21, a22, a23
+        self._a31, self._a32, self._a33 = a31, a32, a33
 
     def __str__(self) -> str:
-        return f"Matrix3D(data={self._data.tolist()})"
+        return f"Matrix3D(data={self.to_list()})"
 
     @property
     def data(self) -> np.ndarray:
-        return self._data
+        return np.array(self.to_list())
 
     @data.setter
-    def data(self, value: np.ndarray) -> None:
-        self._data = value
+    def data(self, value) -> None:
+        rows = np.asarray(value, dtype=float).tolist()
+        self._set_values(*rows[0], *rows[1], *rows[2])
 
     @property
     def determinant(self) -> float:
-        return np.linalg.det(self._data)
+        return (
+            self._a11 * (self._a22 * self._a33 - self._a23 * self._a32)
+            - self._a12 * (self._a21 * self._a33 - self._a23 * self._a31)
+            + self._a13 * (self._a21 * self._a32 - self._a22 * self._a31)
+        )
 
     def is_singular(self) -> bool:
         if abs(self.determinant) < sys.float_info.epsilon:
@@ -33,64 +112,91 @@ class Matrix3D:
         return False
 
     def copy(self) -> Matrix3D:
-        return Matrix3D(self._data.copy())
+        m = Matrix3D.__new__(Matrix3D)
+        m._a11, m._a12, m._a13 = self._a11, self._a12, self._a13
+        m._a21, m._a22, m._a23 = self._a21, self._a22, self._a23
+        m._a31, m._a32, m._a33 = self._a31, self._a32, self._a33
+        return m
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Matrix3D):
             return NotImplemented
-        return np.array_equal(self._data, other._data)
+        return self._values() == other._values()
 
     def get_col(self, index: int) -> np.ndarray:
-        return self._data[:, index]
+        if not 0 <= index < 3:
+            raise IndexError("Index out of range for Matrix3D object")
+        return np.array(self._values()[index::3])
 
     def get_row(self, index: int) -> np.ndarray:
-        return self._data[index, :]
+        if not 0 <= index < 3:
+            raise IndexError("Index out of range for Matrix3D object")
+        return np.array(self._values()[3 * index : 3 * index + 3])
 
-    def set_col(self, index: int, value: np.ndarray) -> None:
-        self._data[:, index] = value
+    def set_col(self, index: int, value) -> None:
+        for i in range(3):
+            self[i, index] = float(value[i])
 
-    def set_row(self, index: int, value: np.ndarray) -> None:
-        self._data[index, :] = value
+    def set_row(self, index: int, value) -> None:
+        for j in range(3):
+            self[index, j] = float(value[j])
 
     def get_diagonal(self) -> np.ndarray:
-        return np.diagonal(self._data)
+        return np.array([self._a11, self._a22, self._a33])
 
-    def set_diagonal(self, value: np.ndarray) -> None:
-        np.fill_diagonal(self._data, value)
+    def set_diagonal(self, value) -> None:
+        if isinstance(value, (int, float)):
+            self._a11 = self._a22 = self._a33 = float(value)
+        else:
+            self._a11, self._a22, self._a33 = (
+                float(value[0]),
+                float(value[1]),
+                float(value[2]),
+            )
 
     def set_identity(self) -> None:
-        self._data = np.identity(3)
+        self._set_values(1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)
 
     def set_cross(self, xyz: Xyz):
         x, y, z = xyz.x, xyz.y, xyz.z
-        self._data = np.array([[0.0, -z, y], [z, 0.0, -x], [-y, x, 0.0]], dtype=float)
+        self._set_values(0.0, -z, y, z, 0.0, -x, -y, x, 0.0)
 
     def set_scale(self, factor: float) -> None:
-        self._data = np.array(
-            [[factor, 0.0, 0.0], [0.0, factor, 0.0], [0.0, 0.0, factor]], dtype=float
-        )
+        self._set_values(factor, 0.0, 0.0, 0.0, factor, 0.0, 0.0, 0.0, factor)
 
     def set_dot(self, xyz: Xyz):
         x, y, z = xyz.x, xyz.y, xyz.z
-        self._data = np.array(
-            [[x**2, x * y, x * z], [x * y, y**2, y * z], [x * z, y * z, z**2]],
-            dtype=float,
-        )
+        xy, xz, yz = x * y, x * z, y * z
+        self._set_values(x * x, xy, xz, xy, y * y, yz, xz, yz, z * z)
 
-    def __getitem__(self, index: tuple[int, int]) -> float:
-        return self._data[index]
+    def __getitem__(self, index: tuple[int, int] | int) -> float | np.ndarray:
+        if isinstance(index, tuple):
+            i, j = index
+            if not (0 <= i < 3 and 0 <= j < 3):
+                raise IndexError("Index out of range for Matrix3D object")
+            return getattr(self, self.__slots__[3 * i + j])
+        return self.get_row(index)
 
     def __setitem__(self, index: tuple[int, int], value: float) -> None:
-        self._data[index] = value
+        i, j = index
+        if not (0 <= i < 3 and 0 <= j < 3):
+            raise IndexError("Index out of range for Matrix3D object")
+        setattr(self, self.__slots__[3 * i + j], value)
 
     def to_list(self) -> list[list[float]]:
-        return self._data.tolist()
+        return [
+            [self._a11, self._a12, self._a13],
+            [self._a21, self._a22, self._a23],
+            [self._a31, self._a32, self._a33],
+        ]
 
     def __add__(self, other: Matrix3D | int | float) -> Matrix3D:
         if isinstance(other, Matrix3D):
-            return Matrix3D(self._data + other._data)
+            return Matrix3D.from_values(
+                *[a + b for a, b in zip(self._values(), other._values())]
+            )
         elif isinstance(other, (int, float)):
-            return Matrix3D(self._data + other)
+            return Matrix3D.from_values(*[a + other for a in self._values()])
         else:
             return NotImplemented
 
@@ -99,118 +205,181 @@ class Matrix3D:
 
     def __iadd__(self, other: Matrix3D | int | float) -> Matrix3D:
         if isinstance(other, Matrix3D):
-            self._data += other._data
+            self._set_values(*[a + b for a, b in zip(self._values(), other._values())])
         elif isinstance(other, (int, float)):
-            self._data += other
+            self._set_values(*[a + other for a in self._values()])
         else:
             return NotImplemented
         return self
 
     def __sub__(self, other: Matrix3D | int | float) -> Matrix3D:
         if isinstance(other, Matrix3D):
-            return Matrix3D(self._data - other._data)
+            return Matrix3D.from_values(
+                *[a - b for a, b in zip(self._values(), other._values())]
+            )
         elif isinstance(other, (int, float)):
-            return Matrix3D(self._data - other)
+            return Matrix3D.from_values(*[a - other for a in self._values()])
         else:
             return NotImplemented
 
     def __rsub__(self, other: int | float) -> Matrix3D:
         if isinstance(other, (int, float)):
-            return Matrix3D(other - self._data)
+            return Matrix3D.from_values(*[other - a for a in self._values()])
         else:
             return NotImplemented
 
     def __isub__(self, other: Matrix3D | int | float) -> Matrix3D:
         if isinstance(other, Matrix3D):
-            self._data -= other._data
+            self._set_values(*[a - b for a, b in zip(self._values(), other._values())])
         elif isinstance(other, (int, float)):
-            self._data -= other
+            self._set_values(*[a - other for a in self._values()])
         else:
             return NotImplemented
         return self
 
     def __mul__(self, other: Matrix3D | int | float) -> Matrix3D:
         if isinstance(other, Matrix3D):
-            return Matrix3D(self._data * other._data)
+            return Matrix3D.from_values(
+                *[a * b for a, b in zip(self._values(), other._values())]
+            )
         elif isinstance(other, (int, float)):
-            return Matrix3D(self._data * other)
+            return Matrix3D.from_values(*[a * other for a in self._values()])
         else:
             return NotImplemented
 
     def __rmul__(self, other: int | float) -> Matrix3D:
         if isinstance(other, (int, float)):
-            return Matrix3D(self._data * other)
+            return self.__mul__(other)
         else:
             return NotImplemented
 
     def __imul__(self, other: Matrix3D | int | float) -> Matrix3D:
         if isinstance(other, Matrix3D):
-            self._data *= other._data
+            self._set_values(*[a * b for a, b in zip(self._values(), other._values())])
         elif isinstance(other, (int, float)):
-            self._data *= other
+            self._set_values(*[a * other for a in self._values()])
         else:
             return NotImplemented
         return self
 
-    def __matmul__(self, other: Matrix3D) -> Matrix3D:
+    def _product(self, other: Matrix3D) -> tuple[float, ...]:
+        a11, a12, a13 = self._a11, self._a12, self._a13
+        a21, a22, a23 = self._a21, self._a22, self._a23
+        a31, a32, a33 = self._a31, self._a32, self._a33
+        b11, b12, b13 = other._a11, other._a12, other._a13
+        b21, b22, b23 = other._a21, other._a22, other._a23
+        b31, b32, b33 = other._a31, other._a32, other._a33
+        return (
+            a11 * b11 + a12 * b21 + a13 * b31,
+            a11 * b12 + a12 * b22 + a13 * b32,
+            a11 * b13 + a12 * b23 + a13 * b33,
+            a21 * b11 + a22 * b21 + a23 * b31,
+            a21 * b12 + a22 * b22 + a23 * b32,
+            a21 * b13 + a22 * b23 + a23 * b33,
+            a31 * b11 + a32 * b21 + a33 * b31,
+            a31 * b12 + a32 * b22 + a33 * b32,
+            a31 * b13 + a32 * b23 + a33 * b33,
+        )
+
+    def __matmul__(self, other: Matrix3D | Xyz) -> Matrix3D | Xyz:
         if isinstance(other, Matrix3D):
-            return Matrix3D(np.matmul(self._data, other._data))
+            return Matrix3D.from_values(*self._product(other))
+        elif isinstance(other, Xyz):
+            x, y, z = other.x, other.y, other.z
+            return Xyz(
+                self._a11 * x + self._a12 * y + self._a13 * z,
+                self._a21 * x + self._a22 * y + self._a23 * z,
+                self._a31 * x + self._a32 * y + self._a33 * z,
+            )
         else:
             return NotImplemented
 
     def __imatmul__(self, other: Matrix3D) -> Matrix3D:
         if isinstance(other, Matrix3D):
-            self._data = np.matmul(self._data, other._data)
+            self._set_values(*self._product(other))
             return self
         else:
             return NotImplemented
 
     def __truediv__(self, other: Matrix3D | int | float) -> Matrix3D:
         if isinstance(other, Matrix3D):
-            return Matrix3D(self._data / other._data)
+            return Matrix3D.from_values(
+                *[a / b for a, b in zip(self._values(), other._values())]
+            )
         elif isinstance(other, (int, float)):
-            return Matrix3D(self._data / other)
+            return Matrix3D.from_values(*[a / other for a in self._values()])
         else:
             return NotImplemented
 
     def __itruediv__(self, other: Matrix3D | int | float) -> Matrix3D:
         if isinstance(other, Matrix3D):
-            self._data /= other._data
+            self._set_values(*[a / b for a, b in zip(self._values(), other._values())])
         elif isinstance(other, (int, float)):
-            self._data /= other
+            self._set_values(*[a / other for a in self._values()])
         else:
             return NotImplemented
         return self
 
     def __rtruediv__(self, other: int | float) -> Matrix3D:
         if isinstance(other, (int, float)):
-            return Matrix3D(other / self._data)
+            return Matrix3D.from_values(*[other / a for a in self._values()])
         else:
             return NotImplemented
 
     def __pow__(self, power: int) -> Matrix3D:
-        return Matrix3D(np.linalg.matrix_power(self._data, power))
+        result = self.copy()
+        result.__ipow__(power)
+        return result
 
     def __ipow__(self, power: int) -> Matrix3D:
-        self._data = np.linalg.matrix_power(self._data, power)
+        if power < 0:
+            self.invert()
+            power = -power
+        base = self.copy()
+        self.set_identity()
+        while power > 0:
+            if power % 2 == 1:
+                self._set_values(*self._product(base))
+            base._set_values(*base._product(base))
+            power //= 2
         return self
 
     def transpose(self) -> Matrix3D:
-        self._data = self._data.T
+        self._a12, self._a21 = self._a21, self._a12
+        self._a13, self._a31 = self._a31, self._a13
+        self._a23, self._a32 = self._a32, self._a23
         return self
 
     def invert(self) -> Matrix3D:
-        if self.is_singular():
+        a11, a12, a13 = self._a11, self._a12, self._a13
+        a21, a22, a23 = self._a21, self._a22, self._a23
+        a31, a32, a33 = self._a31, self._a32, self._a33
+        c11 = a22 * a33 - a23 * a32
+        c12 = a23 * a31 - a21 * a33
+        c13 = a21 * a32 - a22 * a31
+        det = a11 * c11 + a12 * c12 + a13 * c13
+        if abs(det) < sys.float_info.epsilon:
             raise ValueError("Cannot invert a singular matrix.")
-        self._data = np.linalg.inv(self._data)
+        inv = 1.0 / det
+        self._set_values(
+            c11 * inv,
+            (a13 * a32 - a12 * a33) * inv,
+            (a12 * a23 - a13 * a22) * inv,
+            c12 * inv,
+            (a11 * a33 - a13 * a31) * inv,
+            (a13 * a21 - a11 * a23) * inv,
+            c13 * inv,
+            (a12 * a31 - a11 * a32) * inv,
+            (a11 * a22 - a12 * a21) * inv,
+        )
         return self
 
     def set_rotation(self, axis: Xyz, angle: float) -> None:
         av = axis.copy().normalize()
         a, b, c = av.x, av.y, av.z
 
-        acos = np.cos(angle)
-        asin = np.sin(angle)
+        acos = math.cos(angle)
+        asin = math.sin(angle)
         aomcos = 1.0 - acos
 
         a2 = a * a
@@ -220,23 +389,14 @@ class Matrix3D:
         bc = b * c
         ac = c * a
 
-        self._data = np.array(
-            [
-                [
-                    1.0 + aomcos * (-(b2 + c2)),
-                    aomcos * ab - c * asin,
-                    aomcos * ac + b * asin,
-                ],
-                [
-                    aomcos * ab + c * asin,
-                    1.0 + aomcos * (-(a2 + c2)),
-                    aomcos * bc - a * asin,
-                ],
-                [
-                    aomcos * ac - b * asin,
-                    aomcos * bc + a * asin,
-                    1.0 + aomcos * (-(a2 + b2)),
-                ],
-            ],
-            dtype=float,
+        self._set_values(
+            1.0 + aomcos * (-(b2 + c2)),
+            aomcos * ab - c * asin,
+            aomcos * ac + b * asin,
+            aomcos * ab + c * asin,
+            1.0 + aomcos * (-(a2 + c2)),
+            aomcos * bc - a * asin,
+            aomcos * ac - b * asin,
+            aomcos * bc + a * asin,
+            1.0 + aomcos * (-(a2 + b2)),
         )
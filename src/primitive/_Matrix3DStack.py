@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import sys
+import numpy as np
+
+from ..config import TOLERANCE
+from ._Xyz import Xyz
+from ._XyzArray import XyzArray
+from ._Matrix3D import Matrix3D
+
+
+# Structure-of-arrays counterpart of Matrix3D.
+# K matrices are stored in a single (K, 3, 3) float64 buffer and every
+# operation of Matrix3D is applied to all of them at once.
+# Operands may be another Matrix3DStack (matrix by matrix), a single Matrix3D
+# (broadcast to every matrix), a scalar, or a 1D ndarray of length K (one
+# scalar per matrix).
+# Integer indexing returns a Matrix3D copy, slicing returns a Matrix3DStack
+# sharing memory with the buffer, which the in-place operators, transpose()
+# and invert() write through.
+# The set_* methods resize the stack to the number of inputs they are given.
+class Matrix3DStack:
+    _data: np.ndarray
+
+    __array_ufunc__ = None
+
+    def __init__(self, data=()) -> None:
+        data = np.asarray(data, dtype=np.float64)
+        if data.size == 0:
+            data = data.reshape(0, 3, 3)
+        if data.ndim != 3 or data.shape[1:] != (3, 3):
+            raise ValueError("Matrix3DStack data must have shape (K, 3, 3)")
+        self._data = data
+
+    @staticmethod
+    def identity(k: int) -> Matrix3DStack:
+        return Matrix3DStack(np.broadcast_to(np.eye(3), (k, 3, 3)).copy())
+
+    @staticmethod
+    def zeros(k: int) -> Matrix3DStack:
+        return Matrix3DStack(np.zeros((k, 3, 3), dtype=np.float64))
+
+    @staticmethod
+    def from_matrix_list(matrices: list[Matrix3D]) -> Matrix3DStack:
+        return Matrix3DStack([m.to_list() for m in matrices])
+
+    def __str__(self) -> str:
+        return f"Matrix3DStack({self._data})"
+
+    def __len__(self) -> int:
+        return self._data.shape[0]
+
+    def __iter__(self):
+        for m in self._data.tolist():
+            yield Matrix3D.from_values(*m[0], *m[1], *m[2])
+
+    def __getitem__(self, index) -> Matrix3D | Matrix3DStack:
+        if isinstance(index, (int, np.integer)):
+            m = self._data[index].tolist()
+            return Matrix3D.from_values(*m[0], *m[1], *m[2])
+        return Matrix3DStack(self._data[index])
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(value, Matrix3D):
+            self._data[index] = value.to_list()
+        elif isinstance(value, Matrix3DStack):
+            self._data[index] = value._data
+        else:
+            self._data[index] = value
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+    @data.setter
+    def data(self, value: np.ndarray) -> None:
+        self._data = value
+
+    @property
+    def determinant(self) -> np.ndarray:
+        a = self._data
+        return (
+            a[:, 0, 0] * (a[:, 1, 1] * a[:, 2, 2] - a[:, 1, 2] * a[:, 2, 1])
+            - a[:, 0, 1] * (a[:, 1, 0] * a[:, 2, 2] - a[:, 1, 2] * a[:, 2, 0])
+            + a[:, 0, 2] * (a[:, 1, 0] * a[:, 2, 1] - a[:, 1, 1] * a[:, 2, 0])
+        )
+
+    def is_singular(self) -> np.ndarray:
+        return np.abs(self.determinant) < sys.float_info.epsilon
+
+    def copy(self) -> Matrix3DStack:
+        return Matrix3DStack(self._data.copy())
+
+    def to_list(self) -> list[list[list[float]]]:
+        return self._data.tolist()
+
+    def to_matrix_list(self) -> list[Matrix3D]:
+        return list(self)
+
+    def get_col(self, index: int) -> XyzArray:
+        return XyzArray(self._data[:, :, index])
+
+    def get_row(self, index: int) -> XyzArray:
+        return XyzArray(self._data[:, index, :])
+
+    def set_col(self, index: int, value: XyzArray | Xyz | np.ndarray) -> None:
+        self._data[:, :, index] = _xyz_operand(value)
+
+    def set_row(self, index: int, value: XyzArray | Xyz | np.ndarray) -> None:
+        self._data[:, index, :] = _xyz_operand(value)
+
+    def get_diagonal(self) -> XyzArray:
+        return XyzArray(np.diagonal(self._data, axis1=1, axis2=2).copy())
+
+    def set_diagonal(self, value) -> None:
+        if isinstance(value, (int, float, np.number)):
+            value = np.full(3, float(value))
+        idx = np.arange(3)
+        self._data[:, idx, idx] = _xyz_operand(value)
+
+    def set_identity(self) -> None:
+        self._data[...] = np.eye(3)
+
+    def set_cross(self, xyzs: XyzArray | np.ndarray) -> None:
+        v = _xyz_operand(xyzs).reshape(-1, 3)
+        data = np.zeros((v.shape[0], 3, 3), dtype=np.float64)
+        x, y, z = v[:, 0], v[:, 1], v[:, 2]
+        data[:, 0, 1] = -z
+        data[:, 0, 2] = y
+        data[:, 1, 0] = z
+        data[:, 1, 2] = -x
+        data[:, 2, 0] = -y
+        data[:, 2, 1] = x
+        self._data = data
+
+    def set_scale(self, factors) -> None:
+        factors = np.asarray(factors, dtype=np.float64)
+        if factors.ndim == 0:
+            factors = np.full(len(self), float(factors))
+        self._data = np.eye(3) * factors[:, None, None]
+
+    def set_dot(self, xyzs: XyzArray | np.ndarray) -> None:
+        v = _xyz_operand(xyzs).reshape(-1, 3)
+        self._data = v[:, :, None] * v[:, None, :]
+
+    def set_rotation(self, axes: XyzArray | np.ndarray, angles) -> None:
+        # Rodrigues' formula, one rotation per (axis, angle) pair.
+        v = _xyz_operand(axes).reshape(-1, 3)
+        mod = np.sqrt(np.einsum("ij,ij->i", v, v))
+        if np.any(mod <= TOLERANCE):
+            raise ValueError("Cannot normalize a zero vector")
+        v = v / mod[:, None]
+        angles = np.broadcast_to(np.asarray(angles, dtype=np.float64), mod.shape)
+        acos = np.cos(angles)
+        asin = np.sin(angles)
+        aomcos = 1.0 - acos
+
+        # R = cos * I + (1 - cos) * a a^T + sin * [a]x
+        data = aomcos[:, None, None] * (v[:, :, None] * v[:, None, :])
+        idx = np.arange(3)
+        data[:, idx, idx] += acos[:, None]
+        a, b, c = v[:, 0] * asin, v[:, 1] * asin, v[:, 2] * asin
+        data[:, 0, 1] -= c
+        data[:, 0, 2] += b
+        data[:, 1, 0] += c
+        data[:, 1, 2] -= a
+        data[:, 2, 0] -= b
+        data[:, 2, 1] += a
+        self._data = data
+
+    def _operand(self, other):
+        if isinstance(other, Matrix3DStack):
+            return other._data
+        if isinstance(other, Matrix3D):
+            return np.array(other.to_list(), dtype=np.float64)
+        if isinstance(other, (int, float, np.number)):
+            return other
+        if isinstance(other, np.ndarray):
+            if other.ndim == 1:
+                return other[:, None, None]
+            return other
+        return NotImplemented
+
+    def __add__(self, other) -> Matrix3DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Matrix3DStack(self._data + other)
+
+    def __iadd__(self, other) -> Matrix3DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data += other
+        return self
+
+    def __radd__(self, other) -> Matrix3DStack:
+        return self.__add__(other)
+
+    def __sub__(self, other) -> Matrix3DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Matrix3DStack(self._data - other)
+
+    def __isub__(self, other) -> Matrix3DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data -= other
+        return self
+
+    def __rsub__(self, other) -> Matrix3DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Matrix3DStack(other - self._data)
+
+    def __mul__(self, other) -> Matrix3DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Matrix3DStack(self._data * other)
+
+    def __imul__(self, other) -> Matrix3DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data *= other
+        return self
+
+    def __rmul__(self, other) -> Matrix3DStack:
+        return self.__mul__(other)
+
+    def __truediv__(self, other) -> Matrix3DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return Matrix3DStack(self._data / other)
+
+    def __itruediv__(self, other) -> Matrix3DStack:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data /= other
+        return self
+
+    def __matmul__(
+        self, other: Matrix3DStack | Matrix3D | XyzArray | Xyz
+    ) -> Matrix3DStack | XyzArray:
+        # Against coordinates, matrix k is applied to row k (or every matrix
+        # to the same Xyz).
+        if isinstance(other, (XyzArray, Xyz)):
+            xyz = np.broadcast_to(_xyz_operand(other), (len(self), 3))
+            return XyzArray(np.einsum("kij,kj->ki", self._data, xyz))
+        other = self._operand(other)
+        if other is NotImplemented or isinstance(other, (int, float, np.number)):
+            return NotImplemented
+        return Matrix3DStack(np.matmul(self._data, other))
+
+    def __rmatmul__(self, other: Matrix3D) -> Matrix3DStack:
+        if isinstance(other, Matrix3D):
+            return Matrix3DStack(np.matmul(self._operand(other), self._data))
+        return NotImplemented
+
+    def __imatmul__(self, other: Matrix3DStack | Matrix3D) -> Matrix3DStack:
+        if isinstance(other, (Matrix3DStack, Matrix3D)):
+            self._data[...] = np.matmul(self._data, self._operand(other))
+            return self
+        return NotImplemented
+
+    def __pow__(self, power: int) -> Matrix3DStack:
+        return Matrix3DStack(np.linalg.matrix_power(self._data, power))
+
+    def __ipow__(self, power: int) -> Matrix3DStack:
+        self._data[...] = np.linalg.matrix_power(self._data, power)
+        return self
+
+    def transpose(self) -> Matrix3DStack:
+        self._data[...] = self._data.transpose(0, 2, 1).copy()
+        return self
+
+    def invert(self) -> Matrix3DStack:
+        det = self.determinant
+        if np.any(np.abs(det) < sys.float_info.epsilon):
+            raise ValueError("Cannot invert a singular matrix.")
+        a = self._data
+        inv = np.empty_like(a)
+        # Adjugate: inv[j, i] = cofactor(i, j) / det
+        for i in range(3):
+            i1, i2 = (i + 1) % 3, (i + 2) % 3
+            for j in range(3):
+                j1, j2 = (j + 1) % 3, (j + 2) % 3
+                inv[:, j, i] = a[:, i1, j1] * a[:, i2, j2] - a[:, i1, j2] * a[:, i2, j1]
+        inv /= det[:, None, None]
+        self._data[...] = inv
+        return self
+
+
+def _xyz_operand(value) -> np.ndarray:
+    if isinstance(value, XyzArray):
+        return value.data
+    if isinstance(value, Xyz):
+        return np.array(value.to_tuple(), dtype=np.float64)
+    return np.asarray(value, dtype=np.float64)
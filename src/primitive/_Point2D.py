@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -11,7 +12,11 @@ from ..config import FLOAT_PRINT_PRECISION
 from ._Xy import Xy
 
 
+# Memory budget (CPython 3.11, 64-bit): 40 bytes for the Point2D, 48 for its
+# Xy and 24 per float coordinate, 136 bytes in all.
 class Point2D:
+    __slots__ = ("_coord",)
+
     _coord: Xy
 
     def __init__(self, x: float = 0.0, y: float = 0.0) -> None:
@@ -47,6 +52,10 @@ class Point2D:
     def copy(self) -> Point2D:
         return Point2D(self._coord.x, self._coord.y)
 
+    def _assign(self, other: Point2D) -> None:
+        self._coord.x = other._coord.x
+        self._coord.y = other._coord.y
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Point2D):
             return NotImplemented
@@ -67,38 +76,40 @@ class Point2D:
         return (dx**2 + dy**2) ** 0.5
 
     def mirror_by_point(self, point: Point2D) -> Point2D:
-        self._coord.reverse()
-        self._coord += point._coord * 2
+        self._coord.x = 2.0 * point._coord.x - self._coord.x
+        self._coord.y = 2.0 * point._coord.y - self._coord.y
         return self
 
     def mirror_by_ax2d(self, ax2d: Ax2D) -> Point2D:
-        from ._Trsf2D import Trsf2D
-
-        trsf = Trsf2D()
-        trsf.set_ax2d_mirror(ax2d)
-        trsf.transforms(self._coord)
+        # P' = L + 2 * ((P - L) . D) * D - (P - L)
+        lx, ly = ax2d.loc.x, ax2d.loc.y
+        dx, dy = ax2d.dir.x, ax2d.dir.y
+        vx, vy = self._coord.x - lx, self._coord.y - ly
+        d = 2.0 * (vx * dx + vy * dy)
+        self._coord.x = lx + d * dx - vx
+        self._coord.y = ly + d * dy - vy
         return self
 
     def scale(self, point: Point2D, factor: float) -> Point2D:
-        coord = point._coord.copy()
-        coord *= 1 - factor
-        self._coord *= factor
-        self._coord += coord
+        px, py = point._coord.x, point._coord.y
+        self._coord.x = px + factor * (self._coord.x - px)
+        self._coord.y = py + factor * (self._coord.y - py)
         return self
 
     def rotate(self, point: Point2D, angle: float) -> Point2D:
-        from ._Trsf2D import Trsf2D
-
-        trsf = Trsf2D()
-        trsf.set_rotation(point, angle)
-        trsf.transforms(self._coord)
+        c = math.cos(angle)
+        s = math.sin(angle)
+        px, py = point._coord.x, point._coord.y
+        dx, dy = self._coord.x - px, self._coord.y - py
+        self._coord.x = px + c * dx - s * dy
+        self._coord.y = py + s * dx + c * dy
         return self
 
     def transform(self, trsf2d: Trsf2D):
         from ._TrsfForm import TrsfForm
 
         if trsf2d.trsf_form == TrsfForm.IDENTITY:
-            return
+            return self
         elif trsf2d.trsf_form == TrsfForm.TRANSLATION:
             self._coord += trsf2d.loc
         elif trsf2d.trsf_form == TrsfForm.SCALE:
@@ -119,3 +130,23 @@ class Point2D:
         self._coord += p2._coord
         self._coord -= p1._coord
         return self
+
+    def mirror_by_point_into(self, point: Point2D, out: Point2D) -> Point2D:
+        out._assign(self)
+        return out.mirror_by_point(point)
+
+    def mirror_by_ax2d_into(self, ax2d: Ax2D, out: Point2D) -> Point2D:
+        out._assign(self)
+        return out.mirror_by_ax2d(ax2d)
+
+    def scale_into(self, point: Point2D, factor: float, out: Point2D) -> Point2D:
+        out._assign(self)
+        return out.scale(point, factor)
+
+    def rotate_into(self, point: Point2D, angle: float, out: Point2D) -> Point2D:
+        out._assign(self)
+        return out.rotate(point, angle)
+
+    def transform_into(self, trsf2d: Trsf2D, out: Point2D) -> Point2D:
+        out._assign(self)
+        return out.transform(trsf2d)
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import math
+
 from ._Xyz import Xyz
 
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from ._Ax3D import Ax3D
+    from ._RAx23D import RAx23D
     from ._Trsf3D import Trsf3D
+    from ._Vec3D import Vec3D
 
 
+# Memory budget (CPython 3.11, 64-bit): 40 bytes for the Point3D, 56 for its
+# Xyz and 24 per float coordinate, 168 bytes in all.
 class Point3D:
+    __slots__ = ("_coord",)
+
     _coord: Xyz
 
     def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0) -> None:
@@ -52,6 +61,11 @@ class Point3D:
     def copy(self) -> Point3D:
         return Point3D(self._coord.x, self._coord.y, self._coord.z)
 
+    def _assign(self, other: Point3D) -> None:
+        self._coord.x = other._coord.x
+        self._coord.y = other._coord.y
+        self._coord.z = other._coord.z
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Point3D):
             return NotImplemented
@@ -73,31 +87,90 @@ class Point3D:
         return (dx**2 + dy**2 + dz**2) ** 0.5
 
     def mirror_by_point(self, point: Point3D) -> Point3D:
-        self._coord.reverse()
-        self._coord += point._coord * 2
+        self._coord.x = 2.0 * point._coord.x - self._coord.x
+        self._coord.y = 2.0 * point._coord.y - self._coord.y
+        self._coord.z = 2.0 * point._coord.z - self._coord.z
+        return self
+
+    def mirror_by_ax3d(self, ax3d: Ax3D) -> Point3D:
+        # P' = L + 2 * ((P - L) . D) * D - (P - L)
+        lx, ly, lz = ax3d.loc.x, ax3d.loc.y, ax3d.loc.z
+        dx, dy, dz = ax3d.dir.x, ax3d.dir.y, ax3d.dir.z
+        vx, vy, vz = self._coord.x - lx, self._coord.y - ly, self._coord.z - lz
+        d = 2.0 * (vx * dx + vy * dy + vz * dz)
+        self._coord.x = lx + d * dx - vx
+        self._coord.y = ly + d * dy - vy
+        self._coord.z = lz + d * dz - vz
         return self
 
-    def mirror_by_ax3d(self):
-        raise NotImplementedError
-    
-    def mirror_by_rax23d(self):
-        raise NotImplementedError
+    def mirror_by_rax23d(self, rax23d: RAx23D) -> Point3D:
+        # Mirror through the plane (L, N): P' = P - 2 * ((P - L) . N) * N
+        loc = rax23d.loc
+        nx, ny, nz = rax23d.dir.x, rax23d.dir.y, rax23d.dir.z
+        d = 2.0 * (
+            (self._coord.x - loc.x) * nx
+            + (self._coord.y - loc.y) * ny
+            + (self._coord.z - loc.z) * nz
+        )
+        self._coord.x -= d * nx
+        self._coord.y -= d * ny
+        self._coord.z -= d * nz
+        return self
 
     def scale(self, point: Point3D, factor: float) -> Point3D:
-        coord = point._coord.copy()
-        coord *= 1 - factor
-        self._coord *= factor
-        self._coord += coord
+        px, py, pz = point._coord.x, point._coord.y, point._coord.z
+        self._coord.x = px + factor * (self._coord.x - px)
+        self._coord.y = py + factor * (self._coord.y - py)
+        self._coord.z = pz + factor * (self._coord.z - pz)
+        return self
+
+    def rotate(self, ax3d: Ax3D, angle: float) -> Point3D:
+        # Rodrigues' formula around the axis (L, D):
+        # V' = V * cos + (D ^ V) * sin + D * (D . V) * (1 - cos)
+        c = math.cos(angle)
+        s = math.sin(angle)
+        lx, ly, lz = ax3d.loc.x, ax3d.loc.y, ax3d.loc.z
+        dx, dy, dz = ax3d.dir.x, ax3d.dir.y, ax3d.dir.z
+        vx, vy, vz = self._coord.x - lx, self._coord.y - ly, self._coord.z - lz
+        k = (dx * vx + dy * vy + dz * vz) * (1.0 - c)
+        self._coord.x = lx + vx * c + (dy * vz - dz * vy) * s + dx * k
+        self._coord.y = ly + vy * c + (dz * vx - dx * vz) * s + dy * k
+        self._coord.z = lz + vz * c + (dx * vy - dy * vx) * s + dz * k
         return self
 
-    def rotate(self, point: Point3D, angle: float) -> Point3D:
-        raise NotImplementedError("rotate method is not implemented yet.")
+    def transform(self, trsf3d: Trsf3D) -> Point3D:
+        trsf3d.transforms(self._coord)
+        return self
+
+    def translate_by_vec(self, vec: Vec3D) -> Point3D:
+        self._coord += vec.coord
+        return self
+
+    def translate_by_2points(self, p1: Point3D, p2: Point3D) -> Point3D:
+        self._coord += p2._coord
+        self._coord -= p1._coord
+        return self
+
+    def mirror_by_point_into(self, point: Point3D, out: Point3D) -> Point3D:
+        out._assign(self)
+        return out.mirror_by_point(point)
+
+    def mirror_by_ax3d_into(self, ax3d: Ax3D, out: Point3D) -> Point3D:
+        out._assign(self)
+        return out.mirror_by_ax3d(ax3d)
+
+    def mirror_by_rax23d_into(self, rax23d: RAx23D, out: Point3D) -> Point3D:
+        out._assign(self)
+        return out.mirror_by_rax23d(rax23d)
 
-    def transform(self) -> Point3D:
-        raise NotImplementedError("transform method is not implemented yet.")
+    def scale_into(self, point: Point3D, factor: float, out: Point3D) -> Point3D:
+        out._assign(self)
+        return out.scale(point, factor)
 
-    def translate_by_vec(self):
-        raise NotImplementedError("translate_by_vec method is not implemented yet.")
+    def rotate_into(self, ax3d: Ax3D, angle: float, out: Point3D) -> Point3D:
+        out._assign(self)
+        return out.rotate(ax3d, angle)
 
-    def translate_by_2points(self):
-        raise NotImplementedError("translate_by_2point method is not implemented yet.")
+    def transform_into(self, trsf3d: Trsf3D, out: Point3D) -> Point3D:
+        out._assign(self)
+        return out.transform(trsf3d)
@@ -3,6 +3,8 @@ from __future__ import annotations
 import sys
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 if TYPE_CHECKING:
     from ._Ax2D import Ax2D
     from ._Point2D import Point2D
@@ -11,6 +13,7 @@ if TYPE_CHECKING:
 from ..config import FLOAT_PRINT_PRECISION
 from ._TrsfForm import TrsfForm
 from ._Xy import Xy
+from ._XyArray import XyArray
 from ._Matrix2D import Matrix2D
 
 
@@ -40,13 +43,13 @@ class Trsf2D:
         self,
         scale: float = 1.0,
         trsf_form: TrsfForm = TrsfForm.IDENTITY,
-        matrix: Matrix2D = Matrix2D(),
-        loc: Xy = Xy(0.0, 0.0),
+        matrix: Matrix2D | None = None,
+        loc: Xy | None = None,
     ) -> None:
         self._scale = scale
         self._trsf_form = trsf_form
-        self._matrix = matrix
-        self._loc = loc
+        self._matrix = Matrix2D() if matrix is None else matrix
+        self._loc = Xy(0.0, 0.0) if loc is None else loc
 
     def __str__(self):
         return (
@@ -192,8 +195,8 @@ class Trsf2D:
         self._matrix[0, 1] = -2.0 * vx * vy
         self._matrix[1, 1] = 1.0 - 2.0 * vy * vy
 
-        self._loc.x = -2.0 * ((vx * vy - 1.0) * x0 + vx * vy * y0)
-        self._loc.y = -2.0 * (vx * vy * x0 + (vy * vx - 1.0) * y0)
+        self._loc.x = -2.0 * ((vx * vx - 1.0) * x0 + vx * vy * y0)
+        self._loc.y = -2.0 * (vx * vy * x0 + (vy * vy - 1.0) * y0)
 
     def set_rotation(self, point: Point2D, angle: float) -> None:
         self._trsf_form = TrsfForm.ROTATION
@@ -266,7 +269,7 @@ class Trsf2D:
         self._loc.reverse()
 
     def transforms(self, xy: Xy):
-        xy_tmp = self._matrix @ xy_tmp
+        xy_tmp = self._matrix @ xy
         if self._scale != 1.0:
             xy_tmp *= self._scale
         xy_tmp += self._loc
@@ -274,6 +277,53 @@ class Trsf2D:
         xy.y = xy_tmp.y
         return xy
 
+    def transforms_many(
+        self,
+        xys: XyArray | np.ndarray,
+        in_place: bool = False,
+        out: XyArray | np.ndarray | None = None,
+    ) -> XyArray | np.ndarray:
+        # Applies the transformation to N coordinates stored as an (N, 2) array.
+        # The result is written to a new buffer, to <xys> itself when
+        # <in_place> is set, or to <out>. The container type of the input
+        # (XyArray or ndarray) is preserved.
+        if in_place and out is not None:
+            raise ValueError("in_place and out cannot be used together.")
+        is_array = isinstance(xys, XyArray)
+        data = xys.data if is_array else np.asarray(xys, dtype=np.float64)
+        if in_place and data is not xys and not is_array:
+            raise ValueError(
+                "in_place needs an XyArray or a float64 ndarray to write into."
+            )
+        if in_place:
+            res = data
+        elif out is not None:
+            res = out.data if isinstance(out, XyArray) else out
+        else:
+            res = np.empty_like(data)
+
+        loc = self._loc.to_tuple()
+        if self._trsf_form == TrsfForm.IDENTITY:
+            if res is not data:
+                res[...] = data
+        elif self._trsf_form == TrsfForm.TRANSLATION:
+            np.add(data, loc, out=res)
+        elif self._trsf_form in {TrsfForm.SCALE, TrsfForm.PNTMIRROR}:
+            np.multiply(data, self._scale, out=res)
+            res += loc
+        else:
+            m = self._matrix.data
+            if self._scale != 1.0:
+                m = m * self._scale
+            np.matmul(data, m.T, out=res)
+            res += loc
+
+        if in_place:
+            return xys
+        if out is not None:
+            return out
+        return XyArray(res) if is_array else res
+
     def invert(self):
         # X' = scale * R * X + T  =>  X = (R  / scale)  * ( X' - T)
         if self._trsf_form == TrsfForm.IDENTITY:
@@ -527,8 +577,10 @@ class Trsf2D:
                         npower = -n
                     npower -= 1
                     self._matrix.set_diagonal(
-                        self._scale * self._matrix[0, 0],
-                        self._scale * self._matrix[1, 1],
+                        (
+                            self._scale * self._matrix[0, 0],
+                            self._scale * self._matrix[1, 1],
+                        )
                     )
                     tmp_loc = self._loc.copy()
                     tmp_scale = self._scale
@@ -568,8 +620,8 @@ class Trsf2D:
         v2.normalize()
 
         tmp_matrix[0, 0] = v1.x
-        tmp_matrix[0, 1] = v2.x
-        tmp_matrix[1, 0] = v1.y
+        tmp_matrix[0, 1] = v1.y
+        tmp_matrix[1, 0] = v2.x
         tmp_matrix[1, 1] = v2.y
 
         self._matrix = tmp_matrix
\ No newline at end of file
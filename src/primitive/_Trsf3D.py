@@ -3,15 +3,39 @@ from __future__ import annotations
 import sys
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 if TYPE_CHECKING:
+    from ._Ax3D import Ax3D
     from ._Point3D import Point3D
+    from ._RAx23D import RAx23D
+    from ._Vec3D import Vec3D
 
-from ..config import FLOAT_PRINT_PRECISION
+from ..config import FLOAT_PRINT_PRECISION, TOLERANCE
 from ._TrsfForm import TrsfForm
 from ._Xyz import Xyz
+from ._XyzArray import XyzArray
 from ._Matrix3D import Matrix3D
 
 
+# Defines a non-persistent transformation in 3D space.
+# The following transformations are implemented :
+# - Translation, Rotation, Scale
+# - Symmetry with respect to a point, a line, a plane.
+# Complex transformations can be obtained by combining the
+# previous elementary transformations using the method multiply.
+# The transformations can be represented as follow :
+# @code
+#    V1   V2   V3    T       XYZ        XYZ
+# | a11  a12  a13   a14 |   | x |      | x'|
+# | a21  a22  a23   a24 |   | y |      | y'|
+# | a31  a32  a33   a34 |   | z |   =  | z'|
+# |  0    0    0     1  |   | 1 |      | 1 |
+# @endcode
+# where {V1, V2, V3} defines the vectorial part of the transformation
+# and T defines the translation part of the transformation.
+# The vectorial part is stored as scale * matrix, where matrix is always
+# a rotation: orientation reversing transformations have a negative scale.
 class Trsf3D:
     _scale: float
     _trsf_form: TrsfForm
@@ -22,18 +46,18 @@ class Trsf3D:
         self,
         scale: float = 1.0,
         trsf_form: TrsfForm = TrsfForm.IDENTITY,
-        matrix: Matrix3D = Matrix3D(),
-        loc: Xyz = Xyz(0.0, 0.0, 0.0),
+        matrix: Matrix3D | None = None,
+        loc: Xyz | None = None,
     ) -> None:
         self._scale = scale
         self._trsf_form = trsf_form
-        self._matrix = matrix
-        self._loc = loc
+        self._matrix = Matrix3D() if matrix is None else matrix
+        self._loc = Xyz(0.0, 0.0, 0.0) if loc is None else loc
 
     def __str__(self) -> str:
         return (
             f"Trsf3D(scale={self._scale:.{FLOAT_PRINT_PRECISION}f}, "
-            f"trsf_form={self._trsf_form}, "
+            f"trsf_form={self._trsf_form.name}, "
             f"matrix={self._matrix}, "
             f"loc={self._loc})"
         )
@@ -42,6 +66,36 @@ class Trsf3D:
     def scale(self) -> float:
         return self._scale
 
+    @scale.setter
+    def scale(self, value: float) -> None:
+        if abs(value) < sys.float_info.epsilon:
+            raise ValueError("Scale factor must not be zero.")
+        is_unit = abs(value - 1.0) < sys.float_info.epsilon
+        is_minus_unit = abs(value + 1.0) < sys.float_info.epsilon
+        if self._trsf_form in {TrsfForm.IDENTITY, TrsfForm.TRANSLATION}:
+            if not is_unit:
+                self._trsf_form = TrsfForm.SCALE
+            if is_minus_unit:
+                self._trsf_form = TrsfForm.PNTMIRROR
+        elif self._trsf_form == TrsfForm.ROTATION:
+            if not is_unit:
+                self._trsf_form = TrsfForm.COMPOUNDTRSF
+        elif self._trsf_form in {
+            TrsfForm.PNTMIRROR,
+            TrsfForm.AX1MIRROR,
+            TrsfForm.AX2MIRROR,
+        }:
+            if not is_minus_unit:
+                self._trsf_form = TrsfForm.SCALE
+            if is_unit:
+                self._trsf_form = TrsfForm.IDENTITY
+        elif self._trsf_form == TrsfForm.SCALE:
+            if is_unit:
+                self._trsf_form = TrsfForm.IDENTITY
+            if is_minus_unit:
+                self._trsf_form = TrsfForm.PNTMIRROR
+        self._scale = value
+
     def set_scale(self, point: Point3D, factor: float) -> None:
         if factor < sys.float_info.epsilon:
             raise ValueError("Scale factor must be greater than zero.")
@@ -74,24 +128,107 @@ class Trsf3D:
 
     @loc.setter
     def loc(self, value: Xyz) -> None:
-        self._loc = value
-        # TODO
+        self._loc = value.copy()
+        is_null = self._loc.square_modulus < sys.float_info.epsilon
+        if self._trsf_form == TrsfForm.IDENTITY:
+            if not is_null:
+                self._trsf_form = TrsfForm.TRANSLATION
+        elif self._trsf_form == TrsfForm.TRANSLATION:
+            if is_null:
+                self._trsf_form = TrsfForm.IDENTITY
+        elif not is_null:
+            self._trsf_form = TrsfForm.COMPOUNDTRSF
 
     def copy(self) -> Trsf3D:
         return Trsf3D(
             self._scale, self._trsf_form, self._matrix.copy(), self._loc.copy()
         )
 
+    @property
     def is_negative(self) -> bool:
         return self._scale < 0.0
 
-    def set_point_mirror(self, point: Point3D):
+    def set_identity(self) -> None:
+        self._trsf_form = TrsfForm.IDENTITY
+        self._scale = 1.0
+        self._matrix.set_identity()
+        self._loc = Xyz(0.0, 0.0, 0.0)
+
+    def set_point_mirror(self, point: Point3D) -> None:
         self._trsf_form = TrsfForm.PNTMIRROR
         self._scale = -1.0
-        self._loc = point.coord.copy()
+        self._loc = point.coord * 2
+        self._matrix.set_identity()
+
+    def set_ax3d_mirror(self, ax3d: Ax3D) -> None:
+        # Symmetry with respect to an axis, i.e. a rotation of PI around it.
+        self._trsf_form = TrsfForm.AX1MIRROR
+        self._scale = 1.0
+        p = ax3d.loc.coord
+        self._matrix.set_dot(ax3d.dir.coord)
+        self._matrix *= 2.0
+        self._matrix -= Matrix3D()
+        self._loc = p - self._matrix @ p
+
+    def set_rax23d_mirror(self, rax23d: RAx23D) -> None:
+        # Symmetry with respect to the plane defined by the location and the
+        # main direction of <rax23d>.
+        self._trsf_form = TrsfForm.AX2MIRROR
+        self._scale = -1.0
+        p = rax23d.loc.coord
+        self._matrix.set_dot(rax23d.dir.coord)
+        self._matrix *= 2.0
+        self._matrix -= Matrix3D()
+        self._loc = self._matrix @ p + p
+
+    def set_rotation(self, ax3d: Ax3D, angle: float) -> None:
+        self._trsf_form = TrsfForm.ROTATION
+        self._scale = 1.0
+        p = ax3d.loc.coord
+        self._matrix.set_rotation(ax3d.dir.coord, angle)
+        self._loc = p - self._matrix @ p
+
+    def set_translation_by_vec(self, vec: Vec3D) -> None:
+        self._trsf_form = TrsfForm.TRANSLATION
+        self._scale = 1.0
         self._matrix.set_identity()
+        self._loc = vec.coord.copy()
+
+    def set_translation_by_2points(self, p1: Point3D, p2: Point3D) -> None:
+        self._trsf_form = TrsfForm.TRANSLATION
+        self._scale = 1.0
+        self._matrix.set_identity()
+        self._loc = p2.coord - p1.coord
+
+    def set_transformation_by_rax23d(self, a: RAx23D) -> None:
+        # Transformation from the absolute coordinate system to the local
+        # coordinate system <a>: X' = R^T * (X - P).
+        self._trsf_form = TrsfForm.COMPOUNDTRSF
+        self._scale = 1.0
+        self._matrix = _frame_matrix(a)
+        self._matrix.transpose()
+        self._loc = -(self._matrix @ a.loc.coord)
+
+    def set_transformation_by_2rax23d(self, a1: RAx23D, a2: RAx23D) -> None:
+        # Transformation from the coordinate system <a1> to the coordinate
+        # system <a2>: X' = R2^T * (R1 * X + P1 - P2).
+        self._trsf_form = TrsfForm.COMPOUNDTRSF
+        self._scale = 1.0
+        self._matrix = _frame_matrix(a2)
+        self._matrix.transpose()
+        self._loc = self._matrix @ (a1.loc.coord - a2.loc.coord)
+        self._matrix @= _frame_matrix(a1)
 
     def transforms(self, xyz: Xyz) -> Xyz:
+        if self._trsf_form == TrsfForm.IDENTITY:
+            return xyz
+        elif self._trsf_form == TrsfForm.TRANSLATION:
+            xyz += self._loc
+            return xyz
+        elif self._trsf_form in {TrsfForm.SCALE, TrsfForm.PNTMIRROR}:
+            xyz *= self._scale
+            xyz += self._loc
+            return xyz
         xyz_tmp = self._matrix @ xyz
         if self._scale != 1.0:
             xyz_tmp *= self._scale
@@ -100,3 +237,291 @@ class Trsf3D:
         xyz.y = xyz_tmp.y
         xyz.z = xyz_tmp.z
         return xyz
+
+    def invert(self) -> None:
+        # X' = scale * R * X + T  =>  X = (R^T / scale) * (X' - T)
+        if self._trsf_form in {TrsfForm.IDENTITY, TrsfForm.PNTMIRROR}:
+            return
+        elif self._trsf_form == TrsfForm.TRANSLATION:
+            self._loc.reverse()
+        elif self._trsf_form == TrsfForm.SCALE:
+            if abs(self._scale) < sys.float_info.epsilon:
+                raise ValueError("Cannot invert a transformation with zero scale.")
+            self._scale = 1.0 / self._scale
+            self._loc *= -self._scale
+        else:
+            if abs(self._scale) < sys.float_info.epsilon:
+                raise ValueError("Cannot invert a transformation with zero scale.")
+            self._scale = 1.0 / self._scale
+            self._matrix.transpose()
+            self._loc = (self._matrix @ self._loc) * -self._scale
+
+    def multiply(self, other: Trsf3D) -> None:
+        # self = self * other, i.e. <other> is applied first.
+        if not isinstance(other, Trsf3D):
+            return NotImplemented
+
+        linear = {
+            TrsfForm.COMPOUNDTRSF,
+            TrsfForm.ROTATION,
+            TrsfForm.AX1MIRROR,
+            TrsfForm.AX2MIRROR,
+        }
+        homothety = {TrsfForm.SCALE, TrsfForm.PNTMIRROR}
+
+        if other._trsf_form == TrsfForm.IDENTITY:
+            pass
+        elif self._trsf_form == TrsfForm.IDENTITY:
+            self._scale = other._scale
+            self._trsf_form = other._trsf_form
+            self._matrix = other._matrix.copy()
+            self._loc = other._loc.copy()
+        elif (
+            self._trsf_form == TrsfForm.ROTATION
+            and other._trsf_form == TrsfForm.ROTATION
+        ):
+            self._loc += self._matrix @ other._loc
+            self._matrix @= other._matrix
+        elif (
+            self._trsf_form == TrsfForm.TRANSLATION
+            and other._trsf_form == TrsfForm.TRANSLATION
+        ):
+            self._loc += other._loc
+        elif self._trsf_form == TrsfForm.SCALE and other._trsf_form == TrsfForm.SCALE:
+            self._loc += other._loc * self._scale
+            self._scale *= other._scale
+        elif (
+            self._trsf_form == TrsfForm.PNTMIRROR
+            and other._trsf_form == TrsfForm.PNTMIRROR
+        ):
+            self._scale = 1.0
+            self._trsf_form = TrsfForm.TRANSLATION
+            self._loc -= other._loc
+        elif (
+            self._trsf_form == TrsfForm.AX1MIRROR
+            and other._trsf_form == TrsfForm.AX1MIRROR
+        ):
+            self._trsf_form = TrsfForm.ROTATION
+            self._loc += self._matrix @ other._loc
+            self._matrix @= other._matrix
+        elif self._trsf_form in linear and other._trsf_form == TrsfForm.TRANSLATION:
+            # A mirror followed by a translation is a glide, not a mirror.
+            if self._trsf_form != TrsfForm.ROTATION:
+                self._trsf_form = TrsfForm.COMPOUNDTRSF
+            self._loc += (self._matrix @ other._loc) * self._scale
+        elif self._trsf_form in homothety and other._trsf_form == TrsfForm.TRANSLATION:
+            self._loc += other._loc * self._scale
+        elif self._trsf_form == TrsfForm.TRANSLATION and other._trsf_form in linear:
+            self._trsf_form = TrsfForm.COMPOUNDTRSF
+            self._scale = other._scale
+            self._loc += other._loc
+            self._matrix = other._matrix.copy()
+        elif self._trsf_form == TrsfForm.TRANSLATION and other._trsf_form in homothety:
+            self._trsf_form = other._trsf_form
+            self._scale = other._scale
+            self._loc += other._loc
+        elif self._trsf_form in homothety and other._trsf_form in homothety:
+            self._trsf_form = TrsfForm.COMPOUNDTRSF
+            self._loc += other._loc * self._scale
+            self._scale *= other._scale
+        elif self._trsf_form in linear and other._trsf_form in homothety:
+            self._trsf_form = TrsfForm.COMPOUNDTRSF
+            self._loc += (self._matrix @ other._loc) * self._scale
+            self._scale *= other._scale
+        elif self._trsf_form in homothety and other._trsf_form in linear:
+            self._trsf_form = TrsfForm.COMPOUNDTRSF
+            self._loc += other._loc * self._scale
+            self._scale *= other._scale
+            self._matrix = other._matrix.copy()
+        else:
+            self._trsf_form = TrsfForm.COMPOUNDTRSF
+            self._loc += (self._matrix @ other._loc) * self._scale
+            self._scale *= other._scale
+            self._matrix @= other._matrix
+
+    def __matmul__(self, other: Trsf3D) -> Trsf3D:
+        result = self.copy()
+        result.multiply(other)
+        return result
+
+    def power(self, n: int) -> None:
+        if self._trsf_form == TrsfForm.IDENTITY or n == 1:
+            return
+        if n == 0:
+            self.set_identity()
+            return
+        if n < 0:
+            self.invert()
+            n = -n
+        if self._trsf_form == TrsfForm.TRANSLATION:
+            self._loc *= n
+        elif self._trsf_form == TrsfForm.SCALE:
+            # loc * (1 + s + ... + s^(n-1))
+            s = self._scale
+            if abs(s - 1.0) < sys.float_info.epsilon:
+                self._loc *= n
+            else:
+                self._loc *= (s**n - 1.0) / (s - 1.0)
+            self._scale = s**n
+        elif self._trsf_form in {
+            TrsfForm.PNTMIRROR,
+            TrsfForm.AX1MIRROR,
+            TrsfForm.AX2MIRROR,
+        }:
+            if n % 2 == 0:
+                self.set_identity()
+        else:
+            base = self.copy()
+            self.set_identity()
+            while True:
+                if n % 2 == 1:
+                    self.multiply(base)
+                n //= 2
+                if n == 0:
+                    break
+                base.multiply(base.copy())
+
+    def orthogonalize(self) -> None:
+        m = self._matrix.data
+        for _ in range(2):
+            v1 = Xyz(m[0, 0], m[1, 0], m[2, 0])
+            v2 = Xyz(m[0, 1], m[1, 1], m[2, 1])
+            v3 = Xyz(m[0, 2], m[1, 2], m[2, 2])
+            v1.normalize()
+            v2 -= v1 * (v1 @ v2)
+            v2.normalize()
+            v3 -= v1 * (v1 @ v3) + v2 * (v2 @ v3)
+            v3.normalize()
+            # Stored as rows, so the second pass orthonormalizes the rows.
+            m = np.array([v1.to_tuple(), v2.to_tuple(), v3.to_tuple()])
+        self._matrix = Matrix3D(m)
+
+    def to_affine(self) -> tuple[np.ndarray, np.ndarray]:
+        # Returns (A, T) such that X' = A @ X + T.
+        return self._matrix.data * self._scale, np.array(self._loc.to_tuple())
+
+    @staticmethod
+    def from_affine(matrix: np.ndarray, loc: np.ndarray) -> Trsf3D:
+        # Builds a transformation from X' = matrix @ X + loc, splitting
+        # <matrix> into scale * rotation and recovering the TrsfForm.
+        a = np.asarray(matrix, dtype=np.float64)
+        det = float(np.linalg.det(a))
+        if abs(det) < TOLERANCE:
+            raise ValueError("Cannot build a transformation from a singular matrix.")
+        scale = float(np.cbrt(det))
+        m = a / scale
+        # invert() takes the inverse of the rotation as its transpose.
+        if not np.allclose(m @ m.T, np.identity(3), atol=TOLERANCE):
+            raise ValueError("Matrix must be a rotation times a uniform scale.")
+        is_identity = np.allclose(m, np.identity(3), atol=TOLERANCE)
+        is_half_turn = (
+            np.allclose(m, m.T, atol=TOLERANCE) and abs(np.trace(m) + 1.0) < TOLERANCE
+        )
+        has_loc = bool(np.any(np.abs(loc) > TOLERANCE))
+        # A mirror applied twice is the identity only without a glide part.
+        is_involution = np.allclose(a @ loc + loc, 0.0, atol=TOLERANCE)
+        if abs(scale - 1.0) < TOLERANCE:
+            scale = 1.0
+        elif abs(scale + 1.0) < TOLERANCE:
+            scale = -1.0
+
+        if is_identity:
+            m = np.identity(3)
+            if scale == 1.0:
+                form = TrsfForm.TRANSLATION if has_loc else TrsfForm.IDENTITY
+            elif scale == -1.0:
+                form = TrsfForm.PNTMIRROR
+            else:
+                form = TrsfForm.SCALE
+        elif scale == 1.0:
+            if is_half_turn and is_involution:
+                form = TrsfForm.AX1MIRROR
+            else:
+                form = TrsfForm.ROTATION
+        elif scale == -1.0 and is_half_turn and is_involution:
+            form = TrsfForm.AX2MIRROR
+        else:
+            form = TrsfForm.COMPOUNDTRSF
+        return Trsf3D(scale, form, Matrix3D(m), Xyz(*np.asarray(loc).tolist()))
+
+    @staticmethod
+    def to_affine_many(trsfs: list[Trsf3D]) -> tuple[np.ndarray, np.ndarray]:
+        # Stacks K transformations into (K, 3, 3) and (K, 3) arrays.
+        matrices = np.empty((len(trsfs), 3, 3), dtype=np.float64)
+        locs = np.empty((len(trsfs), 3), dtype=np.float64)
+        for i, trsf in enumerate(trsfs):
+            matrices[i] = trsf._matrix.data
+            matrices[i] *= trsf._scale
+            locs[i] = trsf._loc.to_tuple()
+        return matrices, locs
+
+    @staticmethod
+    def multiply_many(
+        matrices1: np.ndarray,
+        locs1: np.ndarray,
+        matrices2: np.ndarray,
+        locs2: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Composes K pairs of transformations stored as (K, 3, 3) linear parts
+        # and (K, 3) translation parts: T1[k] * T2[k], T2[k] being applied
+        # first. Either side may hold a single transformation ((3, 3), (3,))
+        # which is then composed with every transformation of the other side.
+        matrices1 = np.asarray(matrices1, dtype=np.float64)
+        matrices2 = np.asarray(matrices2, dtype=np.float64)
+        matrices = np.matmul(matrices1, matrices2)
+        locs = np.matmul(matrices1, np.asarray(locs2)[..., None])[..., 0]
+        locs += locs1
+        return matrices, locs
+
+    def transforms_many(
+        self,
+        xyzs: XyzArray | np.ndarray,
+        in_place: bool = False,
+        out: XyzArray | np.ndarray | None = None,
+    ) -> XyzArray | np.ndarray:
+        # Applies the transformation to N coordinates stored as an (N, 3) array.
+        # The result is written to a new buffer, to <xyzs> itself when
+        # <in_place> is set, or to <out>. The container type of the input
+        # (XyzArray or ndarray) is preserved.
+        if in_place and out is not None:
+            raise ValueError("in_place and out cannot be used together.")
+        is_array = isinstance(xyzs, XyzArray)
+        data = xyzs.data if is_array else np.asarray(xyzs, dtype=np.float64)
+        if in_place and data is not xyzs and not is_array:
+            raise ValueError(
+                "in_place needs an XyzArray or a float64 ndarray to write into."
+            )
+        if in_place:
+            res = data
+        elif out is not None:
+            res = out.data if isinstance(out, XyzArray) else out
+        else:
+            res = np.empty_like(data)
+
+        loc = self._loc.to_tuple()
+        if self._trsf_form == TrsfForm.IDENTITY:
+            if res is not data:
+                res[...] = data
+        elif self._trsf_form == TrsfForm.TRANSLATION:
+            np.add(data, loc, out=res)
+        elif self._trsf_form in {TrsfForm.SCALE, TrsfForm.PNTMIRROR}:
+            np.multiply(data, self._scale, out=res)
+            res += loc
+        else:
+            m = self._matrix.data
+            if self._scale != 1.0:
+                m = m * self._scale
+            np.matmul(data, m.T, out=res)
+            res += loc
+
+        if in_place:
+            return xyzs
+        if out is not None:
+            return out
+        return XyzArray(res) if is_array else res
+
+
+def _frame_matrix(a: RAx23D) -> Matrix3D:
+    # Matrix whose columns are the X, Y and main directions of <a>.
+    x, y, z = a.xdir.coord, a.ydir.coord, a.dir.coord
+    return Matrix3D.from_values(x.x, y.x, z.x, x.y, y.y, z.y, x.z, y.z, z.z)
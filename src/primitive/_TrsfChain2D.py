@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ._Ax2D import Ax2D
+    from ._Point2D import Point2D
+    from ._Vec2D import Vec2D
+
+from ..config import TOLERANCE
+from ._TrsfForm import TrsfForm
+from ._Xy import Xy
+from ._XyArray import XyArray
+from ._Matrix2D import Matrix2D
+from ._Trsf2D import Trsf2D
+
+
+# An ordered sequence of 2D transformations applied one after the other.
+# The first step is applied first: chain(X) = Tn(...T2(T1(X))).
+# The steps are folded once into a single Trsf2D with a canonical
+# (scale, matrix, loc, form) representation. The folded transformation is
+# cached and only recomputed after the chain is edited, so applying a chain
+# costs the same as applying one transformation whatever its length.
+# Steps are stored as copies: editing a Trsf2D after appending it does not
+# change the chain, use __setitem__ to replace a step instead.
+class TrsfChain2D:
+    _steps: list[Trsf2D]
+    _trsf: Trsf2D | None
+
+    def __init__(self, steps: list[Trsf2D] | None = None) -> None:
+        self._steps = [] if steps is None else [step.copy() for step in steps]
+        self._trsf = None
+
+    def __str__(self) -> str:
+        return f"TrsfChain2D(steps={len(self._steps)}, trsf={self.trsf})"
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def __getitem__(self, index: int) -> Trsf2D:
+        return self._steps[index].copy()
+
+    def __setitem__(self, index: int, trsf: Trsf2D) -> None:
+        self._steps[index] = trsf.copy()
+        self._trsf = None
+
+    def __delitem__(self, index: int) -> None:
+        del self._steps[index]
+        self._trsf = None
+
+    def copy(self) -> TrsfChain2D:
+        return TrsfChain2D(self._steps)
+
+    def append(self, trsf: Trsf2D) -> TrsfChain2D:
+        self._steps.append(trsf.copy())
+        self._trsf = None
+        return self
+
+    def insert(self, index: int, trsf: Trsf2D) -> TrsfChain2D:
+        self._steps.insert(index, trsf.copy())
+        self._trsf = None
+        return self
+
+    def clear(self) -> None:
+        self._steps.clear()
+        self._trsf = None
+
+    def rotate(self, point: Point2D, angle: float) -> TrsfChain2D:
+        trsf = Trsf2D()
+        trsf.set_rotation(point, angle)
+        return self.append(trsf)
+
+    def scale(self, point: Point2D, factor: float) -> TrsfChain2D:
+        trsf = Trsf2D()
+        trsf.set_scale(point, factor)
+        return self.append(trsf)
+
+    def translate_by_vec(self, vec: Vec2D) -> TrsfChain2D:
+        trsf = Trsf2D()
+        trsf.set_translation_by_vec(vec)
+        return self.append(trsf)
+
+    def translate_by_2points(self, p1: Point2D, p2: Point2D) -> TrsfChain2D:
+        trsf = Trsf2D()
+        trsf.set_translation_by_2points(p1, p2)
+        return self.append(trsf)
+
+    def mirror_by_point(self, point: Point2D) -> TrsfChain2D:
+        trsf = Trsf2D()
+        trsf.set_point_mirror(point)
+        return self.append(trsf)
+
+    def mirror_by_ax2d(self, ax2d: Ax2D) -> TrsfChain2D:
+        trsf = Trsf2D()
+        trsf.set_ax2d_mirror(ax2d)
+        return self.append(trsf)
+
+    @property
+    def trsf(self) -> Trsf2D:
+        # The folded transformation. It is shared with the cache, copy it
+        # before modifying it.
+        if self._trsf is None:
+            self._trsf = self._fold()
+        return self._trsf
+
+    def transforms(self, xy: Xy) -> Xy:
+        return self.trsf.transforms(xy)
+
+    def transforms_many(
+        self,
+        xys: XyArray | np.ndarray,
+        in_place: bool = False,
+        out: XyArray | np.ndarray | None = None,
+    ) -> XyArray | np.ndarray:
+        return self.trsf.transforms_many(xys, in_place=in_place, out=out)
+
+    def _fold(self) -> Trsf2D:
+        # X' = A * X + T, each step being A = scale * matrix, T = loc.
+        a11, a12, a21, a22 = 1.0, 0.0, 0.0, 1.0
+        tx, ty = 0.0, 0.0
+        for step in self._steps:
+            if step._trsf_form == TrsfForm.IDENTITY:
+                continue
+            s = step._scale
+            m = step._matrix
+            b11, b12 = s * m._a11, s * m._a12
+            b21, b22 = s * m._a21, s * m._a22
+            a11, a12, a21, a22 = (
+                b11 * a11 + b12 * a21,
+                b11 * a12 + b12 * a22,
+                b21 * a11 + b22 * a21,
+                b21 * a12 + b22 * a22,
+            )
+            tx, ty = (
+                b11 * tx + b12 * ty + step._loc.x,
+                b21 * tx + b22 * ty + step._loc.y,
+            )
+        return _canonical(a11, a12, a21, a22, tx, ty)
+
+
+def _canonical(
+    a11: float, a12: float, a21: float, a22: float, tx: float, ty: float
+) -> Trsf2D:
+    # Splits A into scale * matrix and recovers the most specific TrsfForm,
+    # following the conventions of the Trsf2D.set_* methods.
+    det = a11 * a22 - a12 * a21
+    scale = math.sqrt(abs(det))
+    if scale < TOLERANCE:
+        raise ValueError("Cannot fold a chain with a degenerate transformation.")
+    m11, m12, m21, m22 = a11 / scale, a12 / scale, a21 / scale, a22 / scale
+    has_loc = abs(tx) > TOLERANCE or abs(ty) > TOLERANCE
+    is_unit = abs(scale - 1.0) < TOLERANCE
+    is_diagonal = abs(m12) < TOLERANCE and abs(m21) < TOLERANCE
+
+    if is_diagonal and abs(m11 - 1.0) < TOLERANCE and abs(m22 - 1.0) < TOLERANCE:
+        m11, m12, m21, m22 = 1.0, 0.0, 0.0, 1.0
+        if not is_unit:
+            form = TrsfForm.SCALE
+        elif has_loc:
+            form = TrsfForm.TRANSLATION
+        else:
+            form = TrsfForm.IDENTITY
+            scale = 1.0
+            tx, ty = 0.0, 0.0
+    elif is_diagonal and abs(m11 + 1.0) < TOLERANCE and abs(m22 + 1.0) < TOLERANCE:
+        m11, m12, m21, m22 = 1.0, 0.0, 0.0, 1.0
+        scale = -scale
+        form = TrsfForm.PNTMIRROR if is_unit else TrsfForm.SCALE
+    elif det > 0.0:
+        form = TrsfForm.ROTATION if is_unit else TrsfForm.COMPOUNDTRSF
+    elif is_unit and _is_involution(a11, a12, a21, a22, tx, ty):
+        # A mirror is its own inverse; a glide reflection stays compound.
+        m11, m12, m21, m22 = -m11, -m12, -m21, -m22
+        scale = -scale
+        form = TrsfForm.AX1MIRROR
+    else:
+        form = TrsfForm.COMPOUNDTRSF
+
+    if is_unit:
+        scale = math.copysign(1.0, scale)
+    return Trsf2D(scale, form, Matrix2D.from_values(m11, m12, m21, m22), Xy(tx, ty))
+
+
+def _is_involution(
+    a11: float, a12: float, a21: float, a22: float, tx: float, ty: float
+) -> bool:
+    # Tells whether the map applied twice is the identity: A @ t + t = 0.
+    return (
+        abs(a11 * tx + a12 * ty + tx) < TOLERANCE
+        and abs(a21 * tx + a22 * ty + ty) < TOLERANCE
+    )
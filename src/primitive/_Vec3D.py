@@ -5,6 +5,8 @@ import math
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from ._Ax3D import Ax3D
+    from ._RAx23D import RAx23D
     from ._Trsf3D import Trsf3D
 
 from ..config import FLOAT_PRINT_PRECISION, TOLERANCE
@@ -13,7 +15,11 @@ from ._Dir3D import Dir3D
 from ._Point3D import Point3D
 
 
+# Memory budget (CPython 3.11, 64-bit): 40 bytes for the Vec3D, 56 for its
+# Xyz and 24 per float coordinate, 168 bytes in all.
 class Vec3D:
+    __slots__ = ("_coord",)
+
     _coord: Xyz
 
     def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0) -> None:
@@ -65,6 +71,11 @@ class Vec3D:
     def copy(self) -> Vec3D:
         return Vec3D(self._coord.x, self._coord.y, self._coord.z)
 
+    def _assign(self, other: Vec3D) -> None:
+        self._coord.x = other._coord.x
+        self._coord.y = other._coord.y
+        self._coord.z = other._coord.z
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Vec3D):
             return NotImplemented
@@ -226,21 +237,90 @@ class Vec3D:
         self._coord.xyz1_xyz2(v1._coord, v2._coord)
         return self
 
-    def mirror_by_vec(self, vec: Vec3D):
-        pass
-
-    def mirror_by_ax1(self, ax1):
-        pass
+    def _mirror_by_unit(self, ux: float, uy: float, uz: float) -> Vec3D:
+        # V' = 2 * (V . U) * U - V, U being a unit vector
+        x, y, z = self._coord.x, self._coord.y, self._coord.z
+        d = 2.0 * (x * ux + y * uy + z * uz)
+        self._coord.x = d * ux - x
+        self._coord.y = d * uy - y
+        self._coord.z = d * uz - z
+        return self
 
-    def mirror_by_ax2(self, ax2):
-        pass
+    def mirror_by_vec(self, vec: Vec3D) -> Vec3D:
+        m = vec.modulus
+        if m < sys.float_info.epsilon:
+            raise ValueError("Cannot mirror by a zero-length vector")
+        return self._mirror_by_unit(vec.x / m, vec.y / m, vec.z / m)
+
+    def mirror_by_ax3d(self, ax3d: Ax3D) -> Vec3D:
+        d = ax3d.dir
+        return self._mirror_by_unit(d.x, d.y, d.z)
+
+    def mirror_by_rax23d(self, rax23d: RAx23D) -> Vec3D:
+        # Mirror through the plane of normal N: V' = V - 2 * (V . N) * N
+        n = rax23d.dir._coord
+        d = 2.0 * (self._coord @ n)
+        self._coord.x -= d * n.x
+        self._coord.y -= d * n.y
+        self._coord.z -= d * n.z
+        return self
 
-    def rotate(self, ax1, angle: float):
-        pass
+    def rotate(self, ax3d: Ax3D, angle: float) -> Vec3D:
+        # Rodrigues' formula: V' = V * cos + (A ^ V) * sin + A * (A . V) * (1 - cos)
+        c = math.cos(angle)
+        s = math.sin(angle)
+        a = ax3d.dir
+        ax, ay, az = a.x, a.y, a.z
+        x, y, z = self._coord.x, self._coord.y, self._coord.z
+        k = (ax * x + ay * y + az * z) * (1.0 - c)
+        self._coord.x = x * c + (ay * z - az * y) * s + ax * k
+        self._coord.y = y * c + (az * x - ax * z) * s + ay * k
+        self._coord.z = z * c + (ax * y - ay * x) * s + az * k
+        return self
 
-    def scale(self, factor: float):
+    def scale(self, factor: float) -> Vec3D:
         self._coord *= factor
         return self
 
-    def transform(self, trsf: Trsf3D):
-        pass
+    def transform(self, trsf3d: Trsf3D) -> Vec3D:
+        from ._TrsfForm import TrsfForm
+
+        form = trsf3d.trsf_form
+        if form in {TrsfForm.IDENTITY, TrsfForm.TRANSLATION}:
+            return self
+        elif form == TrsfForm.PNTMIRROR:
+            self.reverse()
+        elif form == TrsfForm.SCALE:
+            self._coord *= trsf3d.scale
+        else:
+            m = trsf3d.matrix
+            s = trsf3d.scale
+            x, y, z = self._coord.x, self._coord.y, self._coord.z
+            self._coord.x = s * (m[0, 0] * x + m[0, 1] * y + m[0, 2] * z)
+            self._coord.y = s * (m[1, 0] * x + m[1, 1] * y + m[1, 2] * z)
+            self._coord.z = s * (m[2, 0] * x + m[2, 1] * y + m[2, 2] * z)
+        return self
+
+    def mirror_by_vec_into(self, vec: Vec3D, out: Vec3D) -> Vec3D:
+        out._assign(self)
+        return out.mirror_by_vec(vec)
+
+    def mirror_by_ax3d_into(self, ax3d: Ax3D, out: Vec3D) -> Vec3D:
+        out._assign(self)
+        return out.mirror_by_ax3d(ax3d)
+
+    def mirror_by_rax23d_into(self, rax23d: RAx23D, out: Vec3D) -> Vec3D:
+        out._assign(self)
+        return out.mirror_by_rax23d(rax23d)
+
+    def rotate_into(self, ax3d: Ax3D, angle: float, out: Vec3D) -> Vec3D:
+        out._assign(self)
+        return out.rotate(ax3d, angle)
+
+    def scale_into(self, factor: float, out: Vec3D) -> Vec3D:
+        out._assign(self)
+        return out.scale(factor)
+
+    def transform_into(self, trsf3d: Trsf3D, out: Vec3D) -> Vec3D:
+        out._assign(self)
+        return out.transform(trsf3d)
@@ -5,6 +5,8 @@ from ..config import TOLERANCE, FLOAT_PRINT_PRECISION
 
 
 class Xy:
+    __slots__ = ("_x", "_y")
+
     _x: float
     _y: float
 
@@ -145,7 +147,7 @@ class Xy:
         from ._Matrix2D import Matrix2D
 
         if isinstance(other, Matrix2D):
-            return Xy(*(other.data @ self.to_tuple()))
+            return other @ self
 
     def cross(self, other: Xy) -> float:
         return self._x * other._y - self._y * other._x
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ..config import TOLERANCE
+from ._Xy import Xy
+
+
+# Structure-of-arrays counterpart of Xy.
+# The coordinates of N pairs are stored in a single (N, 2) float64 buffer
+# and every operation of Xy is applied to all rows at once.
+# Operands may be another XyArray (row by row), a single Xy (broadcast to
+# every row), a scalar, or a 1D ndarray of length N (one scalar per row).
+# Integer indexing returns an XyView sharing memory with the buffer, slicing
+# returns an XyArray sharing memory with the buffer.
+class XyArray:
+    _data: np.ndarray
+
+    __array_ufunc__ = None
+
+    def __init__(self, data=()) -> None:
+        data = np.asarray(data, dtype=np.float64)
+        if data.size == 0:
+            data = data.reshape(0, 2)
+        if data.ndim != 2 or data.shape[1] != 2:
+            raise ValueError("XyArray data must have shape (N, 2)")
+        self._data = data
+
+    @staticmethod
+    def zeros(n: int) -> XyArray:
+        return XyArray(np.zeros((n, 2), dtype=np.float64))
+
+    @staticmethod
+    def from_xy_list(xys: list[Xy]) -> XyArray:
+        return XyArray([xy.to_tuple() for xy in xys])
+
+    def __str__(self) -> str:
+        return f"XyArray({self._data})"
+
+    def __len__(self) -> int:
+        return self._data.shape[0]
+
+    def __iter__(self):
+        for row in self._data:
+            yield XyView(row)
+
+    def __getitem__(self, index) -> XyView | XyArray:
+        if isinstance(index, (int, np.integer)):
+            return XyView(self._data[index])
+        return XyArray(self._data[index])
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(value, Xy):
+            self._data[index] = value.to_tuple()
+        elif isinstance(value, XyArray):
+            self._data[index] = value._data
+        else:
+            self._data[index] = value
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+    @data.setter
+    def data(self, value: np.ndarray) -> None:
+        self._data = value
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._data[:, 0]
+
+    @x.setter
+    def x(self, value) -> None:
+        self._data[:, 0] = value
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._data[:, 1]
+
+    @y.setter
+    def y(self, value) -> None:
+        self._data[:, 1] = value
+
+    @property
+    def modulus(self) -> np.ndarray:
+        return np.sqrt(self.square_modulus)
+
+    @property
+    def square_modulus(self) -> np.ndarray:
+        return np.einsum("ij,ij->i", self._data, self._data)
+
+    def copy(self) -> XyArray:
+        return XyArray(self._data.copy())
+
+    def to_list(self) -> list[list[float]]:
+        return self._data.tolist()
+
+    def to_xy_list(self) -> list[Xy]:
+        return [Xy(x, y) for x, y in self._data.tolist()]
+
+    def _operand(self, other):
+        if isinstance(other, XyArray):
+            return other._data
+        if isinstance(other, Xy):
+            return np.array(other.to_tuple(), dtype=np.float64)
+        if isinstance(other, (int, float, np.number)):
+            return other
+        if isinstance(other, np.ndarray):
+            if other.ndim == 1:
+                return other[:, None]
+            return other
+        return NotImplemented
+
+    def __add__(self, other) -> XyArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return XyArray(self._data + other)
+
+    def __iadd__(self, other) -> XyArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data += other
+        return self
+
+    def __radd__(self, other) -> XyArray:
+        return self.__add__(other)
+
+    def __sub__(self, other) -> XyArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return XyArray(self._data - other)
+
+    def __isub__(self, other) -> XyArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data -= other
+        return self
+
+    def __rsub__(self, other) -> XyArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return XyArray(other - self._data)
+
+    def __mul__(self, other) -> XyArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return XyArray(self._data * other)
+
+    def __imul__(self, other) -> XyArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data *= other
+        return self
+
+    def __rmul__(self, other) -> XyArray:
+        return self.__mul__(other)
+
+    def __truediv__(self, other) -> XyArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return XyArray(self._data / other)
+
+    def __itruediv__(self, other) -> XyArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data /= other
+        return self
+
+    def __rtruediv__(self, other) -> XyArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return XyArray(other / self._data)
+
+    def __neg__(self) -> XyArray:
+        return XyArray(-self._data)
+
+    def reverse(self) -> None:
+        np.negative(self._data, out=self._data)
+
+    def __matmul__(self, other: XyArray | Xy) -> np.ndarray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return np.einsum(
+            "ij,ij->i", self._data, np.broadcast_to(other, self._data.shape)
+        )
+
+    def __rmatmul__(self, other) -> XyArray:
+        from ._Matrix2D import Matrix2D
+
+        if isinstance(other, Matrix2D):
+            return XyArray(self._data @ other.data.T)
+        return NotImplemented
+
+    def cross(self, other: XyArray | Xy) -> np.ndarray:
+        other = np.broadcast_to(self._operand(other), self._data.shape)
+        return self._data[:, 0] * other[:, 1] - self._data[:, 1] * other[:, 0]
+
+    def __xor__(self, other: XyArray | Xy) -> np.ndarray:
+        return self.cross(other)
+
+    def cross_magnitude(self, other: XyArray | Xy) -> np.ndarray:
+        return np.abs(self.cross(other))
+
+    def square_cross_magnitude(self, other: XyArray | Xy) -> np.ndarray:
+        return self.cross(other) ** 2
+
+    def normalize(self) -> XyArray:
+        mod = self.modulus
+        if np.any(mod <= TOLERANCE):
+            raise ValueError("Cannot normalize a zero-length vector")
+        self._data /= mod[:, None]
+        return self
+
+    def a1_xy1_a2_xy2(self, a1, xy1: XyArray | Xy, a2, xy2: XyArray | Xy) -> None:
+        self._data[...] = self._operand(a1) * self._operand(xy1) + self._operand(
+            a2
+        ) * self._operand(xy2)
+
+    def a1_xy1_a2_xy2_xy3(
+        self, a1, xy1: XyArray | Xy, a2, xy2: XyArray | Xy, xy3: XyArray | Xy
+    ) -> None:
+        self._data[...] = (
+            self._operand(a1) * self._operand(xy1)
+            + self._operand(a2) * self._operand(xy2)
+            + self._operand(xy3)
+        )
+
+    def a1_xy1_xy2(self, a1, xy1: XyArray | Xy, xy2: XyArray | Xy) -> None:
+        self._data[...] = self._operand(a1) * self._operand(xy1) + self._operand(xy2)
+
+    def xy1_xy2(self, xy1: XyArray | Xy, xy2: XyArray | Xy) -> None:
+        self._data[...] = self._operand(xy1) + self._operand(xy2)
+
+
+# An Xy whose coordinates live in one row of an XyArray buffer.
+# Writing through the view updates the array; every Xy method works on it.
+class XyView(Xy):
+    __slots__ = ("_row",)
+
+    _row: np.ndarray
+
+    def __init__(self, row: np.ndarray) -> None:
+        self._row = row
+
+    @property
+    def _x(self) -> float:
+        return float(self._row[0])
+
+    @_x.setter
+    def _x(self, value: float) -> None:
+        self._row[0] = value
+
+    @property
+    def _y(self) -> float:
+        return float(self._row[1])
+
+    @_y.setter
+    def _y(self, value: float) -> None:
+        self._row[1] = value
+
+    def to_tuple(self) -> tuple[float, float]:
+        x, y = self._row.tolist()
+        return (x, y)
@@ -4,6 +4,8 @@ from ..config import TOLERANCE, FLOAT_PRINT_PRECISION
 
 
 class Xyz:
+    __slots__ = ("_x", "_y", "_z")
+
     _x: float
     _y: float
     _z: float
@@ -194,7 +196,7 @@ class Xyz:
         from ._Matrix3D import Matrix3D
 
         if isinstance(other, Matrix3D):
-            return Xyz(*(other.data @ self.to_tuple()))
+            return other @ self
 
     def cross(self, other: Xyz) -> Xyz:
         return Xyz(
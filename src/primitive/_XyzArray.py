@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ..config import TOLERANCE
+from ._Xyz import Xyz
+
+
+# Structure-of-arrays counterpart of Xyz.
+# The coordinates of N triplets are stored in a single (N, 3) float64 buffer
+# and every operation of Xyz is applied to all rows at once.
+# Operands may be another XyzArray (row by row), a single Xyz (broadcast to
+# every row), a scalar, or a 1D ndarray of length N (one scalar per row).
+# Integer indexing returns an XyzView sharing memory with the buffer, slicing
+# returns an XyzArray sharing memory with the buffer.
+class XyzArray:
+    _data: np.ndarray
+
+    __array_ufunc__ = None
+
+    def __init__(self, data=()) -> None:
+        data = np.asarray(data, dtype=np.float64)
+        if data.size == 0:
+            data = data.reshape(0, 3)
+        if data.ndim != 2 or data.shape[1] != 3:
+            raise ValueError("XyzArray data must have shape (N, 3)")
+        self._data = data
+
+    @staticmethod
+    def zeros(n: int) -> XyzArray:
+        return XyzArray(np.zeros((n, 3), dtype=np.float64))
+
+    @staticmethod
+    def from_xyz_list(xyzs: list[Xyz]) -> XyzArray:
+        return XyzArray([xyz.to_tuple() for xyz in xyzs])
+
+    def __str__(self) -> str:
+        return f"XyzArray({self._data})"
+
+    def __len__(self) -> int:
+        return self._data.shape[0]
+
+    def __iter__(self):
+        for row in self._data:
+            yield XyzView(row)
+
+    def __getitem__(self, index) -> XyzView | XyzArray:
+        if isinstance(index, (int, np.integer)):
+            return XyzView(self._data[index])
+        return XyzArray(self._data[index])
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(value, Xyz):
+            self._data[index] = value.to_tuple()
+        elif isinstance(value, XyzArray):
+            self._data[index] = value._data
+        else:
+            self._data[index] = value
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+    @data.setter
+    def data(self, value: np.ndarray) -> None:
+        self._data = value
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._data[:, 0]
+
+    @x.setter
+    def x(self, value) -> None:
+        self._data[:, 0] = value
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._data[:, 1]
+
+    @y.setter
+    def y(self, value) -> None:
+        self._data[:, 1] = value
+
+    @property
+    def z(self) -> np.ndarray:
+        return self._data[:, 2]
+
+    @z.setter
+    def z(self, value) -> None:
+        self._data[:, 2] = value
+
+    @property
+    def modulus(self) -> np.ndarray:
+        return np.sqrt(self.square_modulus)
+
+    @property
+    def square_modulus(self) -> np.ndarray:
+        return np.einsum("ij,ij->i", self._data, self._data)
+
+    def copy(self) -> XyzArray:
+        return XyzArray(self._data.copy())
+
+    def to_list(self) -> list[list[float]]:
+        return self._data.tolist()
+
+    def to_xyz_list(self) -> list[Xyz]:
+        return [Xyz(x, y, z) for x, y, z in self._data.tolist()]
+
+    def _operand(self, other):
+        if isinstance(other, XyzArray):
+            return other._data
+        if isinstance(other, Xyz):
+            return np.array(other.to_tuple(), dtype=np.float64)
+        if isinstance(other, (int, float, np.number)):
+            return other
+        if isinstance(other, np.ndarray):
+            if other.ndim == 1:
+                return other[:, None]
+            return other
+        return NotImplemented
+
+    def normalize(self) -> XyzArray:
+        mod = self.modulus
+        if np.any(mod <= TOLERANCE):
+            raise ValueError("Cannot normalize a zero vector")
+        self._data /= mod[:, None]
+        return self
+
+    def cross_magnitude(self, other: XyzArray | Xyz) -> np.ndarray:
+        return np.sqrt(self.square_cross_magnitude(other))
+
+    def square_cross_magnitude(self, other: XyzArray | Xyz) -> np.ndarray:
+        cross = np.cross(self._data, self._operand(other))
+        return np.einsum("ij,ij->i", cross, cross)
+
+    def __add__(self, other) -> XyzArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return XyzArray(self._data + other)
+
+    def __iadd__(self, other) -> XyzArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data += other
+        return self
+
+    def __radd__(self, other) -> XyzArray:
+        return self.__add__(other)
+
+    def __sub__(self, other) -> XyzArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return XyzArray(self._data - other)
+
+    def __isub__(self, other) -> XyzArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data -= other
+        return self
+
+    def __rsub__(self, other) -> XyzArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return XyzArray(other - self._data)
+
+    def __mul__(self, other) -> XyzArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return XyzArray(self._data * other)
+
+    def __imul__(self, other) -> XyzArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data *= other
+        return self
+
+    def __rmul__(self, other) -> XyzArray:
+        return self.__mul__(other)
+
+    def __truediv__(self, other) -> XyzArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return XyzArray(self._data / other)
+
+    def __itruediv__(self, other) -> XyzArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        self._data /= other
+        return self
+
+    def __rtruediv__(self, other) -> XyzArray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return XyzArray(other / self._data)
+
+    def __neg__(self) -> XyzArray:
+        return XyzArray(-self._data)
+
+    def reverse(self) -> None:
+        np.negative(self._data, out=self._data)
+
+    def __matmul__(self, other: XyzArray | Xyz) -> np.ndarray:
+        other = self._operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return np.einsum(
+            "ij,ij->i", self._data, np.broadcast_to(other, self._data.shape)
+        )
+
+    def __rmatmul__(self, other) -> XyzArray:
+        from ._Matrix3D import Matrix3D
+
+        if isinstance(other, Matrix3D):
+            return XyzArray(self._data @ other.data.T)
+        return NotImplemented
+
+    def cross(self, other: XyzArray | Xyz) -> XyzArray:
+        return XyzArray(np.cross(self._data, self._operand(other)))
+
+    def cross_cross(self, o1: XyzArray | Xyz, o2: XyzArray | Xyz) -> XyzArray:
+        cross = np.cross(self._operand(o1), self._operand(o2))
+        return XyzArray(np.cross(self._data, cross))
+
+    def dot_cross(self, o1: XyzArray | Xyz, o2: XyzArray | Xyz) -> np.ndarray:
+        cross = np.cross(self._operand(o1), self._operand(o2))
+        return np.einsum(
+            "ij,ij->i", self._data, np.broadcast_to(cross, self._data.shape)
+        )
+
+    def a1_xyz1_a2_xyz2_a3_xyz3_xyz4(
+        self,
+        a1,
+        xyz1: XyzArray | Xyz,
+        a2,
+        xyz2: XyzArray | Xyz,
+        a3,
+        xyz3: XyzArray | Xyz,
+        xyz4: XyzArray | Xyz,
+    ) -> None:
+        self._data[...] = (
+            self._operand(a1) * self._operand(xyz1)
+            + self._operand(a2) * self._operand(xyz2)
+            + self._operand(a3) * self._operand(xyz3)
+            + self._operand(xyz4)
+        )
+
+    def a1_xyz1_a2_xyz2_a3_xyz3(
+        self,
+        a1,
+        xyz1: XyzArray | Xyz,
+        a2,
+        xyz2: XyzArray | Xyz,
+        a3,
+        xyz3: XyzArray | Xyz,
+    ) -> None:
+        self._data[...] = (
+            self._operand(a1) * self._operand(xyz1)
+            + self._operand(a2) * self._operand(xyz2)
+            + self._operand(a3) * self._operand(xyz3)
+        )
+
+    def a1_xyz1_a2_xyz2_xyz3(
+        self, a1, xyz1: XyzArray | Xyz, a2, xyz2: XyzArray | Xyz, xyz3: XyzArray | Xyz
+    ) -> None:
+        self._data[...] = (
+            self._operand(a1) * self._operand(xyz1)
+            + self._operand(a2) * self._operand(xyz2)
+            + self._operand(xyz3)
+        )
+
+    def a1_xyz1_a2_xyz2(
+        self, a1, xyz1: XyzArray | Xyz, a2, xyz2: XyzArray | Xyz
+    ) -> None:
+        self._data[...] = self._operand(a1) * self._operand(xyz1) + self._operand(
+            a2
+        ) * self._operand(xyz2)
+
+    def a1_xyz1_xyz2(self, a1, xyz1: XyzArray | Xyz, xyz2: XyzArray | Xyz) -> None:
+        self._data[...] = self._operand(a1) * self._operand(xyz1) + self._operand(xyz2)
+
+    def xyz1_xyz2(self, xyz1: XyzArray | Xyz, xyz2: XyzArray | Xyz) -> None:
+        self._data[...] = self._operand(xyz1) + self._operand(xyz2)
+
+
+# An Xyz whose coordinates live in one row of an XyzArray buffer.
+# Writing through the view updates the array; every Xyz method works on it.
+class XyzView(Xyz):
+    __slots__ = ("_row",)
+
+    _row: np.ndarray
+
+    def __init__(self, row: np.ndarray) -> None:
+        self._row = row
+
+    @property
+    def _x(self) -> float:
+        return float(self._row[0])
+
+    @_x.setter
+    def _x(self, value: float) -> None:
+        self._row[0] = value
+
+    @property
+    def _y(self) -> float:
+        return float(self._row[1])
+
+    @_y.setter
+    def _y(self, value: float) -> None:
+        self._row[1] = value
+
+    @property
+    def _z(self) -> float:
+        return float(self._row[2])
+
+    @_z.setter
+    def _z(self, value: float) -> None:
+        self._row[2] = value
+
+    def to_tuple(self) -> tuple[float, float, float]:
+        x, y, z = self._row.tolist()
+        return (x, y, z)
@@ -1,6 +1,14 @@
+# The geometric primitives transform themselves in place with their mirror_*,
+# rotate, scale and transform methods. Their *_into counterparts (such as
+# rotate_into or transform_into) write the result into an <out> object of the
+# same type and leave self unchanged, so that a loop can reuse one output
+# object instead of copying at each step.
+
 from ._TrsfForm import TrsfForm
 from ._Xy import Xy
 from ._Xyz import Xyz
+from ._XyArray import XyArray
+from ._XyzArray import XyzArray
 from ._Point2D import Point2D
 from ._Point3D import Point3D
 from ._Circ2D import Circ2D
@@ -13,12 +21,15 @@ from ._Lin2d import Lin2D
 from ._Lin3D import Lin3D
 from ._Matrix2D import Matrix2D
 from ._Matrix3D import Matrix3D
+from ._Matrix2DStack import Matrix2DStack
+from ._Matrix3DStack import Matrix3DStack
 from ._Ax2D import Ax2D
 from ._Ax3D import Ax3D
 from ._Ax22D import Ax22D
 from ._RAx23D import RAx23D
 from ._RLAx23D import RLAx23D
 from ._Trsf2D import Trsf2D
+from ._TrsfChain2D import TrsfChain2D
 from ._Trsf3D import Trsf3D
 from ._GTrsf2D import GTrsf2D
 from ._Quaternion import Quaternion
\ No newline at end of file